@@ -0,0 +1,44 @@
+from fastapi import HTTPException, Request
+
+from app.services.candidate_ranker import CandidateRanker
+from app.services.embeddings import EmbeddingService
+from app.services.extraction_service import ExtractionService
+from app.services.job_matcher import JobMatcher
+from app.services.llm_service import LLMService
+from app.services.processing_queue import ProcessingQueue
+from app.services.resume_pipeline import ResumePipeline
+from app.services.skill_index import SkillIndex
+
+
+def get_resume_pipeline(request: Request) -> ResumePipeline:
+    return request.app.state.resume_pipeline
+
+
+def get_processing_queue(request: Request) -> ProcessingQueue:
+    return request.app.state.processing_queue
+
+
+def get_extraction_service(request: Request) -> ExtractionService:
+    return request.app.state.extraction_service
+
+
+def get_llm_service(request: Request) -> LLMService:
+    return request.app.state.llm_service
+
+
+def get_job_matcher(request: Request) -> JobMatcher:
+    return request.app.state.job_matcher
+
+
+def get_skill_index(request: Request) -> SkillIndex:
+    return request.app.state.skill_index
+
+
+def get_candidate_ranker(request: Request) -> CandidateRanker:
+    return request.app.state.candidate_ranker
+
+
+def get_embedding_service(request: Request) -> EmbeddingService:
+    if request.app.state.embeddings is None:
+        raise HTTPException(status_code=503, detail="Semantic search is disabled")
+    return request.app.state.embeddings
@@ -1,12 +1,31 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Header
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.schemas import *
-from app.services.document_processor import DocumentProcessor
-from app.services.resume_parser import ResumeParser
+from app.api.dependencies import (
+    get_candidate_ranker, get_embedding_service, get_extraction_service, get_job_matcher,
+    get_processing_queue, get_resume_pipeline, get_skill_index
+)
+from app.services.candidate_ranker import CandidateRanker
+from app.services.embeddings import EmbeddingService
+from app.services.extraction_service import ExtractionSaturatedError, ExtractionService
 from app.services.job_matcher import JobMatcher
-from app.database.models import Resume, session_scope
+from app.services.llm_service import LLMUnavailableError
+from app.services.processing_queue import ProcessingQueue, QueueFullError
+from app.services.resume_pipeline import ResumePipeline
+from app.services.skill_index import SkillIndex, SkillQuery
+from app.database.models import Resume, ResumeParse, ResumeStatus, ResumeText, get_db_session
+from app.database.queries import encode_cursor, list_resumes_query
 from app.config import settings
-from app.utils.validators import validate_file
+from app.utils.compression import decompress_text
+from app.utils.storage import save_archive_member, save_upload
+from app.utils.validators import validate_file, validate_filename, validate_webhook_url
+import asyncio
+import hashlib
+import json
+import zipfile
 import uuid
 from datetime import datetime
 import os
@@ -19,81 +38,447 @@ async def verify_api_key(x_api_key: str = Header(...)):
         raise HTTPException(status_code=401, detail="Invalid API Key")
     return x_api_key
 
-@router.post("/resumes/upload", response_model=UploadResponse)
+def llm_unavailable(e: LLMUnavailableError) -> HTTPException:
+    """503 telling the client when the LLM circuit may accept calls again"""
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": str(max(1, int(round(e.retry_after))))}
+    )
+
+def parse_version(processed_at: Optional[datetime]) -> str:
+    """Identifies one parse of a resume; changes whenever it is re-parsed"""
+    return processed_at.isoformat() if processed_at else ""
+
+def ensure_processed(resume):
+    """Reject reads of resumes whose parse has not completed"""
+    if resume.processing_status != ResumeStatus.COMPLETED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Resume is not available yet (status: {resume.processing_status})"
+        )
+
+@router.post("/resumes/upload", response_model=UploadResponse, status_code=202)
 async def upload_resume(
+    response: Response,
     file: UploadFile = File(...),
-    api_key: str = Depends(verify_api_key)
+    webhook_url: Optional[str] = Form(None),
+    mode: Optional[str] = Query(None, pattern="^(llm|fast)$"),
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    queue: ProcessingQueue = Depends(get_processing_queue),
+    pipeline: ResumePipeline = Depends(get_resume_pipeline),
+    extraction: ExtractionService = Depends(get_extraction_service)
 ):
-    """Upload and parse a resume"""
+    """
+    Upload a resume and queue it for parsing.
+    mode=fast parses inside the request with rule-based extraction only (no LLM).
+    """
     try:
         # Validate file
         validate_file(file)
+        if webhook_url:
+            validate_webhook_url(webhook_url)
+        inline = not settings.ASYNC_PROCESSING or mode == "fast"
+        if not inline and queue.is_full():
+            raise HTTPException(status_code=503, detail="Processing queue is full, retry later")
+        if inline and extraction.is_saturated():
+            raise HTTPException(status_code=503, detail="Document extraction is saturated, retry later")
         
         # Generate unique ID
         resume_id = str(uuid.uuid4())
         
-        # Save file
-        file_path = os.path.join(settings.UPLOAD_DIR, f"{resume_id}_{file.filename}")
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Process document
-        processor = DocumentProcessor()
-        text = processor.extract_text(file_path, file.filename)
+        # Stream file to disk (size-capped, hashed on the fly)
+        file_path = os.path.join(settings.UPLOAD_DIR, f"{resume_id}_{os.path.basename(file.filename)}")
+        stored = await save_upload(file, file_path)
         
-        # Parse resume
-        parser = ResumeParser()
-        parsed_data = await parser.parse(text, file.filename)
+        # Record the job before handing it to a worker
+        db.add(Resume(
+            id=resume_id,
+            file_name=file.filename,
+            file_path=file_path,
+            file_hash=stored.sha256,
+            processing_status=ResumeStatus.QUEUED,
+            webhook_url=webhook_url
+        ))
+        await db.commit()
         
-        # Save to database
-        with session_scope() as session:
-            resume = Resume(
+        if inline:
+            try:
+                await pipeline.process(resume_id, wait_for_capacity=False, mode=mode)
+            except ExtractionSaturatedError as e:
+                await db.execute(delete(Resume).where(Resume.id == resume_id))
+                await db.commit()
+                os.remove(file_path)
+                raise HTTPException(status_code=503, detail=str(e))
+            except LLMUnavailableError as e:
+                raise llm_unavailable(e)
+            response.status_code = 200
+            return UploadResponse(
                 id=resume_id,
+                status="success",
+                message="Resume processed successfully",
                 file_name=file.filename,
-                file_path=file_path,
-                raw_text=text,
-                parsed_data=parsed_data,
-                processed_at=datetime.utcnow()
+                estimatedProcessingTime=0,
+                webhookUrl=webhook_url
             )
-            session.add(resume)
-            session.commit()
+        
+        try:
+            queue.enqueue(resume_id, mode=mode)
+        except QueueFullError as e:
+            await db.execute(update(Resume).where(Resume.id == resume_id).values(
+                processing_status=ResumeStatus.FAILED,
+                processing_error=str(e)
+            ))
+            await db.commit()
+            raise HTTPException(status_code=503, detail=str(e))
         
         return UploadResponse(
             id=resume_id,
-            status="success",
-            message="Resume processed successfully",
-            file_name=file.filename
+            status="processing",
+            message="Resume queued for processing",
+            file_name=file.filename,
+            estimatedProcessingTime=queue.estimated_wait_seconds(),
+            webhookUrl=webhook_url
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/resumes/{resume_id}", response_model=ParsedResumeResponse)
-async def get_resume(
-    resume_id: str,
-    api_key: str = Depends(verify_api_key)
+@router.post("/resumes/batch", response_model=BatchUploadResponse, status_code=202)
+async def upload_batch(
+    response: Response,
+    files: List[UploadFile] = File(...),
+    webhook_url: Optional[str] = Form(None),
+    mode: Optional[str] = Query(None, pattern="^(llm|fast)$"),
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    queue: ProcessingQueue = Depends(get_processing_queue),
+    pipeline: ResumePipeline = Depends(get_resume_pipeline)
 ):
-    """Get parsed resume data"""
+    """
+    Upload many resumes, or zip archives of resumes, in one request.
+    mode=fast parses every file with rule-based extraction only (no LLM).
+    """
     try:
-        with session_scope() as session:
-            resume = session.query(Resume).filter(Resume.id == resume_id).first()
+        if webhook_url:
+            validate_webhook_url(webhook_url)
+        
+        items: List[BatchItemResult] = []
+        rows: List[Resume] = []
+        
+        def accept(file_name: str, resume_id: str, stored) -> None:
+            rows.append(Resume(
+                id=resume_id,
+                file_name=file_name,
+                file_path=stored.path,
+                file_hash=stored.sha256,
+                processing_status=ResumeStatus.QUEUED,
+                webhook_url=webhook_url
+            ))
+            items.append(BatchItemResult(file_name=file_name, id=resume_id, status=ResumeStatus.QUEUED))
+        
+        def reject(file_name: str, error: str) -> None:
+            items.append(BatchItemResult(file_name=file_name, status="rejected", error=error))
+        
+        for upload in files:
+            name = os.path.basename(upload.filename or "")
             
-            if not resume:
-                raise HTTPException(status_code=404, detail="Resume not found")
+            if name.lower().endswith(".zip"):
+                archive_path = os.path.join(settings.UPLOAD_DIR, f".{uuid.uuid4()}.zip")
+                try:
+                    await save_upload(upload, archive_path, max_size=settings.BATCH_MAX_ARCHIVE_SIZE)
+                    with zipfile.ZipFile(archive_path) as archive:
+                        for info in archive.infolist():
+                            member = os.path.basename(info.filename)
+                            if info.is_dir() or not member or member.startswith(".") or "__MACOSX" in info.filename:
+                                continue
+                            if len(items) >= settings.BATCH_MAX_FILES:
+                                reject(member, f"Batch limit of {settings.BATCH_MAX_FILES} files exceeded")
+                                continue
+                            try:
+                                validate_filename(member)
+                                resume_id = str(uuid.uuid4())
+                                dest = os.path.join(settings.UPLOAD_DIR, f"{resume_id}_{member}")
+                                stored = await asyncio.to_thread(
+                                    save_archive_member, archive, info, dest, settings.MAX_FILE_SIZE
+                                )
+                                accept(member, resume_id, stored)
+                            except HTTPException as e:
+                                reject(member, e.detail)
+                            except Exception as e:
+                                reject(member, str(e))
+                except zipfile.BadZipFile:
+                    reject(name, "Invalid zip archive")
+                except HTTPException as e:
+                    reject(name, e.detail)
+                finally:
+                    if os.path.exists(archive_path):
+                        os.remove(archive_path)
+                continue
             
-            return ParsedResumeResponse(
-                id=resume.id,
-                file_name=resume.file_name,
-                personal_info=PersonalInfo(**resume.parsed_data.get("personal_info", {})),
-                summary=resume.parsed_data.get("summary"),
-                experience=[WorkExperience(**exp) for exp in resume.parsed_data.get("experience", [])],
-                education=[Education(**edu) for edu in resume.parsed_data.get("education", [])],
-                skills=Skills(**resume.parsed_data.get("skills", {})),
-                certifications=[Certification(**cert) for cert in resume.parsed_data.get("certifications", [])],
-                raw_text=resume.raw_text,
-                processed_at=resume.processed_at
+            if len(items) >= settings.BATCH_MAX_FILES:
+                reject(name, f"Batch limit of {settings.BATCH_MAX_FILES} files exceeded")
+                continue
+            try:
+                validate_file(upload)
+                resume_id = str(uuid.uuid4())
+                dest = os.path.join(settings.UPLOAD_DIR, f"{resume_id}_{name}")
+                accept(name, resume_id, await save_upload(upload, dest))
+            except HTTPException as e:
+                reject(name, e.detail)
+        
+        # One transaction for every accepted file
+        if rows:
+            db.add_all(rows)
+            await db.commit()
+        
+        by_id = {item.id: item for item in items if item.id}
+        if settings.ASYNC_PROCESSING:
+            overflow = []
+            for resume_id, item in by_id.items():
+                try:
+                    queue.enqueue(resume_id, mode=mode)
+                except QueueFullError as e:
+                    overflow.append(resume_id)
+                    item.status = ResumeStatus.FAILED
+                    item.error = str(e)
+            if overflow:
+                await db.execute(update(Resume).where(Resume.id.in_(overflow)).values(
+                    processing_status=ResumeStatus.FAILED,
+                    processing_error="Processing queue is full, retry later"
+                ))
+                await db.commit()
+        else:
+            for outcome in await pipeline.process_many(list(by_id), mode=mode):
+                by_id[outcome.resume_id].status = outcome.status
+                by_id[outcome.resume_id].error = outcome.error
+            response.status_code = 200
+        
+        rejected = sum(1 for item in items if item.status == "rejected")
+        return BatchUploadResponse(
+            status="processing" if settings.ASYNC_PROCESSING else "completed",
+            total=len(items),
+            accepted=len(items) - rejected,
+            rejected=rejected,
+            items=items,
+            estimatedProcessingTime=queue.estimated_wait_seconds() if settings.ASYNC_PROCESSING else 0,
+            webhookUrl=webhook_url
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/resumes", response_model=ResumeListResponse)
+async def list_resumes(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    file_name: Optional[str] = Query(None, description="Case-insensitive substring"),
+    email: Optional[str] = Query(None, description="Exact, case-insensitive"),
+    skill: Optional[str] = Query(None, description="Technical skill or experience technology (normalized: case and aliases ignored)"),
+    company: Optional[str] = Query(None, description="Employer name from experience, case-insensitive"),
+    status: Optional[str] = None,
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """List resume metadata, newest first, with keyset pagination"""
+    try:
+        query = list_resumes_query(
+            db.get_bind().dialect.name,
+            limit,
+            cursor=cursor,
+            created_after=created_after,
+            created_before=created_before,
+            file_name=file_name,
+            email=email,
+            skill=skill,
+            company=company,
+            status=status
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = (await db.execute(query)).all()
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+    
+    return ResumeListResponse(
+        items=[
+            ResumeMetadata(
+                id=row.id,
+                file_name=row.file_name,
+                status=row.processing_status,
+                full_name=row.full_name,
+                email=row.email,
+                created_at=row.created_at,
+                processed_at=row.processed_at
             )
+            for row in page
+        ],
+        next_cursor=next_cursor,
+        limit=limit
+    )
+
+@router.post("/resumes/search", response_model=SkillSearchResponse)
+async def search_resumes(
+    search: SkillSearchRequest,
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    skill_index: SkillIndex = Depends(get_skill_index)
+):
+    """Find resumes by skills (all / any / exclude), ranked by coverage"""
+    query = SkillQuery(search.all, search.any, search.exclude)
+    if not query.terms:
+        raise HTTPException(status_code=400, detail="Provide at least one skill in 'all' or 'any'")
+    
+    results = await skill_index.search(db, query, limit=search.limit)
+    return SkillSearchResponse(
+        query=query.as_dict(),
+        results=[SkillSearchHit(**hit) for hit in results]
+    )
+
+@router.get("/resumes/{resume_id}/status", response_model=ResumeStatusResponse)
+async def get_resume_status(
+    resume_id: str,
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Get the processing status of an uploaded resume"""
+    row = (await db.execute(
+        select(
+            Resume.id, Resume.file_name, Resume.processing_status,
+            Resume.processing_error, Resume.created_at, Resume.processed_at
+        ).where(Resume.id == resume_id)
+    )).first()
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    return ResumeStatusResponse(
+        id=row.id,
+        file_name=row.file_name,
+        status=row.processing_status,
+        error=row.processing_error,
+        created_at=row.created_at,
+        processed_at=row.processed_at
+    )
+
+@router.get("/resumes/{resume_id}/parses", response_model=ParseHistoryResponse)
+async def get_parse_history(
+    resume_id: str,
+    limit: int = Query(20, ge=1, le=200),
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """Parse history of a resume (model, prompt version, latency, tokens), newest first"""
+    if (await db.execute(select(Resume.id).where(Resume.id == resume_id))).first() is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    rows = (await db.execute(
+        select(
+            ResumeParse.id, ResumeParse.model, ResumeParse.prompt_version, ResumeParse.cached,
+            ResumeParse.latency_ms, ResumeParse.llm_calls, ResumeParse.prompt_tokens,
+            ResumeParse.output_tokens, ResumeParse.created_at
+        )
+        .where(ResumeParse.resume_id == resume_id)
+        .order_by(ResumeParse.created_at.desc(), ResumeParse.id.desc())
+        .limit(limit)
+    )).all()
+    versions = [ParseVersion.model_validate(row._asdict()) for row in rows]
+    return ParseHistoryResponse(id=resume_id, current=versions[0].id if versions else None, versions=versions)
+
+RESUME_FIELDS = set(ParsedResumeResponse.model_fields)
+
+def resume_etag(resume_id: str, processed_at: Optional[datetime], variant: str) -> str:
+    """Changes whenever the resume is re-parsed; `variant` covers the query parameters"""
+    digest = hashlib.sha1(f"{resume_id}|{parse_version(processed_at)}|{variant}".encode()).hexdigest()[:20]
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+@router.get("/resumes/{resume_id}", response_model=ParsedResumeResponse)
+async def get_resume(
+    resume_id: str,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated top-level fields to return, e.g. personal_info,skills"
+    ),
+    include_raw_text: bool = Query(False, description="Include the extracted text (often the largest field)"),
+    if_none_match: Optional[str] = Header(None),
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Get parsed resume data.
+
+    Responses carry an ETag derived from processed_at; a matching
+    If-None-Match returns 304 without reading parsed_data.
+    """
+    try:
+        selected = None
+        if fields:
+            selected = {f.strip() for f in fields.split(",") if f.strip()}
+            unknown = selected - RESUME_FIELDS
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+            include_raw_text = include_raw_text or "raw_text" in selected
+            selected.add("id")
+            if include_raw_text:
+                selected.add("raw_text")
+        
+        row = (await db.execute(
+            select(Resume.processing_status, Resume.processed_at).where(Resume.id == resume_id)
+        )).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        ensure_processed(row)
+        
+        variant = f"{','.join(sorted(selected)) if selected else '*'}|{int(include_raw_text)}"
+        headers = {"ETag": resume_etag(resume_id, row.processed_at, variant), "Cache-Control": "private, no-cache"}
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        
+        data = (await db.execute(
+            select(Resume.file_name, Resume.parsed_data, Resume.processed_at).where(Resume.id == resume_id)
+        )).first()
+        if not data:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        parsed_data = data.parsed_data or {}
+        raw_text = None
+        if include_raw_text:
+            text = (await db.execute(
+                select(ResumeText.codec, ResumeText.data).where(ResumeText.resume_id == resume_id)
+            )).first()
+            raw_text = decompress_text(text.codec, text.data) if text else None
+        
+        resume = ParsedResumeResponse.model_validate({
+            "id": resume_id,
+            "file_name": data.file_name,
+            "personal_info": parsed_data.get("personal_info") or {},
+            "summary": parsed_data.get("summary"),
+            "experience": parsed_data.get("experience") or [],
+            "education": parsed_data.get("education") or [],
+            "skills": parsed_data.get("skills") or {},
+            "certifications": parsed_data.get("certifications") or [],
+            "raw_text": raw_text,
+            "processed_at": data.processed_at,
+        })
+        exclude = None if include_raw_text else {"raw_text"}
+        return Response(
+            content=resume.model_dump_json(include=selected, exclude=exclude),
+            media_type="application/json",
+            headers=headers
+        )
     
     except HTTPException:
         raise
@@ -109,61 +494,183 @@ logger = logging.getLogger(__name__)
 async def match_resume(
     resume_id: str,
     job_description: JobDescription,
-    api_key: str = Depends(verify_api_key)
+    mode: Optional[str] = Query(None, pattern="^(local|llm|hybrid)$", description="Defaults to MATCH_MODE"),
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    matcher: JobMatcher = Depends(get_job_matcher)
 ):
     """Match resume with job description"""
     try:
-        with session_scope() as session:
-            resume = session.query(Resume).filter(Resume.id == resume_id).first()
-            
-            if not resume:
-                raise HTTPException(status_code=404, detail="Resume not found")
-            
-            matcher = JobMatcher()
-            result = await matcher.match(resume.parsed_data, job_description.dict())
-
-            # Remove keys from result that we set explicitly to avoid duplicate kwargs
-            result.pop("match_id", None)
-            result.pop("resume_id", None)
-            result.pop("job_title", None)
-
-            return MatchingResult(
-                match_id=str(uuid.uuid4()),
-                resume_id=resume_id,
-                job_title=job_description.title,
-                **result
-            )
+        row = (await db.execute(
+            select(Resume.processing_status, Resume.parsed_data, Resume.processed_at).where(Resume.id == resume_id)
+        )).first()
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        ensure_processed(row)
+        # release the pooled connection before the (slow) LLM call
+        await db.close()
+        
+        result = await matcher.match(
+            row.parsed_data,
+            job_description.dict(),
+            mode=mode,
+            resume_key=(resume_id, parse_version(row.processed_at))
+        )
+
+        # Remove keys from result that we set explicitly to avoid duplicate kwargs
+        result.pop("match_id", None)
+        result.pop("resume_id", None)
+        result.pop("job_title", None)
+
+        return MatchingResult(
+            match_id=str(uuid.uuid4()),
+            resume_id=resume_id,
+            job_title=job_description.title,
+            **result
+        )
     except HTTPException:
         raise
+    except LLMUnavailableError as e:
+        raise llm_unavailable(e)
     except Exception as e:
         # log full exception for debugging
         logger.exception("Error matching resume %s: %s", resume_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/jobs/match")
+async def match_job(
+    match_request: JobMatchRequest,
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    ranker: CandidateRanker = Depends(get_candidate_ranker)
+):
+    """
+    Rank many resumes against one job. Every candidate is scored locally by
+    skill overlap; the top_k get a full match (LLM, local or hybrid per
+    `mode`). Streams NDJSON events.
+    """
+    job = match_request.job.dict()
+    top_k = settings.JOB_MATCH_TOP_K if match_request.top_k is None else match_request.top_k
+    top_k = min(top_k, settings.JOB_MATCH_MAX_TOP_K)
+    
+    shortlist = await ranker.prefilter(db, job, match_request.resume_ids)
+    top_ids = [entry["resume_id"] for entry in shortlist.top(top_k)]
+    parsed = {}
+    if top_ids:
+        rows = await db.execute(
+            select(Resume.id, Resume.parsed_data, Resume.processed_at).where(Resume.id.in_(top_ids))
+        )
+        parsed = {
+            resume_id: (parsed_data, parse_version(processed_at)) for resume_id, parsed_data, processed_at in rows
+        }
+    # the stream only talks to the LLM; give the connection back now
+    await db.close()
+    
+    async def events():
+        async for event in ranker.stream(shortlist, parsed, job, top_k, mode=match_request.mode):
+            yield json.dumps(event, default=str) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/jobs/similar", response_model=SimilarResumesResponse)
+async def similar_resumes(
+    similar_request: SimilarResumesRequest,
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    embeddings: EmbeddingService = Depends(get_embedding_service)
+):
+    """Top-N resumes by embedding similarity to a job description (no LLM)"""
+    if similar_request.section not in embeddings.indexes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Section must be one of: {', '.join(embeddings.indexes)}"
+        )
+    hits = await embeddings.search(similar_request.job.dict(), similar_request.top_n, similar_request.section)
+    names = {}
+    if hits:
+        rows = await db.execute(
+            select(
+                Resume.id,
+                Resume.file_name,
+                Resume.parsed_data[("personal_info", "full_name")].as_string().label("full_name")
+            ).where(Resume.id.in_([resume_id for resume_id, _ in hits]))
+        )
+        names = {row.id: row for row in rows}
+    
+    return SimilarResumesResponse(
+        embedder=embeddings.embedder.name,
+        section=similar_request.section,
+        results=[
+            SimilarResume(
+                id=resume_id,
+                file_name=names[resume_id].file_name if resume_id in names else None,
+                full_name=names[resume_id].full_name if resume_id in names else None,
+                similarity=round(score, 4)
+            )
+            for resume_id, score in hits
+        ]
+    )
+
+
 @router.delete("/resumes/{resume_id}")
 async def delete_resume(
     resume_id: str,
-    api_key: str = Depends(verify_api_key)
+    api_key: str = Depends(verify_api_key),
+    db: AsyncSession = Depends(get_db_session),
+    skill_index: SkillIndex = Depends(get_skill_index),
+    pipeline: ResumePipeline = Depends(get_resume_pipeline)
 ):
     """Delete a resume"""
     try:
-        with session_scope() as session:
-            resume = session.query(Resume).filter(Resume.id == resume_id).first()
-            
-            if not resume:
-                raise HTTPException(status_code=404, detail="Resume not found")
-            
-            # Delete file
-            if os.path.exists(resume.file_path):
-                os.remove(resume.file_path)
-            
-            session.delete(resume)
-            session.commit()
-            
-            return {"message": "Resume deleted successfully"}
+        resume = await db.get(Resume, resume_id)
+        
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
+        
+        # Delete file
+        if os.path.exists(resume.file_path):
+            os.remove(resume.file_path)
+        
+        await skill_index.remove(db, resume_id)
+        if pipeline.embeddings:
+            await pipeline.embeddings.remove(db, resume_id)
+        if pipeline.match_cache:
+            await pipeline.match_cache.invalidate(db, resume_id)
+        await db.execute(delete(ResumeText).where(ResumeText.resume_id == resume_id))
+        await db.execute(delete(ResumeParse).where(ResumeParse.resume_id == resume_id))
+        await db.delete(resume)
+        await db.commit()
+        
+        return {"message": "Resume deleted successfully"}
     
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stats")
+async def get_stats(
+    request: Request,
+    api_key: str = Depends(verify_api_key)
+):
+    """Runtime counters for the processing pipeline"""
+    state = request.app.state
+    return {
+        "queue": state.processing_queue.stats(),
+        "extraction": state.extraction_service.stats(),
+        "parse_cache": state.parse_cache.stats() if state.parse_cache is not None else None,
+        "llm_limiter": state.llm_service.limiter.stats(),
+        "llm_calls": state.llm_service.call_stats(),
+        "llm_executor": state.llm_service.executor_stats(),
+        "llm_resilience": state.llm_service.resilience_stats(),
+        "llm_match_prompts": state.llm_service.match_prompt_stats(),
+        "llm_decoding": state.llm_service.decode_stats(),
+        "skill_index": state.skill_index.stats(),
+        "candidate_ranker": state.candidate_ranker.stats(),
+        "match_modes": state.job_matcher.stats(),
+        "embeddings": state.embeddings.stats() if state.embeddings is not None else None,
+        "match_cache": state.match_cache.stats() if state.match_cache is not None else None
+    }
@@ -58,8 +58,79 @@ class UploadResponse(BaseModel):
     id: str = "uuid"
     status: str = "processing"
     message: str = "Resume uploaded successfully"
+    file_name: Optional[str] = None
     estimatedProcessingTime: int = 30
-    webhookUrl: Optional[str] = "optional callback URL"
+    webhookUrl: Optional[str] = None
+
+class BatchItemResult(BaseModel):
+    file_name: str
+    id: Optional[str] = None
+    status: str
+    error: Optional[str] = None
+
+class BatchUploadResponse(BaseModel):
+    status: str = "processing"
+    total: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    items: List[BatchItemResult] = []
+    estimatedProcessingTime: int = 0
+    webhookUrl: Optional[str] = None
+
+class ResumeStatusResponse(BaseModel):
+    id: str
+    file_name: str
+    status: str
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
+
+class ResumeMetadata(BaseModel):
+    id: str
+    file_name: str
+    status: str
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    created_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
+
+class ResumeListResponse(BaseModel):
+    items: List[ResumeMetadata] = []
+    next_cursor: Optional[str] = None
+    limit: int = 50
+
+class ParseVersion(BaseModel):
+    id: int
+    model: Optional[str] = None
+    prompt_version: Optional[str] = None
+    cached: bool = False
+    latency_ms: Optional[int] = None
+    llm_calls: Optional[int] = None
+    prompt_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    created_at: datetime
+
+class ParseHistoryResponse(BaseModel):
+    id: str
+    current: Optional[int] = None  # ParseVersion.id backing the parsed data served today
+    versions: List[ParseVersion] = []  # newest first
+
+class SkillSearchRequest(BaseModel):
+    all: List[str] = []
+    any: List[str] = []
+    exclude: List[str] = []
+    limit: int = Field(50, ge=1, le=500)
+
+class SkillSearchHit(BaseModel):
+    id: str
+    file_name: Optional[str] = None
+    full_name: Optional[str] = None
+    matched_skills: List[str] = []
+    coverage: float
+
+class SkillSearchResponse(BaseModel):
+    query: Dict[str, List[str]]
+    results: List[SkillSearchHit] = []
 
 class JobDescription(BaseModel):
     title: str
@@ -69,6 +140,28 @@ class JobDescription(BaseModel):
     preferred_skills: List[str] = []
     experience_required: Optional[str] = None
 
+class JobMatchRequest(BaseModel):
+    job: JobDescription
+    resume_ids: Optional[List[str]] = Field(None, max_length=10000)  # None = every parsed resume
+    top_k: Optional[int] = Field(None, ge=0)  # defaults to JOB_MATCH_TOP_K
+    mode: Optional[str] = Field(None, pattern="^(local|llm|hybrid)$")  # defaults to MATCH_MODE
+
+class SimilarResumesRequest(BaseModel):
+    job: JobDescription
+    top_n: int = Field(20, ge=1, le=500)
+    section: str = "full"
+
+class SimilarResume(BaseModel):
+    id: str
+    file_name: Optional[str] = None
+    full_name: Optional[str] = None
+    similarity: float
+
+class SimilarResumesResponse(BaseModel):
+    embedder: str
+    section: str
+    results: List[SimilarResume] = []
+
 class MatchingScore(BaseModel):
     overall_score: int = Field(ge=0, le=100)
     skills_match: int = Field(ge=0, le=100)
@@ -86,3 +179,4 @@ class MatchingResult(BaseModel):
     gaps: List[str]
     recommendation: str
     explanation: str
+    scoring_mode: Optional[str] = None
@@ -1,5 +1,5 @@
 # app/config.py
-from typing import Optional, ClassVar
+from typing import Dict, List, Optional, ClassVar
 from pathlib import Path
 import os
 
@@ -17,11 +17,27 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=str(env_path), case_sensitive=False)
 
     # Database
-    DATABASE_URL: str
+    DATABASE_URL: str  # sync URLs are rewritten to asyncpg / aiosqlite
+    DB_ECHO: bool = False  # log every SQL statement; independent of DEBUG
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
 
     # Gemini (Google Generative AI)
     GOOGLE_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "models/gemini-2.5-flash"
+    GEMINI_CALL_STRATEGY: str = "auto"  # auto | generation_config | plain | generate_text
+    LLM_MAX_CONCURRENCY: int = 8  # Gemini calls in flight, process-wide
+    LLM_REQUESTS_PER_MINUTE: int = 60  # 0 = no rate limit
+    LLM_EXECUTOR_WORKERS: Optional[int] = None  # threads for blocking SDK calls; None = LLM_MAX_CONCURRENCY
+    LLM_TIMEOUT_SECONDS: float = 60.0  # per attempt
+    LLM_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY: float = 1.0
+    LLM_RETRY_MAX_DELAY: float = 20.0
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    LLM_CIRCUIT_RESET_SECONDS: float = 30.0
 
     # Application
     API_HOST: str = "0.0.0.0"
@@ -29,6 +45,79 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10 MB
+    BATCH_MAX_FILES: int = 200
+    BATCH_MAX_ARCHIVE_SIZE: int = 200 * 1024 * 1024  # 200 MB
+
+    # Background processing
+    ASYNC_PROCESSING: bool = True  # False = parse inside the upload request
+    PROCESSING_WORKERS: int = 4
+    PROCESSING_QUEUE_SIZE: int = 1000
+    WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    WEBHOOK_MAX_ATTEMPTS: int = 3
+
+    # Document extraction (process pool)
+    EXTRACTION_WORKERS: Optional[int] = None  # None = one process per CPU core
+    EXTRACTION_MAX_PENDING: int = 32
+    EXTRACTION_FORMAT_LIMITS: Dict[str, int] = {"pdf": 4, "docx": 4, "txt": 8, "image": 2}
+    PDF_MAX_PAGES: int = 10  # later pages are ignored
+    PDF_EXTRACTION_MODE: str = "layout"  # layout (pdfplumber, PyPDF2 per failed page) | fast (PyPDF2 first)
+    PDF_PAGES_PER_TASK: int = 3  # longer PDFs are fanned out across the pool in ranges of this size
+
+    # OCR (images, and scanned PDF pages) in its own process pool
+    OCR_WORKERS: int = 2
+    OCR_PAGE_TIMEOUT_SECONDS: float = 30.0  # tesseract is killed after this long on one page
+    OCR_PDF_FALLBACK: bool = True  # OCR PDF pages with no usable text layer
+    OCR_MIN_PAGE_CHARS: int = 40  # letters/digits below which a PDF page counts as image-only
+    OCR_DPI: int = 300  # PDF pages are rendered, and images rescaled, to this resolution
+    OCR_MAX_IMAGE_SIDE: int = 4000  # px; larger images (phone photos) are downscaled
+    OCR_TESSERACT_CONFIG: str = "--oem 1 --psm 6"  # LSTM engine, one uniform block: no layout analysis pass
+
+    # Parse cache (keyed by file hash + model + prompt version)
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_PATH: str = "./cache/parse_cache.sqlite3"
+    PARSE_CACHE_MAX_ENTRIES: int = 10000
+    PARSE_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+
+    # Extracted text storage (resume_texts)
+    TEXT_COMPRESSION: str = "zstd"  # zstd (zstandard, in requirements.txt; zlib if missing) | zlib
+    TEXT_COMPRESSION_LEVEL: Optional[int] = None  # None = codec default
+
+    # Parsing
+    PARSE_MODE: str = "llm"  # llm | fast (rule-based extraction only, no LLM call)
+    PARSE_RULES_FALLBACK: bool = True  # store the rule-based parse when the LLM is unavailable
+
+    # Long resumes are split into sections and parsed with one LLM call per section
+    PARSE_SECTIONED_MIN_CHARS: int = 12000
+    PARSE_SECTION_MAX_CHARS: int = 8000  # longer sections are chunked further
+    PARSE_SECTION_MAX_TOKENS: int = 2000
+
+    # Job matching
+    MATCH_MODE: str = "llm"  # local | llm | hybrid
+    MATCH_WEIGHTS: Dict[str, float] = {"skills": 0.5, "experience": 0.3, "education": 0.2}
+    MATCH_HYBRID_LOW: int = 40  # hybrid: local scores in [LOW, HIGH] are re-scored by the LLM
+    MATCH_HYBRID_HIGH: int = 75
+    MATCH_PROMPT_TOKEN_BUDGET: int = 1200  # estimated input tokens per analyze_match prompt
+    MATCH_MAX_OUTPUT_TOKENS: int = 800
+
+    # Embeddings / semantic search
+    EMBEDDINGS_ENABLED: bool = True
+    EMBEDDING_BACKEND: str = "hashing"  # hashing | sentence-transformers
+    EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"  # sentence-transformers backend
+    EMBEDDING_DIM: int = 256  # hashing backend
+    EMBEDDING_INDEXED_SECTIONS: List[str] = ["full"]  # kept in memory for search; all sections are stored
+    EMBEDDING_IVF_THRESHOLD: int = 20000  # exact search below this many vectors
+    EMBEDDING_IVF_NPROBE: int = 8
+
+    # Match result cache
+    MATCH_CACHE_ENABLED: bool = True
+    MATCH_CACHE_MAX_ENTRIES: int = 5000  # in-memory LRU; all entries are also persisted
+    MATCH_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # One-to-many job matching
+    JOB_MATCH_TOP_K: int = 20  # candidates sent to the LLM after the local prefilter
+    JOB_MATCH_MAX_TOP_K: int = 100
+    JOB_MATCH_MAX_CANDIDATES: int = 50000
+    JOB_MATCH_REQUIRED_WEIGHT: float = 0.8  # share of the prefilter score from required skills
 
     # Security
     SECRET_KEY: str
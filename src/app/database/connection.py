@@ -1,25 +1,174 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+
+from sqlalchemy import column, exists, inspect, select, table, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import URL, Connection, make_url
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 from app.config import settings
-from contextlib import contextmanager
+from app.utils.compression import compress_text
+
+logger = logging.getLogger(__name__)
+
+# asyncio drivers used in place of whatever sync driver DATABASE_URL names
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def async_database_url(url: str) -> URL:
+    """Rewrite e.g. postgresql:// or postgresql+psycopg2:// to postgresql+asyncpg://"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver and parsed.drivername != driver:
+        parsed = parsed.set(drivername=driver)
+    return parsed
+
+def engine_options(url: URL) -> Dict[str, Any]:
+    """Pool settings; SQLite keeps SQLAlchemy's defaults since it has no server-side connections"""
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+database_url = async_database_url(settings.DATABASE_URL)
+engine = create_async_engine(database_url, **engine_options(database_url))
+# expire_on_commit=False: rows stay readable after commit without another round trip
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
 
-@contextmanager
-def session_scope():
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
     """Provide a transactional scope"""
-    session = SessionLocal()
-    try:
-        yield session
-        session.commit()
-    except:
-        session.rollback()
-        raise
-    finally:
-        session.close()
-
-def init_db():
+    async with SessionLocal() as session:
+        try:
+            yield session
+            await session.commit()
+        except BaseException:
+            await session.rollback()
+            raise
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency: one session per request. Handlers commit their own
+    writes, so the data is durable before the response goes out.
+    """
+    async with SessionLocal() as session:
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+
+async def init_db():
     """Initialize database"""
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        changes = await conn.run_sync(upgrade_schema)
+        copied = await conn.run_sync(backfill_resume_texts)
+    for change in changes:
+        logger.info("Schema upgrade: %s", change)
+    if copied:
+        logger.info("Copied the extracted text of %d resume(s) from resumes.raw_text to resume_texts", copied)
+
+def upgrade_schema(conn: Connection) -> List[str]:
+    """
+    Bring tables created by an earlier version up to date; create_all only
+    creates missing tables. Adds missing columns (nullable: defaults are
+    applied by the ORM) and fills them in existing rows with the column's
+    `info["upgrade_value"]`, converts JSON columns now declared JSONB on
+    Postgres, and creates missing indexes. Idempotent; returns the column
+    changes made.
+    """
+    inspector = inspect(conn)
+    tables = set(inspector.get_table_names())
+    preparer = conn.dialect.identifier_preparer
+    changes = []
+    for model_table in Base.metadata.sorted_tables:
+        if model_table.name not in tables:
+            continue
+        existing = {c["name"]: c["type"] for c in inspector.get_columns(model_table.name)}
+        for col in model_table.columns:
+            name = f"{model_table.name}.{col.name}"
+            if col.name not in existing:
+                conn.execute(text(
+                    f"ALTER TABLE {preparer.format_table(model_table)} "
+                    f"ADD COLUMN {preparer.format_column(col)} {col.type.compile(dialect=conn.dialect)}"
+                ))
+                changes.append(f"added column {name}")
+                if "upgrade_value" in col.info:
+                    conn.execute(update(model_table).values({col.name: col.info["upgrade_value"]}))
+            elif (
+                conn.dialect.name == "postgresql"
+                and isinstance(col.type.dialect_impl(conn.dialect), JSONB)
+                and not isinstance(existing[col.name], JSONB)
+            ):
+                column_name = preparer.format_column(col)
+                conn.execute(text(
+                    f"ALTER TABLE {preparer.format_table(model_table)} "
+                    f"ALTER COLUMN {column_name} TYPE JSONB USING {column_name}::jsonb"
+                ))
+                changes.append(f"converted {name} to JSONB")
+        for index in model_table.indexes:
+            # IF NOT EXISTS rather than reflection, which misses expression indexes
+            # on SQLite; invoked as a DDL listener so ddl_if (Postgres-only) applies
+            CreateIndex(index, if_not_exists=True)(index, conn)
+    return changes
+
+def backfill_resume_texts(conn: Connection, batch_size: int = 500) -> int:
+    """
+    Databases created before resume_texts keep the extracted text in
+    resumes.raw_text, which the schema upgrade leaves in place. Copy
+    (compressed) every legacy text that has no resume_texts row yet;
+    re-parses and the parse cache read only resume_texts. Idempotent,
+    and a no-op once the column is gone.
+
+    The legacy column is left in place. Drop it by hand once this has
+    run (ALTER TABLE resumes DROP COLUMN raw_text); nothing reads it.
+    """
+    if "raw_text" not in {c["name"] for c in inspect(conn).get_columns("resumes")}:
+        return 0
+    resumes = table("resumes", column("id"), column("raw_text"))
+    texts = Base.metadata.tables["resume_texts"]
+    copied = 0
+    while True:
+        rows = conn.execute(
+            select(resumes.c.id, resumes.c.raw_text)
+            .where(
+                resumes.c.raw_text.isnot(None),
+                resumes.c.raw_text != "",
+                ~exists().where(texts.c.resume_id == resumes.c.id),
+            )
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return copied
+        now = datetime.utcnow()
+        batch = []
+        for row in rows:
+            codec, data = compress_text(row.raw_text, settings.TEXT_COMPRESSION, settings.TEXT_COMPRESSION_LEVEL)
+            batch.append({
+                "resume_id": row.id,
+                "codec": codec,
+                "size": len(row.raw_text.encode("utf-8")),
+                "data": data,
+                "created_at": now,
+            })
+        conn.execute(texts.insert(), batch)
+        copied += len(batch)
+
+async def dispose_engine():
+    """Close pooled connections on shutdown"""
+    await engine.dispose()
@@ -1,18 +1,118 @@
-from sqlalchemy import Column, String, Text, DateTime, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from app.database.connection import Base, session_scope, init_db
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, LargeBinary, String, Text, DateTime, JSON, Index, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from app.database.connection import Base, session_scope, get_db_session, init_db, dispose_engine
 import uuid
 from datetime import datetime
 
+class ResumeStatus:
+    """Values stored in `Resume.processing_status`."""
+
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    PENDING = (QUEUED, PROCESSING)
+
 class Resume(Base):
+    """
+    Metadata and the current parse. The extracted text lives in
+    resume_texts and every parse ever stored in resume_parses, so list,
+    search and filter queries only touch narrow rows.
+    """
     __tablename__ = "resumes"
-    
+
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     file_name = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
-    raw_text = Column(Text)
-    parsed_data = Column(JSON)
-    processed_at = Column(DateTime, default=datetime.utcnow)
+    file_hash = Column(String(64), index=True)  # SHA-256 of the uploaded bytes
+    parsed_data = Column(JSON().with_variant(JSONB(), "postgresql"))
+    parse_model = Column(String(100))
+    prompt_version = Column(String(20))
+    # rows from before background processing were parsed during the upload
+    processing_status = Column(
+        String(50), nullable=False, default=ResumeStatus.QUEUED, info={"upgrade_value": ResumeStatus.COMPLETED}
+    )
+    processing_error = Column(Text)
+    webhook_url = Column(String(500))
+    processed_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # keyset pagination walks (created_at, id) newest first
+        Index("ix_resumes_created_at_id", "created_at", "id"),
+        # containment filters (skill, company) on Postgres
+        Index("ix_resumes_parsed_data", "parsed_data", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+def resume_email():
+    """Case-folded candidate email; the same expression backs ix_resumes_email"""
+    return func.lower(Resume.parsed_data[("personal_info", "email")].as_string())
+
+Index("ix_resumes_email", resume_email())
+
+
+class ResumeText(Base):
+    """Extracted document text, compressed (see app.utils.compression); one row per resume."""
+    __tablename__ = "resume_texts"
+
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(10), nullable=False)  # zstd | zlib
+    size = Column(Integer, nullable=False)  # uncompressed UTF-8 bytes
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ResumeParse(Base):
+    """
+    Append-only parse history: one row per completed parse, so re-parsing
+    with a new model or prompt keeps the earlier results. The newest row
+    is also copied onto Resume.parsed_data / parse_model / prompt_version.
+    """
+    __tablename__ = "resume_parses"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    model = Column(String(100))
+    prompt_version = Column(String(20))
+    parsed_data = Column(JSON().with_variant(JSONB(), "postgresql"))
+    cached = Column(Boolean, nullable=False, default=False)  # reused from the parse cache, no LLM call
+    latency_ms = Column(Integer)
+    llm_calls = Column(Integer)
+    prompt_tokens = Column(Integer)  # as reported by the API; None if it reported no usage
+    output_tokens = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (Index("ix_resume_parses_resume_id_created_at", "resume_id", "created_at"),)
+
+
+class ResumeSkill(Base):
+    """Inverted index: one row per (normalized skill, resume) posting."""
+    __tablename__ = "resume_skills"
+
+    skill = Column(String(100), primary_key=True)
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+class ResumeEmbedding(Base):
+    """One float32 vector per (resume, section), tagged with the embedder that produced it."""
+    __tablename__ = "resume_embeddings"
+
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    section = Column(String(32), primary_key=True)
+    model = Column(String(100), nullable=False, index=True)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)
+
+
+class Match(Base):
+    """Persisted LLM match results; `key` is MatchCache.make_key(...)."""
+    __tablename__ = "matches"
 
+    key = Column(String(64), primary_key=True)
+    resume_id = Column(String, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False, index=True)
+    job_hash = Column(String(64), nullable=False, index=True)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    result = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
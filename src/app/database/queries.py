@@ -0,0 +1,134 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Select, and_, case, column, exists, func, literal, or_, select, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.database.models import Resume, ResumeSkill, ResumeStatus, ResumeText, resume_email
+from app.utils.skills import normalize_skill
+
+# -----------------------
+# Keyset cursors
+# -----------------------
+def encode_cursor(created_at: datetime, resume_id: str) -> str:
+    """Opaque cursor for the row the previous page ended on"""
+    payload = json.dumps([created_at.isoformat(), resume_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of encode_cursor; raises ValueError on anything malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, resume_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(resume_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+# -----------------------
+# parsed_data filters
+# -----------------------
+def _has_skill(skill: str) -> ColumnElement:
+    """
+    The resume lists `skill` in skills.technical or an experience entry's
+    technologies, matched like the skill search: through the normalized
+    resume_skills postings, so case and aliases do not matter.
+    """
+    return exists().where(ResumeSkill.resume_id == Resume.id, ResumeSkill.skill == normalize_skill(skill))
+
+def _worked_at(dialect: str, company: str) -> ColumnElement:
+    """Some experience entry's company equals `company`, ignoring case"""
+    if dialect == "postgresql":
+        experience = type_coerce(Resume.parsed_data, JSONB)["experience"]
+        # jsonb_array_elements raises on a non-array (a malformed parse)
+        entries = case((func.jsonb_typeof(experience) == "array", experience), else_=literal([], JSONB))
+        jobs = func.jsonb_array_elements(entries).table_valued(column("value", JSONB)).alias()
+        employer = jobs.c.value["company"].astext
+    else:
+        jobs = func.json_each(Resume.parsed_data, "$.experience").table_valued("value").alias()
+        employer = func.json_extract(jobs.c.value, "$.company")
+    return exists().select_from(jobs).where(func.lower(employer) == company.lower())
+
+def list_resumes_query(
+    dialect: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    file_name: Optional[str] = None,
+    email: Optional[str] = None,
+    skill: Optional[str] = None,
+    company: Optional[str] = None,
+    status: Optional[str] = None,
+) -> Select:
+    """
+    Metadata-only listing, newest first. Only small columns and two JSON
+    paths are selected, so the full parsed_data never leaves the database
+    (the extracted text is in resume_texts). Fetches limit + 1 rows so the
+    caller can tell if there is a next page.
+    """
+    query = select(
+        Resume.id,
+        Resume.file_name,
+        Resume.processing_status,
+        Resume.parsed_data[("personal_info", "full_name")].as_string().label("full_name"),
+        Resume.parsed_data[("personal_info", "email")].as_string().label("email"),
+        Resume.created_at,
+        Resume.processed_at,
+    )
+    conditions: List[ColumnElement] = []
+    if cursor:
+        created_at, resume_id = decode_cursor(cursor)
+        conditions.append(tuple_(Resume.created_at, Resume.id) < tuple_(created_at, resume_id))
+    if created_after:
+        conditions.append(Resume.created_at >= created_after)
+    if created_before:
+        conditions.append(Resume.created_at < created_before)
+    if status:
+        conditions.append(Resume.processing_status == status)
+    if file_name:
+        conditions.append(Resume.file_name.ilike(f"%{file_name}%"))
+    if email:
+        conditions.append(resume_email() == email.lower())
+    if skill:
+        conditions.append(_has_skill(skill))
+    if company:
+        conditions.append(_worked_at(dialect, company))
+    if conditions:
+        query = query.where(and_(*conditions))
+    return query.order_by(Resume.created_at.desc(), Resume.id.desc()).limit(limit + 1)
+
+# -----------------------
+# Re-parse candidates
+# -----------------------
+def stale_parses_query(
+    target: Tuple[str, str],
+    limit: Optional[int],
+    after_id: Optional[str] = None,
+    include_rules: bool = True,
+    rules_model: str = "rules",
+) -> Select:
+    """
+    Completed resumes whose (parse_model, prompt_version) differs from
+    `target` and whose text is stored, in id order so a run can resume
+    after the last id it finished. include_rules=False leaves rule-based
+    parses (parse_model == rules_model) alone.
+    """
+    model, prompt_version = target
+    conditions: List[ColumnElement] = [
+        Resume.processing_status == ResumeStatus.COMPLETED,
+        or_(
+            Resume.parse_model.is_(None),
+            Resume.prompt_version.is_(None),
+            Resume.parse_model != model,
+            Resume.prompt_version != prompt_version,
+        ),
+        exists().where(ResumeText.resume_id == Resume.id),
+    ]
+    if after_id:
+        conditions.append(Resume.id > after_id)
+    if not include_rules:
+        conditions.append(or_(Resume.parse_model.is_(None), Resume.parse_model != rules_model))
+    return select(Resume.id).where(and_(*conditions)).order_by(Resume.id).limit(limit)
@@ -3,6 +3,20 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import router
 from app.config import settings
+from sqlalchemy import select
+from app.database.models import Resume, ResumeStatus, dispose_engine, session_scope
+from app.services.candidate_ranker import CandidateRanker
+from app.services.embeddings import EmbeddingService, create_embedder
+from app.services.extraction_service import ExtractionService
+from app.services.job_matcher import JobMatcher
+from app.services.llm_service import LLMService
+from app.services.match_cache import MatchCache
+from app.services.parse_cache import ParseCache
+from app.services.processing_queue import ProcessingQueue
+from app.services.resume_parser import ResumeParser
+from app.services.resume_pipeline import ResumePipeline
+from app.services.skill_index import SkillIndex
+import asyncio
 import os
 
 app = FastAPI(
@@ -28,6 +42,100 @@ os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 # Include routes
 app.include_router(router, prefix="/api/v1")
 
+@app.on_event("startup")
+async def startup():
+    llm = LLMService()
+    llm.warm_up()
+    app.state.llm_service = llm
+    match_cache = None
+    if settings.MATCH_CACHE_ENABLED:
+        match_cache = MatchCache(settings.MATCH_CACHE_MAX_ENTRIES, settings.MATCH_CACHE_TTL_SECONDS)
+    app.state.match_cache = match_cache
+    app.state.job_matcher = JobMatcher(llm, cache=match_cache)
+    app.state.candidate_ranker = CandidateRanker(
+        app.state.job_matcher,
+        required_weight=settings.JOB_MATCH_REQUIRED_WEIGHT,
+        max_candidates=settings.JOB_MATCH_MAX_CANDIDATES,
+    )
+    extraction = ExtractionService(
+        max_workers=settings.EXTRACTION_WORKERS,
+        max_pending=settings.EXTRACTION_MAX_PENDING,
+        format_limits=settings.EXTRACTION_FORMAT_LIMITS,
+        pdf_max_pages=settings.PDF_MAX_PAGES,
+        pdf_mode=settings.PDF_EXTRACTION_MODE,
+        pdf_pages_per_task=settings.PDF_PAGES_PER_TASK,
+        ocr_workers=settings.OCR_WORKERS,
+        ocr_timeout=settings.OCR_PAGE_TIMEOUT_SECONDS,
+        ocr_pdf_fallback=settings.OCR_PDF_FALLBACK,
+        ocr_options={
+            "ocr_min_page_chars": settings.OCR_MIN_PAGE_CHARS,
+            "ocr_dpi": settings.OCR_DPI,
+            "ocr_max_side": settings.OCR_MAX_IMAGE_SIDE,
+            "ocr_config": settings.OCR_TESSERACT_CONFIG,
+        },
+    )
+    extraction.start()
+    app.state.extraction_service = extraction
+    parse_cache = None
+    if settings.PARSE_CACHE_ENABLED:
+        parse_cache = ParseCache(
+            settings.PARSE_CACHE_PATH,
+            max_entries=settings.PARSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PARSE_CACHE_TTL_SECONDS,
+        )
+    app.state.parse_cache = parse_cache
+    skill_index = SkillIndex()
+    app.state.skill_index = skill_index
+    embeddings = None
+    if settings.EMBEDDINGS_ENABLED:
+        embeddings = EmbeddingService(
+            create_embedder(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM),
+            indexed_sections=tuple(settings.EMBEDDING_INDEXED_SECTIONS),
+            ivf_threshold=settings.EMBEDDING_IVF_THRESHOLD,
+            nprobe=settings.EMBEDDING_IVF_NPROBE,
+        )
+    app.state.embeddings = embeddings
+    pipeline = ResumePipeline(
+        extraction,
+        ResumeParser(llm),
+        cache=parse_cache,
+        skill_index=skill_index,
+        embeddings=embeddings,
+        match_cache=match_cache,
+    )
+    app.state.resume_pipeline = pipeline
+    app.state.processing_queue = ProcessingQueue(
+        pipeline.process,
+        workers=settings.PROCESSING_WORKERS,
+        maxsize=settings.PROCESSING_QUEUE_SIZE,
+    )
+    # Jobs that were queued or running when the previous process stopped
+    async with session_scope() as session:
+        pending = list(await session.scalars(
+            select(Resume.id)
+            .where(Resume.processing_status.in_(ResumeStatus.PENDING))
+            .order_by(Resume.created_at)
+        ))
+    await app.state.processing_queue.start(pending)
+    # index resumes parsed before the skill index existed, without delaying startup
+    app.state.skill_backfill = asyncio.create_task(skill_index.backfill())
+    app.state.embedding_warmup = asyncio.create_task(embeddings.warm()) if embeddings else None
+    app.state.match_cache_prune = asyncio.create_task(match_cache.prune()) if match_cache else None
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.skill_backfill.cancel()
+    if app.state.embedding_warmup is not None:
+        app.state.embedding_warmup.cancel()
+    if app.state.match_cache_prune is not None:
+        app.state.match_cache_prune.cancel()
+    await app.state.processing_queue.stop()
+    app.state.extraction_service.shutdown()
+    if app.state.parse_cache is not None:
+        app.state.parse_cache.close()
+    app.state.llm_service.close()
+    await dispose_engine()
+
 @app.get("/")
 async def root():
     return {
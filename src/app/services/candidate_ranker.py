@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Resume, ResumeSkill, ResumeStatus
+from app.services.job_matcher import JobMatcher
+from app.utils.skills import normalize_skills
+
+logger = logging.getLogger(__name__)
+
+
+class Shortlist:
+    """Outcome of the local prefilter: every candidate scored, best first."""
+
+    def __init__(self, resume_ids: List[str], scores: np.ndarray, required_hits: np.ndarray, terms: List[str]):
+        self.resume_ids = resume_ids
+        self.scores = scores
+        self.required_hits = required_hits
+        self.terms = terms
+
+    def __len__(self) -> int:
+        return len(self.resume_ids)
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                "resume_id": self.resume_ids[i],
+                "prefilter_score": round(float(self.scores[i]), 2),
+                "required_hits": int(self.required_hits[i]),
+            }
+            for i in range(min(k, len(self.resume_ids)))
+        ]
+
+
+class CandidateRanker:
+    """
+    One job against many resumes in two stages.
+
+    Stage one scores every candidate from the skill postings alone: required
+    and preferred skills become a weight vector and each resume's score is a
+    single bincount over its matching postings. Stage two runs JobMatcher on
+    only the top K, concurrently; in llm/hybrid mode the shared Gemini rate
+    limiter keeps that within quota.
+    """
+
+    def __init__(self, matcher: JobMatcher, required_weight: float = 0.8, max_candidates: int = 50000):
+        self.matcher = matcher
+        self.required_weight = min(1.0, max(0.0, required_weight))
+        self.max_candidates = max_candidates
+        self.jobs = 0
+        self.candidates_scored = 0
+        self.matches = 0
+        self._prefilter_seconds = 0.0
+
+    def term_weights(self, required: Sequence[str], preferred: Sequence[str]):
+        """Normalized terms and their weights; weights sum to 100 when there are any terms."""
+        required = normalize_skills(required)
+        preferred = [s for s in normalize_skills(preferred) if s not in required]
+        if required and preferred:
+            req_share, pref_share = self.required_weight, 1.0 - self.required_weight
+        else:
+            req_share, pref_share = 1.0, 1.0
+        weights = [100.0 * req_share / len(required)] * len(required) if required else []
+        weights += [100.0 * pref_share / len(preferred)] * len(preferred) if preferred else []
+        return required + preferred, np.asarray(weights, dtype=np.float64), len(required)
+
+    async def _candidate_ids(self, session: AsyncSession, resume_ids: Optional[List[str]]) -> List[str]:
+        query = select(Resume.id).where(Resume.processing_status == ResumeStatus.COMPLETED)
+        if resume_ids is not None:
+            query = query.where(Resume.id.in_(resume_ids))
+        query = query.order_by(Resume.created_at.desc()).limit(self.max_candidates)
+        return list(await session.scalars(query))
+
+    async def prefilter(
+        self, session: AsyncSession, job: Dict[str, Any], resume_ids: Optional[List[str]] = None
+    ) -> Shortlist:
+        """Score every completed candidate by weighted skill overlap (0-100)."""
+        started = time.perf_counter()
+        ids = await self._candidate_ids(session, resume_ids)
+        terms, weights, n_required = self.term_weights(
+            job.get("required_skills") or [], job.get("preferred_skills") or []
+        )
+        scores = np.zeros(len(ids))
+        required_hits = np.zeros(len(ids), dtype=np.int64)
+        if ids and terms:
+            query = select(ResumeSkill.resume_id, ResumeSkill.skill).where(ResumeSkill.skill.in_(terms))
+            if resume_ids is not None:
+                query = query.where(ResumeSkill.resume_id.in_(ids))
+            postings = (await session.execute(query)).all()
+            row_of = {rid: i for i, rid in enumerate(ids)}
+            col_of = {term: j for j, term in enumerate(terms)}
+            pairs = [(row_of[rid], col_of[skill]) for rid, skill in postings if rid in row_of]
+            if pairs:
+                rows, cols = np.asarray(pairs, dtype=np.int64).T
+                scores = np.bincount(rows, weights=weights[cols], minlength=len(ids))
+                required_hits = np.bincount(rows, weights=cols < n_required, minlength=len(ids)).astype(np.int64)
+        order = np.argsort(-scores, kind="stable")
+        self.jobs += 1
+        self.candidates_scored += len(ids)
+        self._prefilter_seconds += time.perf_counter() - started
+        return Shortlist([ids[i] for i in order], scores[order], required_hits[order], terms)
+
+    async def _match_one(
+        self, resume_id: str, parsed_data: Dict[str, Any], version: str, job: Dict[str, Any], mode: Optional[str]
+    ):
+        """(resume_id, result, error) so one failed match does not end the stream."""
+        try:
+            result = await self.matcher.match(parsed_data, job, mode=mode, resume_key=(resume_id, version))
+        except Exception as e:
+            logger.warning("Match failed for resume %s: %s", resume_id, e)
+            return resume_id, None, e
+        result["match_id"] = result.get("match_id") or str(uuid.uuid4())
+        result["resume_id"] = resume_id
+        result["job_title"] = job.get("title", "")
+        return resume_id, result, None
+
+    async def stream(
+        self,
+        shortlist: Shortlist,
+        parsed: Dict[str, Tuple[Dict[str, Any], str]],
+        job: Dict[str, Any],
+        top_k: int,
+        mode: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield NDJSON-ready events: the prefilter shortlist, each match as it
+        completes, then the final ranking by overall score. `parsed` maps
+        resume id to (parsed_data, version).
+        """
+        top = [entry for entry in shortlist.top(top_k) if entry["resume_id"] in parsed]
+        yield {
+            "type": "prefilter",
+            "candidates": len(shortlist),
+            "skills": shortlist.terms,
+            "shortlist": top,
+        }
+
+        tasks = [
+            asyncio.ensure_future(self._match_one(e["resume_id"], *parsed[e["resume_id"]], job, mode)) for e in top
+        ]
+        prefilter = {entry["resume_id"]: entry for entry in top}
+        ranking = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                resume_id, result, error = await next_done
+                if error is not None:
+                    yield {"type": "error", "resume_id": resume_id, "detail": str(error)}
+                    continue
+                self.matches += 1
+                entry = prefilter[resume_id]
+                ranking.append({**entry, "overall_score": result["scores"]["overall_score"]})
+                yield {"type": "match", "prefilter_score": entry["prefilter_score"], "result": result}
+        finally:
+            # client went away: stop spending LLM quota on the rest
+            for task in tasks:
+                task.cancel()
+
+        ranking.sort(key=lambda r: (r["overall_score"], r["prefilter_score"]), reverse=True)
+        yield {"type": "ranking", "results": [{"rank": i + 1, **r} for i, r in enumerate(ranking)]}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "jobs": self.jobs,
+            "candidates_scored": self.candidates_scored,
+            "matches": self.matches,
+            "avg_prefilter_ms": round(self._prefilter_seconds / self.jobs * 1000, 3) if self.jobs else None,
+        }
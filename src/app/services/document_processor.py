@@ -1,13 +1,49 @@
+import logging
 import PyPDF2
 import pdfplumber
 from docx import Document
 import pytesseract
-from PIL import Image
-from typing import Optional
+from PIL import Image, ImageOps
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# fast mode: a PyPDF2 page with less whitespace than this is likely glued
+# words from a positioned layout, and is re-extracted with pdfplumber
+MIN_WHITESPACE_RATIO = 0.08
+# DPI normalization never scales an image by more than this (either way)
+MAX_DPI_SCALE = 2.0
 
 class DocumentProcessor:
     """Extract text from various document formats"""
     
+    # "layout": pdfplumber per page (keeps reading order), PyPDF2 if a page fails
+    # "fast": PyPDF2 per page (several times faster on text-layer PDFs),
+    #         pdfplumber only for pages PyPDF2 reads badly
+    PDF_MODES = ("layout", "fast")
+    
+    def __init__(
+        self,
+        pdf_max_pages: int = 10,
+        pdf_mode: str = "layout",
+        ocr_min_page_chars: int = 40,
+        ocr_dpi: int = 300,
+        ocr_max_side: int = 4000,
+        ocr_config: str = "--oem 1 --psm 6",
+        ocr_timeout: float = 30.0,
+        ocr_pdf_fallback: bool = True,
+    ):
+        if pdf_mode not in self.PDF_MODES:
+            raise ValueError(f"Unknown PDF mode '{pdf_mode}', expected one of {', '.join(self.PDF_MODES)}")
+        self.pdf_max_pages = pdf_max_pages
+        self.pdf_mode = pdf_mode
+        self.ocr_min_page_chars = ocr_min_page_chars
+        self.ocr_dpi = ocr_dpi
+        self.ocr_max_side = ocr_max_side
+        self.ocr_config = ocr_config
+        self.ocr_timeout = ocr_timeout
+        self.ocr_pdf_fallback = ocr_pdf_fallback
+    
     def extract_text(self, file_path: str, filename: str) -> str:
         """Extract text based on file type"""
         extension = filename.lower().split('.')[-1]
@@ -24,21 +60,86 @@ class DocumentProcessor:
             raise ValueError(f"Unsupported file format: {extension}")
     
     def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
+        """
+        Extract text from PDF (the first pdf_max_pages pages); image-only
+        pages are OCR'd inline if ocr_pdf_fallback is set. ExtractionService
+        reads PDFs page range by page range instead and OCRs in its own pool.
+        """
+        _, pages = self.extract_pdf_pages(file_path)
+        if not self.ocr_pdf_fallback:
+            return self.join_pages(pages)
+        for index in self.sparse_pages(pages):
+            try:
+                pages[index] = self.ocr_pdf_page(file_path, index) or pages[index]
+            except Exception as e:
+                logger.warning("OCR of page %d of %s failed: %s", index + 1, file_path, e)
+        return self.join_pages(pages)
+    
+    @staticmethod
+    def join_pages(pages: List[str]) -> str:
+        return "\n".join(page for page in pages if page).strip()
+    
+    def extract_pdf_pages(self, file_path: str, start: int = 0, end: Optional[int] = None) -> Tuple[int, List[str]]:
+        """
+        (page count of the document, text of pages [start, end)), with `end`
+        capped at pdf_max_pages. Every page falls back to the other library
+        on its own, so one bad page does not cost a re-parse of the file.
+        """
+        reader = plumber = None
+        try:
+            reader = PyPDF2.PdfReader(file_path)
+        except Exception as e:
+            logger.warning("PyPDF2 cannot open %s (%s); using pdfplumber only", file_path, e)
+        try:
+            plumber = pdfplumber.open(file_path)
+        except Exception as e:
+            if reader is None:
+                raise
+            logger.warning("pdfplumber cannot open %s (%s); using PyPDF2 only", file_path, e)
         try:
-            # Try pdfplumber first
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-        except:
-            # Fallback to PyPDF2
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    text += page.extract_text() or ""
+            total = len(reader.pages) if reader is not None else len(plumber.pages)
+            end = min(total, self.pdf_max_pages, total if end is None else end)
+            return total, [self._extract_pdf_page(reader, plumber, i, file_path) for i in range(start, end)]
+        finally:
+            if plumber is not None:
+                plumber.close()
+    
+    def _extract_pdf_page(self, reader, plumber, index: int, file_path: str) -> str:
+        def with_pypdf2() -> str:
+            if reader is None:
+                raise RuntimeError("PyPDF2 unavailable for this file")
+            return reader.pages[index].extract_text() or ""
         
-        return text.strip()
+        def with_pdfplumber() -> str:
+            if plumber is None:
+                raise RuntimeError("pdfplumber unavailable for this file")
+            return plumber.pages[index].extract_text() or ""
+        
+        if self.pdf_mode == "fast":
+            first, second = with_pypdf2, with_pdfplumber
+        else:
+            first, second = with_pdfplumber, with_pypdf2
+        try:
+            text = first()
+            if self.pdf_mode == "layout" or not self._needs_layout(text):
+                return text
+        except Exception as e:
+            logger.warning("Page %d of %s failed with %s: %s", index + 1, file_path, first.__name__, e)
+            text = ""
+        try:
+            return second() or text
+        except Exception as e:
+            logger.warning("Page %d of %s failed with %s: %s", index + 1, file_path, second.__name__, e)
+            return text
+    
+    @staticmethod
+    def _needs_layout(text: str) -> bool:
+        """True if a PyPDF2 page looks empty or like words run together"""
+        stripped = text.strip()
+        if not stripped:
+            return True
+        spaces = sum(1 for ch in stripped if ch.isspace())
+        return len(stripped) > 200 and spaces / len(stripped) < MIN_WHITESPACE_RATIO
     
     def _extract_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX"""
@@ -53,6 +154,54 @@ class DocumentProcessor:
     
     def _extract_from_image(self, file_path: str) -> str:
         """Extract text from image using OCR"""
-        image = Image.open(file_path)
-        text = pytesseract.image_to_string(image)
-        return text.strip()
\ No newline at end of file
+        with Image.open(file_path) as image:
+            return self.ocr(image)
+    
+    # -----------------------
+    # OCR
+    # -----------------------
+    def sparse_pages(self, pages: List[str], offset: int = 0) -> List[int]:
+        """
+        Indexes (plus `offset`) of pages with almost no text layer: scans,
+        or text drawn as images. Counts letters and digits, so page numbers
+        and stray bullets do not make a scanned page look like text.
+        """
+        return [
+            offset + i for i, text in enumerate(pages)
+            if sum(ch.isalnum() for ch in text) < self.ocr_min_page_chars
+        ]
+    
+    def ocr_pdf_page(self, file_path: str, index: int) -> str:
+        """Render one PDF page at ocr_dpi and OCR it"""
+        with pdfplumber.open(file_path) as pdf:
+            image = pdf.pages[index].to_image(resolution=self.ocr_dpi).original
+        # rendered at the target resolution already; only grayscale and size cap apply
+        return self.ocr(image, dpi=self.ocr_dpi)
+    
+    def ocr(self, image: Image.Image, dpi: Optional[float] = None) -> str:
+        """
+        Preprocess and run tesseract. Raises RuntimeError if tesseract
+        runs longer than ocr_timeout (pytesseract kills the process).
+        """
+        image = self.preprocess_image(image, dpi)
+        text = pytesseract.image_to_string(image, config=self.ocr_config, timeout=self.ocr_timeout)
+        return text.strip()
+    
+    def preprocess_image(self, image: Image.Image, dpi: Optional[float] = None) -> Image.Image:
+        """
+        Grayscale, upright (EXIF orientation of phone photos), scaled to
+        ocr_dpi when the resolution is known, and downscaled so the longest
+        side is at most ocr_max_side. Tesseract time grows with pixel count,
+        and phone photos are often several times larger than it needs.
+        """
+        if dpi is None:
+            dpi = (image.info.get("dpi") or (None,))[0]
+        image = ImageOps.exif_transpose(image).convert("L")
+        scale = 1.0
+        if dpi and dpi > 1:
+            scale = min(max(self.ocr_dpi / dpi, 1 / MAX_DPI_SCALE), MAX_DPI_SCALE)
+        scale = min(scale, self.ocr_max_side / max(image.size))
+        if abs(scale - 1) > 0.05:
+            size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(size, Image.LANCZOS)
+        return image
\ No newline at end of file
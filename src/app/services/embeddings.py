@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import math
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, exists, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Resume, ResumeEmbedding, ResumeStatus, session_scope
+from app.utils.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+# -----------------------
+# Embedders
+# -----------------------
+class Embedder:
+    """Turns texts into L2-normalized float32 vectors of size `dim`."""
+
+    name = "base"
+    dim = 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Dependency-free fallback: signed feature hashing of word unigrams and
+    bigrams with sublinear term frequency. Deterministic across processes
+    (crc32, not Python's salted hash), so stored vectors stay comparable.
+    """
+
+    _TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        words = [w.rstrip(".") for w in self._TOKEN.findall(text.lower())]
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for feature, count in features.items():
+            h = zlib.crc32(feature.encode())
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            vector[h % self.dim] += sign * (1.0 + math.log(count))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self._vector(t or "") for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+
+
+class SentenceTransformerEmbedder(Embedder):
+    """Local CPU model via the optional sentence-transformers package."""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"st:{model_name}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+def create_embedder(backend: str, model_name: str, dim: int) -> Embedder:
+    if backend == "sentence-transformers":
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            logger.warning("sentence-transformers unavailable (%s); using the hashing embedder", e)
+    return HashingEmbedder(dim)
+
+
+# -----------------------
+# Text builders
+# -----------------------
+def _join(*parts: Any) -> str:
+    return " ".join(str(p) for p in parts if p)
+
+
+def resume_sections(parsed_data: Dict[str, Any]) -> Dict[str, str]:
+    """Text per section of a parsed resume; 'full' concatenates all of them."""
+    if not isinstance(parsed_data, dict):
+        return {}
+    skills = parsed_data.get("skills") or {}
+    jobs = [j for j in parsed_data.get("experience") or [] if isinstance(j, dict)]
+    schools = [e for e in parsed_data.get("education") or [] if isinstance(e, dict)]
+    sections = {
+        "summary": _join(parsed_data.get("summary")),
+        "skills": _join(*(skills.get("technical") or []), *(skills.get("soft") or [])),
+        "experience": " ".join(
+            _join(j.get("title"), j.get("company"), j.get("description"),
+                  *(j.get("achievements") or []), *(j.get("technologies") or []))
+            for j in jobs
+        ),
+        "education": " ".join(_join(e.get("degree"), e.get("field"), e.get("institution")) for e in schools),
+    }
+    sections = {name: text for name, text in sections.items() if text.strip()}
+    if sections:
+        sections["full"] = " ".join(sections.values())
+    return sections
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    return _join(
+        job.get("title"), job.get("description"),
+        *(job.get("required_skills") or []), *(job.get("preferred_skills") or []),
+        job.get("experience_required"),
+    )
+
+
+# -----------------------
+# Service
+# -----------------------
+class EmbeddingService:
+    """
+    Embeds parsed resumes per section, persists the vectors in
+    `resume_embeddings` and keeps an in-memory VectorIndex per indexed
+    section for top-N retrieval. Vectors are tagged with the embedder name;
+    changing the embedder re-embeds on the next backfill.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        indexed_sections: Tuple[str, ...] = ("full",),
+        ivf_threshold: int = 20000,
+        nprobe: int = 8,
+    ):
+        self.embedder = embedder
+        self.indexes = {s: VectorIndex(embedder.dim, ivf_threshold, nprobe) for s in indexed_sections}
+        self._training: Optional[asyncio.Task] = None
+        self.embedded = 0
+        self.searches = 0
+        self._search_seconds = 0.0
+
+    async def embed_parsed(self, parsed_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        sections = resume_sections(parsed_data)
+        if not sections:
+            return {}
+        names = list(sections)
+        matrix = await asyncio.to_thread(self.embedder.embed, [sections[n] for n in names])
+        return dict(zip(names, matrix))
+
+    async def store(self, session: AsyncSession, resume_id: str, vectors: Dict[str, np.ndarray]) -> None:
+        """Replace a resume's vectors inside the caller's transaction."""
+        await session.execute(delete(ResumeEmbedding).where(ResumeEmbedding.resume_id == resume_id))
+        if vectors:
+            await session.execute(insert(ResumeEmbedding), [
+                {
+                    "resume_id": resume_id,
+                    "section": section,
+                    "model": self.embedder.name,
+                    "dim": len(vector),
+                    "vector": np.asarray(vector, dtype=np.float32).tobytes(),
+                }
+                for section, vector in vectors.items()
+            ])
+        self.embedded += 1
+
+    def publish(self, resume_id: str, vectors: Dict[str, np.ndarray]) -> None:
+        """Make committed vectors searchable."""
+        for section, index in self.indexes.items():
+            if section in vectors:
+                index.add(resume_id, vectors[section])
+            else:
+                index.remove(resume_id)
+        self._maybe_train()
+
+    async def remove(self, session: AsyncSession, resume_id: str) -> None:
+        await session.execute(delete(ResumeEmbedding).where(ResumeEmbedding.resume_id == resume_id))
+        for index in self.indexes.values():
+            index.remove(resume_id)
+
+    def _maybe_train(self) -> None:
+        if self._training is not None and not self._training.done():
+            return
+        for section, index in self.indexes.items():
+            if index.needs_training():
+                self._training = asyncio.get_running_loop().create_task(self._train(section, index))
+                return
+
+    async def _train(self, section: str, index: VectorIndex) -> None:
+        try:
+            ids, vectors = index.snapshot()
+            centroids, labels = await asyncio.to_thread(VectorIndex.train, vectors)
+            index.install(centroids, ids, labels)
+        except Exception as e:
+            logger.warning("Training the %s vector index failed: %s", section, e)
+
+    async def search(self, job: Dict[str, Any], top_n: int = 20, section: str = "full") -> List[Tuple[str, float]]:
+        started = time.perf_counter()
+        query = (await asyncio.to_thread(self.embedder.embed, [job_text(job)]))[0]
+        results = self.indexes[section].search(query, top_n)
+        self.searches += 1
+        self._search_seconds += time.perf_counter() - started
+        return results
+
+    async def load(self, batch_size: int = 5000) -> int:
+        """Fill the in-memory indexes from stored vectors of the current embedder."""
+        loaded, last = 0, ("", "")
+        sections = list(self.indexes)
+        while True:
+            async with session_scope() as session:
+                rows = (await session.execute(
+                    select(ResumeEmbedding.resume_id, ResumeEmbedding.section, ResumeEmbedding.vector)
+                    .where(
+                        ResumeEmbedding.model == self.embedder.name,
+                        ResumeEmbedding.section.in_(sections),
+                        tuple_(ResumeEmbedding.resume_id, ResumeEmbedding.section) > tuple_(*last),
+                    )
+                    .order_by(ResumeEmbedding.resume_id, ResumeEmbedding.section)
+                    .limit(batch_size)
+                )).all()
+            for resume_id, section, blob in rows:
+                self.indexes[section].add(resume_id, np.frombuffer(blob, dtype=np.float32))
+            loaded += len(rows)
+            if len(rows) < batch_size:
+                break
+            last = (rows[-1].resume_id, rows[-1].section)
+        self._maybe_train()
+        return loaded
+
+    async def backfill(self, batch_size: int = 200) -> int:
+        """Embed completed resumes that have no vectors from the current embedder."""
+        total, last_id = 0, ""
+        while True:
+            async with session_scope() as session:
+                rows = (await session.execute(
+                    select(Resume.id, Resume.parsed_data)
+                    .where(
+                        Resume.id > last_id,
+                        Resume.processing_status == ResumeStatus.COMPLETED,
+                        ~exists().where(
+                            ResumeEmbedding.resume_id == Resume.id,
+                            ResumeEmbedding.model == self.embedder.name,
+                        ),
+                    )
+                    .order_by(Resume.id)
+                    .limit(batch_size)
+                )).all()
+                embedded = []
+                for resume_id, parsed_data in rows:
+                    vectors = await self.embed_parsed(parsed_data)
+                    await self.store(session, resume_id, vectors)
+                    embedded.append((resume_id, vectors))
+            for resume_id, vectors in embedded:
+                self.publish(resume_id, vectors)
+            total += len(rows)
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1].id
+        if total:
+            logger.info("Embedded %d resumes with %s", total, self.embedder.name)
+        return total
+
+    async def warm(self) -> None:
+        """Startup task: load stored vectors, then embed whatever is missing."""
+        try:
+            await self.load()
+            await self.backfill()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Embedding warm-up failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "embedder": self.embedder.name,
+            "embedded": self.embedded,
+            "searches": self.searches,
+            "avg_search_ms": round(self._search_seconds / self.searches * 1000, 3) if self.searches else None,
+            "indexes": {section: index.stats() for section, index in self.indexes.items()},
+        }
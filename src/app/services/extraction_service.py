@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from app.services.document_processor import DocumentProcessor
+
+logger = logging.getLogger(__name__)
+
+# File extension -> concurrency group
+FORMAT_GROUPS = {
+    "pdf": "pdf",
+    "docx": "docx",
+    "doc": "docx",
+    "txt": "txt",
+    "jpg": "image",
+    "jpeg": "image",
+    "png": "image",
+}
+
+
+class ExtractionSaturatedError(Exception):
+    """Raised when the extraction backlog is at its configured cap."""
+
+
+def _extract_text(file_path: str, filename: str, options: Dict[str, object]) -> str:
+    """Process-pool entry point; must stay importable at module level."""
+    return DocumentProcessor(**options).extract_text(file_path, filename)
+
+
+def _extract_pdf_pages(file_path: str, start: int, end: int, options: Dict[str, object]) -> Tuple[int, List[str]]:
+    """Process-pool entry point for one page range of a PDF."""
+    return DocumentProcessor(**options).extract_pdf_pages(file_path, start, end)
+
+
+def _ocr_pdf_page(file_path: str, index: int, options: Dict[str, object]) -> str:
+    """OCR-pool entry point for one image-only PDF page."""
+    return DocumentProcessor(**options).ocr_pdf_page(file_path, index)
+
+
+class ExtractionService:
+    """
+    Runs DocumentProcessor in a process pool so CPU-heavy parsing and OCR never
+    block the event loop. Each format group has its own concurrency limit and
+    the total number of in-flight + waiting extractions is capped.
+
+    PDFs are read page range by page range: the first `pdf_pages_per_task`
+    pages in one task, then the remaining pages (up to `pdf_max_pages`)
+    fanned out across the pool in parallel.
+
+    OCR (images, and PDF pages with almost no text layer) runs in a second,
+    smaller pool of `ocr_workers` processes. Tesseract is killed after
+    `ocr_timeout` seconds per page, so one bad scan cannot hold a CPU.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = 32,
+        format_limits: Optional[Dict[str, int]] = None,
+        pdf_max_pages: int = 10,
+        pdf_mode: str = "layout",
+        pdf_pages_per_task: int = 3,
+        ocr_workers: int = 2,
+        ocr_timeout: float = 30.0,
+        ocr_pdf_fallback: bool = True,
+        ocr_options: Optional[Dict[str, object]] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pdf_max_pages = pdf_max_pages
+        self.pdf_pages_per_task = max(1, pdf_pages_per_task)
+        self.ocr_workers = max(1, ocr_workers)
+        self.ocr_timeout = ocr_timeout
+        self.ocr_pdf_fallback = ocr_pdf_fallback
+        # DocumentProcessor settings, sent to the workers with every task
+        self.options = {
+            "pdf_max_pages": pdf_max_pages,
+            "pdf_mode": pdf_mode,
+            "ocr_timeout": ocr_timeout,
+            "ocr_pdf_fallback": ocr_pdf_fallback,
+            **(ocr_options or {}),
+        }
+        # tasks are only submitted when a worker is free, so a timeout measures OCR, not queueing
+        self._ocr_slots = asyncio.Semaphore(self.ocr_workers)
+        format_limits = format_limits or {}
+        groups = set(FORMAT_GROUPS.values())
+        self._limits = {g: asyncio.Semaphore(max(1, format_limits.get(g, 4))) for g in groups}
+        self._in_flight = {g: 0 for g in groups}
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._ocr_executor: Optional[ProcessPoolExecutor] = None
+        # bumped by every pool restart: jobs that saw the same broken pools restart them once
+        self._generation = 0
+        self.restarts = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.pdf_pages = 0
+        self.pdf_truncated = 0
+        self.ocr_pages = 0
+        self.ocr_failed = 0
+        self.ocr_timeouts = 0
+
+    def start(self) -> None:
+        # spawn: forking a process that already holds gRPC/DB threads is unsafe
+        context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        self._ocr_executor = ProcessPoolExecutor(max_workers=self.ocr_workers, mp_context=context)
+
+    def shutdown(self) -> None:
+        for executor in (self._executor, self._ocr_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._ocr_executor = None
+
+    def _restart(self) -> None:
+        self.shutdown()
+        self.start()
+        self._generation += 1
+        self.restarts += 1
+
+    def is_saturated(self) -> bool:
+        return self._pending >= self.max_pending
+
+    @staticmethod
+    def format_group(filename: str) -> str:
+        extension = filename.lower().split('.')[-1]
+        if extension not in FORMAT_GROUPS:
+            raise ValueError(f"Unsupported file format: {extension}")
+        return FORMAT_GROUPS[extension]
+
+    async def extract_text(self, file_path: str, filename: str, wait: bool = False) -> str:
+        """
+        Extract text in the pool. With wait=False a saturated service raises
+        ExtractionSaturatedError instead of queueing more work.
+        """
+        group = self.format_group(filename)
+        if not wait and self.is_saturated():
+            self.rejected += 1
+            raise ExtractionSaturatedError("Document extraction is saturated, retry later")
+        if self._executor is None:
+            self.start()
+
+        self._pending += 1
+        generation = self._generation
+        try:
+            async with self._limits[group]:
+                self._in_flight[group] += 1
+                try:
+                    if group == "pdf":
+                        text = await self._extract_pdf(file_path)
+                    elif group == "image":
+                        text = await self._ocr(_extract_text, file_path, filename, self.options)
+                    else:
+                        loop = asyncio.get_running_loop()
+                        text = await loop.run_in_executor(
+                            self._executor, _extract_text, file_path, filename, self.options
+                        )
+                finally:
+                    self._in_flight[group] -= 1
+            if not text.strip():
+                # e.g. a scan whose OCR failed: nothing for the parser to work with
+                raise ValueError(f"No text could be extracted from {filename}")
+            self.completed += 1
+            return text
+        except BrokenProcessPool:
+            # A worker died (e.g. a native crash in a parser) and every job in
+            # flight gets this error; only the first replaces the pools, later
+            # ones would cancel healthy work already sent to the new ones
+            self.failed += 1
+            if generation == self._generation:
+                logger.error("Extraction pool broken while processing %s; restarting pool", filename)
+                self._restart()
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    async def _extract_pdf(self, file_path: str) -> str:
+        loop = asyncio.get_running_loop()
+        workers = self.max_workers or os.cpu_count() or 1
+        # with a single worker, splitting only adds the cost of reopening the file
+        per_task = self.pdf_pages_per_task if workers > 1 else self.pdf_max_pages
+        total, pages = await loop.run_in_executor(
+            self._executor, _extract_pdf_pages, file_path, 0, per_task, self.options
+        )
+        last = min(total, self.pdf_max_pages)
+        if last > per_task:
+            ranges = await asyncio.gather(*(
+                loop.run_in_executor(
+                    self._executor, _extract_pdf_pages, file_path, start, min(start + per_task, last), self.options
+                )
+                for start in range(per_task, last, per_task)
+            ))
+            for _, chunk in ranges:
+                pages.extend(chunk)
+        if total > last:
+            self.pdf_truncated += 1
+            logger.info("%s has %d pages; extracted the first %d", file_path, total, last)
+        self.pdf_pages += len(pages)
+        if self.ocr_pdf_fallback:
+            sparse = DocumentProcessor(**self.options).sparse_pages(pages)
+            if sparse:
+                ocr_texts = await asyncio.gather(*(self._ocr_page(file_path, i) for i in sparse))
+                for index, text in zip(sparse, ocr_texts):
+                    pages[index] = text or pages[index]
+        return DocumentProcessor.join_pages(pages)
+
+    async def _ocr_page(self, file_path: str, index: int) -> Optional[str]:
+        """OCR text of one PDF page, or None if OCR failed (the text layer is kept)"""
+        try:
+            return await self._ocr(_ocr_pdf_page, file_path, index, self.options)
+        except BrokenProcessPool:
+            raise
+        except Exception as e:
+            logger.warning("OCR of page %d of %s failed: %r", index + 1, file_path, e)
+            return None
+
+    async def _ocr(self, fn, *args) -> str:
+        """Run one OCR task in the OCR pool, bounded by ocr_timeout plus time to render and load"""
+        loop = asyncio.get_running_loop()
+        await self._ocr_slots.acquire()
+        try:
+            future = loop.run_in_executor(self._ocr_executor, fn, *args)
+        except BaseException:
+            self._ocr_slots.release()
+            raise
+        # The slot is held until the worker is free again, not until we stop
+        # waiting: a timed-out or cancelled wait abandons the result, but the
+        # process keeps running it, and the next task would queue behind it.
+        future.add_done_callback(self._release_ocr_slot)
+        try:
+            # tesseract itself is killed at ocr_timeout; the margin covers rendering the page
+            text = await asyncio.wait_for(asyncio.shield(future), timeout=self.ocr_timeout * 1.5 + 5)
+        except asyncio.TimeoutError:
+            self.ocr_timeouts += 1
+            self.ocr_failed += 1
+            raise
+        except Exception as e:
+            if "timeout" in str(e).lower():  # pytesseract: RuntimeError("Tesseract process timeout")
+                self.ocr_timeouts += 1
+            self.ocr_failed += 1
+            raise
+        self.ocr_pages += 1
+        return text
+
+    def _release_ocr_slot(self, future: asyncio.Future) -> None:
+        self._ocr_slots.release()
+        if not future.cancelled():
+            future.exception()  # retrieved, so an abandoned failure is not logged as unhandled
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "in_flight": dict(self._in_flight),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "pdf_pages": self.pdf_pages,
+            "pdf_truncated": self.pdf_truncated,
+            "ocr_workers": self.ocr_workers,
+            "ocr_pages": self.ocr_pages,
+            "ocr_failed": self.ocr_failed,
+            "ocr_timeouts": self.ocr_timeouts,
+        }
@@ -1,17 +1,72 @@
-from app.services.llm_service import LLMService
+from app.config import settings
+from app.services.llm_service import ANALYSIS_ERROR_PREFIX, LLMService
+from app.services.local_scorer import LocalScorer
+from app.services.match_cache import MatchCache
+from typing import Optional, Tuple
+
+MATCH_MODES = ("local", "llm", "hybrid")
 
 class JobMatcher:
     """Match resumes with job descriptions"""
-    
-    def __init__(self):
-        self.llm = LLMService()
-    
-    async def match(self, resume_data: dict, job_data: dict) -> dict:
-        """Match resume with job description"""
-        
+
+    def __init__(
+        self,
+        llm: Optional[LLMService] = None,
+        scorer: Optional[LocalScorer] = None,
+        cache: Optional[MatchCache] = None
+    ):
+        self.llm = llm or LLMService()
+        self.cache = cache
+        self.scorer = scorer or LocalScorer(
+            settings.MATCH_WEIGHTS, required_skill_weight=settings.JOB_MATCH_REQUIRED_WEIGHT
+        )
+        self.counts = {mode: 0 for mode in MATCH_MODES}
+        self.counts["cached"] = 0
+
+    async def match(
+        self,
+        resume_data: dict,
+        job_data: dict,
+        mode: Optional[str] = None,
+        resume_key: Optional[Tuple[str, str]] = None
+    ) -> dict:
+        """
+        Match resume with job description.
+
+        local: deterministic scoring only, no LLM call.
+        llm: Gemini analysis.
+        hybrid: local first; only scores inside the MATCH_HYBRID_LOW..HIGH
+        band (the borderline cases) are sent to Gemini.
+
+        resume_key is (resume id, parsed_data version); when given, Gemini
+        results are served from and stored in the match cache.
+        """
+        mode = mode or settings.MATCH_MODE
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode '{mode}', expected one of {', '.join(MATCH_MODES)}")
+
+        if mode != "llm":
+            result = self.scorer.score(resume_data, job_data)
+            overall = result["scores"]["overall_score"]
+            if mode == "local" or not settings.MATCH_HYBRID_LOW <= overall <= settings.MATCH_HYBRID_HIGH:
+                self.counts["local"] += 1
+                result["scoring_mode"] = "local"
+                return result
+
+        cache_key = None
+        if self.cache is not None and resume_key is not None:
+            cache_key = self.cache.make_key(
+                resume_key[0], resume_key[1], job_data, self.llm.model, self.llm.MATCH_PROMPT_VERSION
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                self.counts["cached"] += 1
+                cached["scoring_mode"] = mode
+                return cached
+
         # Use LLM for intelligent matching
         result = await self.llm.analyze_match(resume_data, job_data)
-        
+
         # Ensure scores structure
         if "scores" not in result:
             result["scores"] = {
@@ -20,5 +75,14 @@ class JobMatcher:
                 "experience_match": result.get("experience_match", 0),
                 "education_match": result.get("education_match", 0)
             }
-        
-        return result
\ No newline at end of file
+
+        self.counts[mode] += 1
+        result["scoring_mode"] = mode
+        if cache_key is not None and not str(result.get("explanation", "")).startswith(ANALYSIS_ERROR_PREFIX):
+            await self.cache.put(
+                cache_key, resume_key[0], job_data, self.llm.model, self.llm.MATCH_PROMPT_VERSION, result
+            )
+        return result
+
+    def stats(self) -> dict:
+        return dict(self.counts)
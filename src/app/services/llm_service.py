@@ -2,15 +2,25 @@
 import json
 import re
 import uuid
+import time
+import inspect
 import logging
 import asyncio
-from typing import Any, Dict, List, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Union
 from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from app.config import settings
+from app.services.match_prompt import build_match_prompt
+from app.services.response_decoder import decode_json, extract_json_text
+from app.services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, is_retryable
+from app.utils.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -20,9 +30,49 @@ except Exception:
     genai = None
 
 
+# -----------------------
+# Per-operation usage accounting
+# -----------------------
+_usage: ContextVar[Optional[Dict[str, Optional[int]]]] = ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_usage() -> Iterator[Dict[str, Optional[int]]]:
+    """
+    Count the LLM calls and reported tokens of everything awaited inside
+    the block. Tasks gathered inside it (sectioned parsing) inherit the
+    same accumulator. Token counts stay None if the API reports no usage.
+    """
+    usage: Dict[str, Optional[int]] = {"llm_calls": 0, "prompt_tokens": None, "output_tokens": None}
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def _record_usage(raw_resp: Any) -> None:
+    usage = _usage.get()
+    if usage is None:
+        return
+    usage["llm_calls"] += 1
+    meta = getattr(raw_resp, "usage_metadata", None)
+    for key, attr in (("prompt_tokens", "prompt_token_count"), ("output_tokens", "candidates_token_count")):
+        count = getattr(meta, attr, None)
+        if isinstance(count, int):
+            usage[key] = (usage[key] or 0) + count
+
+
 # -----------------------
 # Normalizers & JSON utils
 # -----------------------
+_NON_NUMERIC = re.compile(r"[^\d.+-eE]")
+_FLOAT = re.compile(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?")
+_INT = re.compile(r"-?\d+")
+_CAMEL_WORD = re.compile(r"(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
 class DataNormalizer:
     """Handles type conversions and small normalizations."""
 
@@ -36,8 +86,8 @@ class DataNormalizer:
         if "/" in s:
             try:
                 num_s, den_s = s.split("/", 1)
-                num = float(re.sub(r"[^\d.+-eE]", "", num_s))
-                den = float(re.sub(r"[^\d.+-eE]", "", den_s))
+                num = float(_NON_NUMERIC.sub("", num_s))
+                den = float(_NON_NUMERIC.sub("", den_s))
                 if den == 0:
                     return None
                 if abs(den - 4.0) < 1e-9:
@@ -51,7 +101,7 @@ class DataNormalizer:
                 return round((pct / 100.0) * 4.0, 3)
             except Exception:
                 return None
-        m = re.search(r"[-+]?\d*\.?\d+(?:[eE][-+]?\d+)?", s)
+        m = _FLOAT.search(s)
         if m:
             try:
                 return float(m.group(0))
@@ -119,7 +169,7 @@ class DataNormalizer:
             return max(0, min(100, value))
         if isinstance(value, float):
             return max(0, min(100, int(round(value))))
-        m = re.search(r"-?\d+", str(value))
+        m = _INT.search(str(value))
         if m:
             try:
                 return max(0, min(100, int(m.group(0))))
@@ -129,46 +179,20 @@ class DataNormalizer:
 
 
 class JSONParser:
-    """Robust extraction + JSON parsing helpers."""
+    """Robust extraction + JSON parsing helpers (see app.services.response_decoder)."""
 
     @staticmethod
     def clean_json_string(content: str) -> str:
-        if not content:
-            return ""
-        s = content.strip()
-        s = re.sub(r"^```(?:json)?\s*", "", s, flags=re.IGNORECASE)
-        s = re.sub(r"\s*```$", "", s, flags=re.IGNORECASE)
-        m = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", s)
-        if m:
-            return m.group(1)
-        return s
+        return extract_json_text(content)
 
     @staticmethod
     def parse_json(json_text: str) -> Dict[str, Any]:
-        if not json_text or not json_text.strip():
-            return {"_parse_error": "empty json_text", "_raw": json_text}
-        try:
-            parsed = json.loads(json_text)
-            if isinstance(parsed, list):
-                return {"_parsed_list": parsed}
-            return parsed if isinstance(parsed, dict) else {"result": parsed}
-        except json.JSONDecodeError:
-            logger.warning("JSONDecodeError, attempting repairs")
-        try:
-            repaired = json_text.replace("\r\n", "\n").replace("\t", " ")
-            repaired = repaired.replace("'", '"')
-            repaired = re.sub(r",\s*}", "}", repaired)
-            repaired = re.sub(r",\s*]", "]", repaired)
-            m = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", repaired)
-            if m:
-                repaired = m.group(1)
-            parsed = json.loads(repaired)
-            if isinstance(parsed, list):
-                return {"_parsed_list": parsed}
-            return parsed if isinstance(parsed, dict) else {"result": parsed}
-        except Exception as e:
-            logger.exception("Failed to repair JSON: %s", e)
-            return {"_raw": json_text, "_parse_error": str(e)}
+        parsed, repair = decode_json(json_text)
+        if repair == "failed":
+            logger.warning("Could not parse LLM JSON: %s", parsed.get("_parse_error"))
+        elif repair:
+            logger.warning("LLM JSON needed repair: %s", repair)
+        return parsed
 
 
 # -----------------------
@@ -222,8 +246,8 @@ class MatchingResultBuilder:
             return key
         if "_" in key or key.islower():
             return key
-        s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", key)
-        s2 = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1)
+        s1 = _CAMEL_WORD.sub(r"\1_\2", key)
+        s2 = _CAMEL_BOUNDARY.sub(r"\1_\2", s1)
         return s2.lower()
 
     @classmethod
@@ -305,7 +329,7 @@ class MatchingResultBuilder:
             text = " ".join(str(x) for x in scores_obj)
         else:
             text = str(scores_obj)
-        nums = re.findall(r"-?\d+", text)
+        nums = _INT.findall(text)
         if nums:
             out = default.copy()
             for i, k in enumerate(default.keys()):
@@ -443,8 +467,33 @@ class MatchingResultBuilder:
 # -----------------------
 # LLMService core
 # -----------------------
+# explanation prefix of the zero-score payload analyze_match returns when it cannot build a result
+ANALYSIS_ERROR_PREFIX = "Analysis error: "
+
+
+class LLMServiceError(Exception):
+    """The LLM call failed and no usable response was produced."""
+
+
+class LLMUnavailableError(LLMServiceError):
+    """Gemini is degraded: retries were exhausted or the circuit is open."""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class LLMService:
-    """Gemini (google.generativeai) integration for structured resume parsing."""
+    """
+    Gemini (google.generativeai) integration for structured resume parsing.
+
+    Create one instance per process (see app.main startup) and share it: the
+    SDK client, its gRPC channel and the GenerativeModel handle are built once
+    and reused by every request.
+    """
+
+    # bump when the analyze_match prompt changes; part of the match cache key
+    MATCH_PROMPT_VERSION = "2"
 
     def __init__(self):
         google_key = getattr(settings, "GOOGLE_API_KEY", None)
@@ -457,9 +506,151 @@ class LLMService:
         except Exception as e:
             logger.exception("Failed to configure google.generativeai: %s", e)
         self.model = getattr(settings, "GEMINI_MODEL", "models/gemini-2.5-flash")
+        self._model_handle = genai.GenerativeModel(self.model)
         self.parser = JSONParser()
         self.normalizer = DataNormalizer()
         self.result_builder = MatchingResultBuilder()
+        # All Gemini calls draw from one quota
+        self.limiter = RateLimiter(settings.LLM_MAX_CONCURRENCY, settings.LLM_REQUESTS_PER_MINUTE)
+        self._call_strategy: Optional[str] = None
+        self._call_stats: Dict[str, Dict[str, float]] = {}
+        # Dedicated pool for blocking SDK calls, sized to the Gemini concurrency
+        # so LLM I/O never queues behind (or starves) asyncio's default executor
+        self._executor_workers = settings.LLM_EXECUTOR_WORKERS or settings.LLM_MAX_CONCURRENCY
+        self._executor = ThreadPoolExecutor(max_workers=self._executor_workers, thread_name_prefix="gemini")
+        self.retry_policy = RetryPolicy(
+            settings.LLM_MAX_ATTEMPTS, settings.LLM_RETRY_BASE_DELAY, settings.LLM_RETRY_MAX_DELAY
+        )
+        self.breaker = CircuitBreaker(settings.LLM_CIRCUIT_FAILURE_THRESHOLD, settings.LLM_CIRCUIT_RESET_SECONDS)
+        self._retry_stats: Dict[str, int] = {"retries": 0, "timeouts": 0, "gave_up": 0}
+        self._match_prompt_stats: Dict[str, int] = {"prompts": 0, "tokens_total": 0, "tokens_max": 0, "trimmed": 0}
+        self._decode_stats: Dict[str, float] = {"responses": 0, "repaired": 0, "failed": 0, "chars": 0, "seconds": 0.0}
+        self._pool_lock = threading.Lock()
+        self._pool_stats: Dict[str, float] = {
+            "queued": 0, "running": 0, "completed": 0,
+            "wait_ms_total": 0.0, "wait_ms_max": 0.0, "call_ms_total": 0.0, "call_ms_max": 0.0,
+        }
+
+    def warm_up(self) -> None:
+        """Resolve the call strategy and open the SDK client/channel ahead of the first request."""
+        self.resolve_call_strategy()
+        try:
+            from google.generativeai import client as genai_client
+            if getattr(self._model_handle, "_client", None) is None:
+                self._model_handle._client = genai_client.get_default_generative_client()
+        except Exception as e:
+            logger.debug("Gemini client warm-up skipped: %s", e)
+
+    def close(self) -> None:
+        """Release resources held by the service."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -----------------------
+    # SDK call strategy
+    # -----------------------
+    # Ways of invoking the SDK across google.generativeai releases, in order of
+    # preference. One is chosen once (GEMINI_CALL_STRATEGY or auto-detection)
+    # and reused, so each LLM request makes exactly one network call.
+    CALL_STRATEGIES = ("generation_config", "plain", "generate_text")
+
+    def _strategy_available(self, name: str) -> bool:
+        if name == "generate_text":
+            return hasattr(genai, "generate_text")
+        generate = getattr(self._model_handle, "generate_content", None)
+        if generate is None:
+            return False
+        if name == "generation_config":
+            try:
+                return "generation_config" in inspect.signature(generate).parameters
+            except (TypeError, ValueError):
+                return False
+        return True
+
+    def resolve_call_strategy(self) -> str:
+        """Pick the SDK call signature without making a network request."""
+        configured = getattr(settings, "GEMINI_CALL_STRATEGY", "auto")
+        if configured != "auto":
+            if configured not in self.CALL_STRATEGIES:
+                raise ValueError(f"Unknown GEMINI_CALL_STRATEGY: {configured}")
+            self._call_strategy = configured
+        else:
+            self._call_strategy = next(
+                (name for name in self.CALL_STRATEGIES if self._strategy_available(name)), None
+            )
+            if self._call_strategy is None:
+                raise RuntimeError("No compatible generate_content/generate_text method in this google.generativeai version.")
+        logger.info("Gemini call strategy: %s", self._call_strategy)
+        return self._call_strategy
+
+    def _invoke_strategy(self, name: str, prompt: str, max_tokens: int, temperature: float) -> Any:
+        stats = self._call_stats.setdefault(name, {"calls": 0, "failures": 0, "total_ms": 0.0, "last_ms": 0.0})
+        started = time.perf_counter()
+        try:
+            if name == "generation_config":
+                return self._model_handle.generate_content(
+                    prompt,
+                    generation_config={"max_output_tokens": max_tokens, "temperature": temperature},
+                    request_options={"timeout": settings.LLM_TIMEOUT_SECONDS},
+                )
+            if name == "plain":
+                return self._model_handle.generate_content(prompt)
+            return genai.generate_text(model=self.model, prompt=prompt, max_output_tokens=max_tokens, temperature=temperature)
+        except Exception:
+            stats["failures"] += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["last_ms"] = elapsed_ms
+
+    def _generate(self, prompt: str, max_tokens: int, temperature: float) -> Any:
+        strategy = self._call_strategy or self.resolve_call_strategy()
+        try:
+            return self._invoke_strategy(strategy, prompt, max_tokens, temperature)
+        except (TypeError, AttributeError) as e:
+            # The SDK rejected the call shape locally (no request was sent):
+            # probe the remaining strategies once and remember the one that works.
+            logger.warning("Gemini call strategy %s unusable (%s); re-detecting", strategy, e)
+            for candidate in self.CALL_STRATEGIES:
+                if candidate == strategy or not self._strategy_available(candidate):
+                    continue
+                try:
+                    res = self._invoke_strategy(candidate, prompt, max_tokens, temperature)
+                except (TypeError, AttributeError):
+                    continue
+                self._call_strategy = candidate
+                logger.info("Gemini call strategy switched to %s", candidate)
+                return res
+            raise RuntimeError("No compatible generate_content/generate_text method succeeded for this google.generativeai version.")
+
+    def call_stats(self) -> Dict[str, Any]:
+        """Per-strategy attempt counts and timings."""
+        out: Dict[str, Any] = {"strategy": self._call_strategy}
+        for name, st in self._call_stats.items():
+            out[name] = {
+                "calls": st["calls"],
+                "failures": st["failures"],
+                "avg_ms": round(st["total_ms"] / st["calls"], 2) if st["calls"] else 0.0,
+                "last_ms": round(st["last_ms"], 2),
+            }
+        return out
+
+    def executor_stats(self) -> Dict[str, Any]:
+        """Queue wait vs. call time for the dedicated Gemini thread pool."""
+        with self._pool_lock:
+            st = dict(self._pool_stats)
+        done = st["completed"]
+        return {
+            "workers": self._executor_workers,
+            "queued": st["queued"],
+            "running": st["running"],
+            "completed": done,
+            "avg_wait_ms": round(st["wait_ms_total"] / done, 2) if done else 0.0,
+            "max_wait_ms": round(st["wait_ms_max"], 2),
+            "avg_call_ms": round(st["call_ms_total"] / done, 2) if done else 0.0,
+            "max_call_ms": round(st["call_ms_max"], 2),
+        }
 
     async def _call_gemini(self, prompt: str, max_tokens: int = 1500, temperature: float = 0.0) -> Any:
         try:
@@ -467,27 +658,116 @@ class LLMService:
         except RuntimeError:
             loop = asyncio.get_event_loop()
 
+        submitted = time.perf_counter()
+        with self._pool_lock:
+            self._pool_stats["queued"] += 1
+
         def sync_call():
-            model = genai.GenerativeModel(self.model)
-            methods = [
-                (lambda: genai.generate_text(model=self.model, prompt=prompt, max_output_tokens=max_tokens, temperature=temperature)) if hasattr(genai, "generate_text") else None,
-                lambda: model.generate_content(prompt, max_output_tokens=max_tokens),
-                lambda: model.generate_content(prompt),
-                lambda: model.generate_content({"content": {"parts": [{"text": prompt}]}, "max_output_tokens": max_tokens}),
-                lambda: model.generate_content({"parts": [{"text": prompt}], "max_output_tokens": max_tokens}),
-            ]
-            for method in methods:
-                if method is None:
-                    continue
-                try:
-                    res = method()
-                    if res is not None:
-                        return res
-                except Exception as e:
-                    logger.debug("genai method failed: %s", e)
-                    continue
-            raise RuntimeError("No compatible generate_content/generate_text method succeeded for this google.generativeai version.")
-        return await loop.run_in_executor(None, sync_call)
+            started = time.perf_counter()
+            wait_ms = (started - submitted) * 1000
+            with self._pool_lock:
+                st = self._pool_stats
+                st["queued"] -= 1
+                st["running"] += 1
+                st["wait_ms_total"] += wait_ms
+                st["wait_ms_max"] = max(st["wait_ms_max"], wait_ms)
+            try:
+                return self._generate(prompt, max_tokens, temperature)
+            finally:
+                call_ms = (time.perf_counter() - started) * 1000
+                with self._pool_lock:
+                    st["running"] -= 1
+                    st["completed"] += 1
+                    st["call_ms_total"] += call_ms
+                    st["call_ms_max"] = max(st["call_ms_max"], call_ms)
+                logger.debug("Gemini call: waited %.1f ms, ran %.1f ms", wait_ms, call_ms)
+        return await loop.run_in_executor(self._executor, sync_call)
+
+    async def _request(self, prompt: str, max_tokens: int = 1500, temperature: float = 0.0) -> Any:
+        """
+        One logical LLM request: rate-limited, deadline-bounded, retried with
+        jittered backoff on timeouts/429/5xx, and guarded by the circuit breaker.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError as e:
+                raise LLMUnavailableError(str(e), retry_after=self.breaker.retry_after()) from e
+            try:
+                async with self.limiter:
+                    raw_resp = await asyncio.wait_for(
+                        self._call_gemini(prompt, max_tokens=max_tokens, temperature=temperature),
+                        timeout=settings.LLM_TIMEOUT_SECONDS,
+                    )
+            except asyncio.CancelledError:
+                # the caller went away (client disconnect, shutdown): says nothing
+                # about Gemini, but a half-open trial must not stay claimed forever
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.release()
+                    raise LLMServiceError(f"LLM request failed: {e}") from e
+                self.breaker.record_failure()
+                if isinstance(e, asyncio.TimeoutError):
+                    self._retry_stats["timeouts"] += 1
+                if attempt >= self.retry_policy.max_attempts or self.breaker.state == CircuitBreaker.OPEN:
+                    self._retry_stats["gave_up"] += 1
+                    raise LLMUnavailableError(
+                        f"LLM unavailable after {attempt} attempt(s): {e!r}",
+                        retry_after=self.breaker.retry_after(),
+                    ) from e
+                delay = self.retry_policy.delay(attempt)
+                self._retry_stats["retries"] += 1
+                logger.warning("LLM attempt %d failed (%r); retrying in %.1fs", attempt, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            _record_usage(raw_resp)
+            return raw_resp
+
+    def resilience_stats(self) -> Dict[str, Any]:
+        return {"circuit": self.breaker.stats(), **self._retry_stats}
+
+    def _decode(self, content: str) -> Dict[str, Any]:
+        """LLM reply text -> JSON object, timed for decode_stats."""
+        started = time.perf_counter()
+        parsed, repair = decode_json(extract_json_text(content))
+        st = self._decode_stats
+        st["seconds"] += time.perf_counter() - started
+        st["responses"] += 1
+        st["chars"] += len(content)
+        if repair == "failed":
+            st["failed"] += 1
+            logger.warning("Could not parse LLM JSON: %s", parsed.get("_parse_error"))
+        elif repair:
+            st["repaired"] += 1
+            logger.warning("LLM JSON needed repair: %s", repair)
+        return parsed
+
+    def decode_stats(self) -> Dict[str, Any]:
+        """Post-processing cost of LLM replies (fence stripping, extraction, JSON decoding)."""
+        st = self._decode_stats
+        n = st["responses"]
+        return {
+            "responses": n,
+            "repaired": st["repaired"],
+            "failed": st["failed"],
+            "avg_us": round(st["seconds"] / n * 1e6, 1) if n else 0.0,
+            "mb_per_sec": round(st["chars"] / st["seconds"] / 1e6, 2) if st["seconds"] else None,
+        }
+
+    def match_prompt_stats(self) -> Dict[str, Any]:
+        """Estimated input tokens of analyze_match prompts."""
+        st = self._match_prompt_stats
+        return {
+            "prompts": st["prompts"],
+            "avg_tokens": round(st["tokens_total"] / st["prompts"], 1) if st["prompts"] else 0.0,
+            "max_tokens": st["tokens_max"],
+            "trimmed": st["trimmed"],
+        }
 
     def _extract_text_from_response(self, raw_resp: Any) -> str:
         if raw_resp is None:
@@ -595,51 +875,40 @@ class LLMService:
         full_prompt = f"{system_msg}\n\nJSON SCHEMA:\n{json.dumps(schema, indent=2)}\n\nNOW PARSE THE FOLLOWING RESUME TEXT:\n{text}\n\nReturn ONLY valid JSON matching the schema."
         if prompt:
             full_prompt += f"\n\nADDITIONAL INSTRUCTIONS:\n{prompt}"
+        return await self.extract_json(full_prompt, max_tokens=3200)
+
+    async def extract_json(self, prompt: str, max_tokens: int = 3200) -> Dict[str, Any]:
+        """Send a complete prompt and decode the JSON object in the reply."""
         try:
-            raw_resp = await self._call_gemini(full_prompt, max_tokens=3200, temperature=0.0)
+            raw_resp = await self._request(prompt, max_tokens=max_tokens, temperature=0.0)
             content = self._extract_text_from_response(raw_resp)
             logger.info("LLM response length: %d chars", len(content))
-            json_str = self.parser.clean_json_string(content)
-            parsed = self.parser.parse_json(json_str)
-            parsed = self._normalize_resume_data(parsed)
+            parsed = self._normalize_resume_data(self._decode(content))
             if "_raw" in parsed or "_parse_error" in parsed:
                 parsed["_original_model_text"] = content
             return parsed
+        except LLMServiceError:
+            raise
         except Exception as e:
-            logger.exception("extract_structured_data failed: %s", e)
-            return {"error": str(e)}
+            logger.exception("extract_json failed: %s", e)
+            raise LLMServiceError(f"Could not process LLM response: {e}") from e
 
     async def analyze_match(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
-        prompt = (
-            "You are an expert job-matching assistant. Analyze the resume against "
-            "the job description and return a SINGLE JSON OBJECT with these keys:\n\n"
-            "{\n"
-            '  "match_id": "string",\n'
-            '  "resume_id": "string",\n'
-            '  "job_title": "string",\n'
-            '  "scores": {\n'
-            '    "overall_score": 0-100,\n'
-            '    "skills_match": 0-100,\n'
-            '    "experience_match": 0-100,\n'
-            '    "education_match": 0-100\n'
-            '  },\n'
-            '  "matched_skills": ["skill1", "skill2"],\n'
-            '  "missing_skills": ["skill3", "skill4"],\n'
-            '  "strengths": ["strength1", "strength2"],\n'
-            '  "gaps": ["gap1", "gap2"],\n'
-            '  "recommendation": "string",\n'
-            '  "explanation": "string"\n'
-            "}\n\n"
-            f"Resume Data:\n{json.dumps(resume_data)}\n\n"
-            f"Job Description:\n{json.dumps(job_data)}\n\n"
-            "Return ONLY the JSON object. No additional text."
-        )
+        prompt, tokens, trimmed = build_match_prompt(resume_data, job_data, settings.MATCH_PROMPT_TOKEN_BUDGET)
+        st = self._match_prompt_stats
+        st["prompts"] += 1
+        st["tokens_total"] += tokens
+        st["tokens_max"] = max(st["tokens_max"], tokens)
+        st["trimmed"] += trimmed
         try:
-            raw_parsed = await self.extract_structured_data("", prompt)
+            raw_resp = await self._request(prompt, max_tokens=settings.MATCH_MAX_OUTPUT_TOKENS, temperature=0.0)
+            raw_parsed = self._decode(self._extract_text_from_response(raw_resp))
             safe_payload = self.result_builder.build_safe_payload(
                 raw_parsed, resume_id=resume_data.get("id", ""), job_title=job_data.get("title", "")
             )
             return safe_payload
+        except LLMServiceError:
+            raise
         except Exception as e:
             logger.exception("analyze_match failed: %s", e)
             return {
@@ -652,7 +921,7 @@ class LLMService:
                 "strengths": [],
                 "gaps": [],
                 "recommendation": "",
-                "explanation": f"Analysis error: {str(e)}",
+                "explanation": f"{ANALYSIS_ERROR_PREFIX}{str(e)}",
             }
 
     def make_matching_result(
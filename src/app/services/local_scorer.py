@@ -0,0 +1,219 @@
+import re
+import uuid
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.skills import extract_skills, normalize_skill
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+PRESENT_WORDS = {"present", "current", "now", "today", "ongoing", "till date", "to date"}
+
+_YEAR_MONTH = re.compile(r"\b(\d{4})[-/.](\d{1,2})\b")
+_MONTH_YEAR = re.compile(r"\b(\d{1,2})[-/.](\d{4})\b")
+_NAMED_MONTH = re.compile(r"\b([a-z]{3})[a-z]*\.?,?\s+(\d{4})\b")
+_YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+_YEARS_REQUIRED = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:-|to)?\s*(?:\d+(?:\.\d+)?)?\s*\+?\s*(?:years?|yrs?)")
+
+# degree patterns by level (4 = doctorate). Abbreviations are only
+# trusted in a resume's degree field; in job prose "be"/"ma"/"ms" are words.
+DEGREE_WORDS: List[Tuple[int, re.Pattern]] = [
+    (4, re.compile(r"\b(ph\.?\s?d|doctorate|doctoral)\b")),
+    (3, re.compile(r"\b(master'?s?|mba)\b")),
+    (2, re.compile(r"\b(bachelor'?s?|undergraduate)\b")),
+    (1, re.compile(r"\b(associate'?s?|diploma)\b")),
+]
+DEGREE_ABBREVIATIONS: List[Tuple[int, re.Pattern]] = [
+    (4, re.compile(r"\b(d\.?phil)\b")),
+    (3, re.compile(r"\b(m\.?s\.?c?|m\.?\s?tech|m\.?e|m\.?a|m\.?eng)\b\.?")),
+    (2, re.compile(r"\b(b\.?s\.?c?|b\.?\s?tech|b\.?e|b\.?a|b\.?eng)\b\.?")),
+]
+# a bare "degree" only means a bachelor's when no specific level is named:
+# in "Master's degree" it is part of the master's
+_ANY_DEGREE = re.compile(r"\bdegree\b")
+DEGREE_NAMES = {1: "an associate degree or diploma", 2: "a bachelor's degree", 3: "a master's degree", 4: "a PhD"}
+
+
+def parse_month(value: Any, is_end: bool = False, today: Optional[date] = None) -> Optional[int]:
+    """Month index (year * 12 + month - 1) for the loose date strings resumes use."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    text = value.strip().lower()
+    today = today or date.today()
+    if text in PRESENT_WORDS:
+        return today.year * 12 + today.month - 1
+    match = _YEAR_MONTH.search(text)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+    else:
+        match = _MONTH_YEAR.search(text)
+        if match:
+            month, year = int(match.group(1)), int(match.group(2))
+        else:
+            match = _NAMED_MONTH.search(text)
+            if match and match.group(1) in MONTHS:
+                month, year = MONTHS[match.group(1)], int(match.group(2))
+            else:
+                match = _YEAR.search(text)
+                if not match:
+                    return None
+                year, month = int(match.group(1)), 12 if is_end else 1
+    if not 1 <= month <= 12:
+        return None
+    return year * 12 + month - 1
+
+
+def years_of_experience(experience: Iterable[Dict[str, Any]], today: Optional[date] = None) -> float:
+    """Total years across experience entries, counting overlapping roles once."""
+    today = today or date.today()
+    now = today.year * 12 + today.month - 1
+    spans = []
+    for job in experience or []:
+        if not isinstance(job, dict):
+            continue
+        start = parse_month(job.get("start_date"), today=today)
+        end = parse_month(job.get("end_date"), is_end=True, today=today)
+        if end is None and job.get("current"):
+            end = now
+        if start is None or end is None or end < start:
+            continue
+        spans.append((start, min(end, now)))
+    months, current_start, current_end = 0, None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end + 1:
+            if current_end is not None:
+                months += current_end - current_start + 1
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        months += current_end - current_start + 1
+    return months / 12.0
+
+
+def required_years(text: Optional[str]) -> Optional[float]:
+    """Lower bound from strings like '5+ years', '3-5 yrs', 'at least 2 years'."""
+    if not text:
+        return None
+    match = _YEARS_REQUIRED.search(text.lower())
+    return float(match.group(1)) if match else None
+
+
+def degree_levels(text: Optional[str], abbreviations: bool = False) -> List[int]:
+    """Every degree level mentioned in `text`, in order of first mention"""
+    if not text:
+        return []
+    text = text.lower()
+    patterns = DEGREE_WORDS + DEGREE_ABBREVIATIONS if abbreviations else DEGREE_WORDS
+    first_seen: Dict[int, int] = {}
+    for level, pattern in patterns:
+        match = pattern.search(text)
+        if match and match.start() < first_seen.get(level, len(text)):
+            first_seen[level] = match.start()
+    if not first_seen and _ANY_DEGREE.search(text):
+        return [2]
+    return sorted(first_seen, key=first_seen.get)
+
+
+class LocalScorer:
+    """
+    Deterministic, LLM-free job matching.
+
+    Produces the same payload shape as LLMService.analyze_match:
+    skills_match from required/preferred skill coverage, experience_match
+    from years derived from the experience dates, education_match from the
+    highest degree held, and overall_score as their weighted sum.
+    """
+
+    DEFAULT_WEIGHTS = {"skills": 0.5, "experience": 0.3, "education": 0.2}
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, required_skill_weight: float = 0.8):
+        weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        total = sum(weights[k] for k in self.DEFAULT_WEIGHTS) or 1.0
+        self.weights = {k: weights[k] / total for k in self.DEFAULT_WEIGHTS}
+        self.required_skill_weight = min(1.0, max(0.0, required_skill_weight))
+
+    def _skills(self, resume_skills, job: Dict[str, Any]):
+        required = [s for s in job.get("required_skills") or [] if normalize_skill(s)]
+        preferred = [s for s in job.get("preferred_skills") or [] if normalize_skill(s)]
+        matched = [s for s in required + preferred if normalize_skill(s) in resume_skills]
+        missing = [s for s in required + preferred if normalize_skill(s) not in resume_skills]
+        req_cov = sum(normalize_skill(s) in resume_skills for s in required) / len(required) if required else None
+        pref_cov = sum(normalize_skill(s) in resume_skills for s in preferred) / len(preferred) if preferred else None
+        if req_cov is None and pref_cov is None:
+            score = 100.0
+        elif pref_cov is None:
+            score = 100.0 * req_cov
+        elif req_cov is None:
+            score = 100.0 * pref_cov
+        else:
+            score = 100.0 * (self.required_skill_weight * req_cov + (1 - self.required_skill_weight) * pref_cov)
+        return score, matched, missing, req_cov
+
+    def score(self, resume_data: Dict[str, Any], job_data: Dict[str, Any]) -> Dict[str, Any]:
+        resume_skills = extract_skills(resume_data)
+        skills_score, matched, missing, req_cov = self._skills(resume_skills, job_data)
+
+        years = years_of_experience(resume_data.get("experience") or [])
+        needed_years = required_years(job_data.get("experience_required"))
+        experience_score = min(100.0, 100.0 * years / needed_years) if needed_years else 100.0
+
+        held = max((level for e in resume_data.get("education") or [] if isinstance(e, dict)
+                    for level in degree_levels(str(e.get("degree") or ""), abbreviations=True)), default=0)
+        # the first degree stated is the requirement: "Bachelor's or Master's"
+        # asks for a bachelor's, "Master's degree, bachelor's with 5 years" a master's
+        needed_level = next(iter(degree_levels(job_data.get("description"))), 0)
+        education_score = 100.0 if not needed_level else min(100.0, 100.0 * held / needed_level)
+
+        overall = (
+            self.weights["skills"] * skills_score
+            + self.weights["experience"] * experience_score
+            + self.weights["education"] * education_score
+        )
+
+        strengths, gaps = [], []
+        if matched:
+            strengths.append(f"Has {len(matched)} of {len(matched) + len(missing)} listed skills")
+        if missing:
+            gaps.append("Missing skills: " + ", ".join(missing))
+        if needed_years:
+            if years >= needed_years:
+                strengths.append(f"{years:.1f} years of experience ({needed_years:g} required)")
+            else:
+                gaps.append(f"{years:.1f} years of experience ({needed_years:g} required)")
+        if needed_level:
+            if held >= needed_level:
+                strengths.append(f"Holds {DEGREE_NAMES[held]}")
+            else:
+                gaps.append(f"Job asks for {DEGREE_NAMES[needed_level]}")
+
+        if overall >= 75 and (req_cov is None or req_cov >= 0.75):
+            recommendation = "Strong match"
+        elif overall >= 50:
+            recommendation = "Potential match"
+        else:
+            recommendation = "Weak match"
+
+        return {
+            "match_id": str(uuid.uuid4()),
+            "resume_id": resume_data.get("id", ""),
+            "job_title": job_data.get("title", ""),
+            "scores": {
+                "overall_score": int(round(overall)),
+                "skills_match": int(round(skills_score)),
+                "experience_match": int(round(experience_score)),
+                "education_match": int(round(education_score)),
+            },
+            "matched_skills": matched,
+            "missing_skills": missing,
+            "strengths": strengths,
+            "gaps": gaps,
+            "recommendation": recommendation,
+            "explanation": (
+                f"Local score: skills {skills_score:.0f}, experience {experience_score:.0f} "
+                f"({years:.1f} years), education {education_score:.0f}; "
+                f"weights {self.weights['skills']:.2f}/{self.weights['experience']:.2f}/{self.weights['education']:.2f}."
+            ),
+        }
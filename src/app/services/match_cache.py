@@ -0,0 +1,176 @@
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Match, session_scope
+from app.utils.skills import normalize_skills
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _canonical_text(value: Any) -> Any:
+    return _WHITESPACE.sub(" ", value).strip() if isinstance(value, str) else value
+
+
+def job_hash(job: Dict[str, Any]) -> str:
+    """
+    SHA-256 of a canonical JobDescription: whitespace collapsed, empty
+    fields dropped, skill lists normalized and sorted, so cosmetic edits
+    and reordering hit the same entry.
+    """
+    canonical = {}
+    for key, value in job.items():
+        if key in ("required_skills", "preferred_skills"):
+            value = sorted(normalize_skills(value or []))
+        else:
+            value = _canonical_text(value)
+        if value not in (None, "", []):
+            canonical[key] = value
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+class MatchCache:
+    """
+    Cache of LLM match results.
+
+    Keyed on (resume id, parsed_data version, canonical job hash, model,
+    match prompt version). Tier 1 is an in-process LRU with a TTL; tier 2
+    is the `matches` table, so results survive restarts. A resume's entries
+    are dropped when it is re-parsed or deleted.
+    """
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: int = 7 * 24 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._by_resume: Dict[str, Set[str]] = {}
+        self.hits_memory = 0
+        self.hits_db = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(resume_id: str, version: str, job: Dict[str, Any], model: str, prompt_version: str) -> str:
+        raw = "\x1f".join((resume_id, version or "", job_hash(job), model, prompt_version))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    # -----------------------
+    # Tier 1: memory
+    # -----------------------
+    def _remember(self, key: str, resume_id: str, result: Dict[str, Any], created: float) -> None:
+        self._memory[key] = (created, resume_id, result)
+        self._memory.move_to_end(key)
+        self._by_resume.setdefault(resume_id, set()).add(key)
+        while len(self._memory) > self.max_entries:
+            old_key, (_, old_resume, _) = self._memory.popitem(last=False)
+            self._forget_key(old_resume, old_key)
+
+    def _forget_key(self, resume_id: str, key: str) -> None:
+        keys = self._by_resume.get(resume_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_resume[resume_id]
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            created, resume_id, result = entry
+            if now - created <= self.ttl_seconds:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+                return copy.deepcopy(result)
+            del self._memory[key]
+            self._forget_key(resume_id, key)
+        try:
+            async with session_scope() as session:
+                row = await session.get(Match, key)
+                if row is not None and row.created_at < datetime.utcnow() - timedelta(seconds=self.ttl_seconds):
+                    await session.delete(row)
+                    row = None
+        except Exception as e:
+            logger.warning("Match cache lookup failed: %s", e)
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits_db += 1
+        self._remember(key, row.resume_id, row.result, row.created_at.timestamp())
+        return copy.deepcopy(row.result)
+
+    async def put(self, key: str, resume_id: str, job: Dict[str, Any], model: str, prompt_version: str,
+                  result: Dict[str, Any]) -> None:
+        result = copy.deepcopy(result)
+        self._remember(key, resume_id, result, time.time())
+        values = {
+            "key": key,
+            "resume_id": resume_id,
+            "job_hash": job_hash(job),
+            "model": model,
+            "prompt_version": prompt_version,
+            "result": result,
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            async with session_scope() as session:
+                dialect = session.get_bind().dialect.name
+                insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+                stmt = insert(Match).values(**values)
+                await session.execute(stmt.on_conflict_do_update(
+                    index_elements=[Match.key],
+                    set_={"result": stmt.excluded.result, "created_at": stmt.excluded.created_at},
+                ))
+            self.stores += 1
+        except Exception as e:
+            # e.g. the resume was deleted while the LLM call was in flight
+            logger.warning("Match cache store failed for resume %s: %s", resume_id, e)
+
+    async def invalidate(self, session: AsyncSession, resume_id: str) -> None:
+        """Drop every cached match for a resume, inside the caller's transaction."""
+        for key in self._by_resume.pop(resume_id, set()):
+            self._memory.pop(key, None)
+        await session.execute(delete(Match).where(Match.resume_id == resume_id))
+        self.invalidations += 1
+
+    async def prune(self) -> int:
+        """Delete persisted entries older than the TTL."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        try:
+            async with session_scope() as session:
+                result = await session.execute(delete(Match).where(Match.created_at < cutoff))
+        except Exception as e:
+            logger.warning("Pruning the match cache failed: %s", e)
+            return 0
+        if result.rowcount:
+            logger.info("Pruned %d expired match results", result.rowcount)
+        return result.rowcount or 0
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.hits_memory + self.hits_db
+        lookups = hits + self.misses
+        return {
+            "entries_memory": len(self._memory),
+            "hits_memory": self.hits_memory,
+            "hits_db": self.hits_db,
+            "misses": self.misses,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
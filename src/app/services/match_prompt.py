@@ -0,0 +1,142 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.local_scorer import DEGREE_NAMES, degree_levels, parse_month, years_of_experience
+from app.utils.skills import normalize_skill
+
+# Gemini tokenizes English/JSON at roughly 4 characters per token; close
+# enough for budgeting without a count_tokens round trip.
+CHARS_PER_TOKEN = 4
+
+MATCH_INSTRUCTIONS = (
+    "You are a job-matching assistant. Compare the candidate profile with the job and "
+    "return ONE JSON object, no other text:\n"
+    '{"scores":{"overall_score":0-100,"skills_match":0-100,"experience_match":0-100,'
+    '"education_match":0-100},"matched_skills":[],"missing_skills":[],"strengths":[],'
+    '"gaps":[],"recommendation":"string","explanation":"string"}\n'
+    "Profile keys: yrs = total years of experience, exp = roles [title, company, years, "
+    "technologies], edu = [degree, field, institution].\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _clip(value: Any, limit: int) -> str:
+    text = " ".join(str(value or "").split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def _distinct(skills: Any) -> list:
+    """Skills as written, deduplicated on their normalized form."""
+    seen, out = set(), []
+    for skill in skills or []:
+        key = normalize_skill(skill) if isinstance(skill, str) else None
+        if key and key not in seen:
+            seen.add(key)
+            out.append(_clip(skill, 40))
+    return out
+
+
+def _role_years(job: Dict[str, Any]) -> Optional[float]:
+    start = parse_month(job.get("start_date"))
+    end = parse_month(job.get("end_date"), is_end=True)
+    if end is None and job.get("current"):
+        end = parse_month("present")
+    if start is None or end is None or end < start:
+        return None
+    return round((end - start + 1) / 12.0, 1)
+
+
+def compact_profile(resume_data: Dict[str, Any], summary_chars: int = 300) -> Dict[str, Any]:
+    """
+    Field projection of parsed_data for matching: skills, role titles and
+    durations, degrees. Contact details, raw text and parser debug fields
+    (raw_text, _original_model_text, _parse_error, ...) never reach the prompt.
+    """
+    skills = resume_data.get("skills") or {}
+    jobs = [j for j in resume_data.get("experience") or [] if isinstance(j, dict)]
+    schools = [e for e in resume_data.get("education") or [] if isinstance(e, dict)]
+    certs = [c for c in resume_data.get("certifications") or [] if isinstance(c, dict)]
+
+    profile: Dict[str, Any] = {}
+    if resume_data.get("summary"):
+        profile["summary"] = _clip(resume_data["summary"], summary_chars)
+    profile["skills"] = _distinct(skills.get("technical"))
+    profile["yrs"] = round(years_of_experience(jobs), 1)
+    profile["exp"] = [
+        [_clip(j.get("title"), 80), _clip(j.get("company"), 60), _role_years(j),
+         _distinct(j.get("technologies"))]
+        for j in jobs
+    ]
+    profile["edu"] = [
+        [_clip(e.get("degree"), 80), _clip(e.get("field"), 60), _clip(e.get("institution"), 80)]
+        for e in schools
+    ]
+    held = max((level for e in schools for level in degree_levels(str(e.get("degree") or ""), abbreviations=True)),
+               default=0)
+    if held:
+        profile["highest_degree"] = DEGREE_NAMES[held]
+    if certs:
+        profile["certs"] = [_clip(c.get("name"), 80) for c in certs if c.get("name")]
+    if skills.get("soft"):
+        profile["soft_skills"] = _distinct(skills["soft"])
+    return profile
+
+
+def compact_job(job_data: Dict[str, Any], description_chars: int = 1500) -> Dict[str, Any]:
+    job = {
+        "title": _clip(job_data.get("title"), 120),
+        "description": _clip(job_data.get("description"), description_chars),
+        "required_skills": list(job_data.get("required_skills") or []),
+        "preferred_skills": list(job_data.get("preferred_skills") or []),
+        "experience_required": job_data.get("experience_required"),
+    }
+    return {k: v for k, v in job.items() if v not in (None, "", [])}
+
+
+# Profile reductions, least information lost first
+_TRIM_STEPS = [
+    lambda p: p.pop("soft_skills", None),
+    lambda p: p.pop("certs", None),
+    lambda p: p.pop("summary", None),
+    # per-role technologies are usually repeated in the skills list
+    lambda p: [role.__setitem__(3, role[3][:5]) for role in p["exp"]],
+    lambda p: p.__setitem__("exp", p["exp"][:6]),
+    lambda p: p.__setitem__("skills", p["skills"][:40]),
+    lambda p: [role.__setitem__(3, []) for role in p["exp"]],
+    lambda p: p.__setitem__("exp", p["exp"][:3]),
+    lambda p: p.__setitem__("skills", p["skills"][:20]),
+]
+
+
+def build_match_prompt(
+    resume_data: Dict[str, Any], job_data: Dict[str, Any], token_budget: int = 1200
+) -> Tuple[str, int, bool]:
+    """
+    (prompt, estimated tokens, trimmed). The profile is trimmed step by step
+    until the whole prompt fits `token_budget`; the job text is capped
+    separately so a long posting cannot crowd out the candidate.
+    """
+    profile = compact_profile(resume_data)
+    job = _dumps(compact_job(job_data))
+    trimmed = False
+
+    def render() -> str:
+        return f"{MATCH_INSTRUCTIONS}\nCANDIDATE:\n{_dumps(profile)}\n\nJOB:\n{job}\n"
+
+    prompt = render()
+    steps = iter(_TRIM_STEPS)
+    while estimate_tokens(prompt) > token_budget:
+        step = next(steps, None)
+        if step is None:
+            break
+        step(profile)
+        trimmed = True
+        prompt = render()
+    return prompt, estimate_tokens(prompt), trimmed
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+
+from app.database.models import Resume, ResumeStatus, ResumeText, session_scope
+from app.utils.compression import decompress_text
+
+logger = logging.getLogger(__name__)
+
+# a parse carrying any of these failed, in whole or in part (sectioned
+# parses record failed sections), and must be re-run rather than reused
+FAILED_PARSE_KEYS = ("error", "_parse_error", "_section_errors", "_section_parse_errors")
+
+
+def is_cacheable(parsed_data: Any) -> bool:
+    return isinstance(parsed_data, dict) and not any(key in parsed_data for key in FAILED_PARSE_KEYS)
+
+
+class CachedParse:
+    """Result of a cache lookup. `parsed_data` is None when only the text is reusable."""
+
+    def __init__(self, raw_text: str, parsed_data: Optional[Dict[str, Any]], source: str):
+        self.raw_text = raw_text
+        self.parsed_data = parsed_data
+        self.source = source
+
+
+class ParseCache:
+    """
+    Content-addressed cache of extraction + parse results.
+
+    Tier 1 is a local SQLite file with LRU eviction and a TTL; tier 2 is the
+    database itself (any completed resume with the same file hash, with its
+    text from resume_texts). Entries are keyed on (SHA-256 of the file,
+    model name, prompt version), so changing either the model or the prompt
+    naturally misses.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl_seconds: int = 30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits_local = 0
+        self.hits_db = 0
+        self.text_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @staticmethod
+    def make_key(file_hash: str, model: str, prompt_version: str) -> str:
+        return f"{file_hash}:{model}:{prompt_version}"
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                " key TEXT PRIMARY KEY, raw_text TEXT NOT NULL, parsed_data TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_parse_cache_accessed ON parse_cache (accessed_at)")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -----------------------
+    # Tier 1: local SQLite
+    # -----------------------
+    def _get_local(self, key: str) -> Optional[CachedParse]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT raw_text, parsed_data, created_at FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] > self.ttl_seconds:
+                conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE parse_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+        return CachedParse(row[0], json.loads(row[1]), "local")
+
+    def _set_local(self, key: str, raw_text: str, parsed_data: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, raw_text, parsed_data, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, raw_text, json.dumps(parsed_data, default=str), now, now),
+            )
+            # LRU eviction down to max_entries
+            conn.execute(
+                "DELETE FROM parse_cache WHERE key IN ("
+                " SELECT key FROM parse_cache ORDER BY accessed_at"
+                " LIMIT MAX(0, (SELECT COUNT(*) FROM parse_cache) - ?))",
+                (self.max_entries,),
+            )
+            conn.commit()
+
+    # -----------------------
+    # Tier 2: resumes table
+    # -----------------------
+    @staticmethod
+    async def _get_db(file_hash: str, model: str, prompt_version: str) -> Optional[CachedParse]:
+        async with session_scope() as session:
+            rows = (await session.execute(
+                select(ResumeText.codec, ResumeText.data, Resume.parsed_data, Resume.parse_model, Resume.prompt_version)
+                .join(ResumeText, ResumeText.resume_id == Resume.id)
+                .where(Resume.file_hash == file_hash, Resume.processing_status == ResumeStatus.COMPLETED)
+                .order_by(Resume.processed_at.desc())
+                .limit(10)
+            )).all()
+        if not rows:
+            return None
+        codec, data = rows[0].codec, rows[0].data
+        for row in rows:
+            if row.parse_model == model and row.prompt_version == prompt_version and is_cacheable(row.parsed_data):
+                return CachedParse(decompress_text(row.codec, row.data), row.parsed_data, "db")
+        return CachedParse(decompress_text(codec, data), None, "db")
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    async def lookup(self, file_hash: str, model: str, prompt_version: str) -> Optional[CachedParse]:
+        key = self.make_key(file_hash, model, prompt_version)
+        try:
+            hit = await asyncio.to_thread(self._get_local, key)
+            if hit is not None:
+                self.hits_local += 1
+                return hit
+            hit = await self._get_db(file_hash, model, prompt_version)
+        except Exception as e:
+            logger.warning("Parse cache lookup failed for %s: %s", file_hash, e)
+            hit = None
+        if hit is None:
+            self.misses += 1
+        elif hit.parsed_data is None:
+            # Same bytes parsed under another model/prompt: extraction can be skipped
+            self.text_hits += 1
+        else:
+            self.hits_db += 1
+            await self.store(file_hash, model, prompt_version, hit.raw_text, hit.parsed_data)
+        return hit
+
+    async def store(
+        self, file_hash: str, model: str, prompt_version: str, raw_text: str, parsed_data: Dict[str, Any]
+    ) -> None:
+        if not is_cacheable(parsed_data):
+            return  # never cache failed or partial parses
+        key = self.make_key(file_hash, model, prompt_version)
+        try:
+            await asyncio.to_thread(self._set_local, key, raw_text, parsed_data)
+            self.stores += 1
+        except Exception as e:
+            logger.warning("Parse cache store failed for %s: %s", file_hash, e)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.hits_local + self.hits_db
+        lookups = hits + self.text_hits + self.misses
+        return {
+            "hits_local": self.hits_local,
+            "hits_db": self.hits_db,
+            "text_only_hits": self.text_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job cannot be accepted because the queue is at capacity."""
+
+
+class ProcessingQueue:
+    """
+    Bounded in-process job queue drained by a fixed pool of asyncio workers.
+    Each job is a resume id plus its parse mode, passed on as handler(job_id, mode=mode).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[..., Awaitable[None]],
+        workers: int = 4,
+        maxsize: int = 1000,
+        default_job_seconds: float = 30.0,
+    ):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._tasks: List[asyncio.Task] = []
+        # exponential moving average of job duration, used for ETA estimates
+        self._avg_job_seconds = default_job_seconds
+        self.completed = 0
+        self.failed = 0
+
+    async def start(self, pending: Iterable[str] = ()) -> None:
+        """Spawn the workers and re-enqueue jobs left over from a previous run."""
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(i), name=f"resume-worker-{i}"))
+        pending = list(pending)
+        if pending:
+            logger.info("Re-enqueueing %d unfinished resume jobs", len(pending))
+            self._tasks.append(asyncio.create_task(self._requeue(pending)))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def enqueue(self, job_id: str, mode: Optional[str] = None) -> None:
+        try:
+            self._queue.put_nowait((job_id, mode))
+        except asyncio.QueueFull:
+            raise QueueFullError("Processing queue is full, retry later")
+
+    def is_full(self) -> bool:
+        return self._queue.full()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def estimated_wait_seconds(self, position: Optional[int] = None) -> int:
+        """Rough time until a job at `position` (default: the tail) has finished."""
+        if position is None:
+            position = self.depth
+        rounds = position // self.workers + 1
+        return int(round(rounds * self._avg_job_seconds))
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "depth": self.depth,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_job_seconds": round(self._avg_job_seconds, 3),
+        }
+
+    async def _requeue(self, job_ids: List[str]) -> None:
+        # the mode of an interrupted job is not stored: it resumes with the default
+        for job_id in job_ids:
+            await self._queue.put((job_id, None))
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id, mode = await self._queue.get()
+            started = time.perf_counter()
+            try:
+                await self.handler(job_id, mode=mode)
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.warning("Worker %d: job %s failed: %s", index, job_id, e)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * elapsed
+                self._queue.task_done()
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except Exception:
+    google_exceptions = None
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and calls are being shed."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """True for timeouts, rate limiting (429) and upstream 5xx errors."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    if google_exceptions is not None:
+        if isinstance(exc, (
+            google_exceptions.TooManyRequests,
+            google_exceptions.ResourceExhausted,
+            google_exceptions.ServerError,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.ServiceUnavailable,
+        )):
+            return True
+        if isinstance(exc, google_exceptions.GoogleAPICallError):
+            return getattr(exc, "code", None) in RETRYABLE_STATUS_CODES
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 20.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Sleep before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    call fails fast for `reset_timeout` seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure re-opens it.
+    Intended for use from one event loop, so no locking is needed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.counters: Dict[str, int] = {
+            "successes": 0,
+            "failures": 0,
+            "short_circuited": 0,
+            "opened": 0,
+            "half_opened": 0,
+            "closed": 0,
+        }
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit will allow a trial call."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                self.counters["short_circuited"] += 1
+                raise CircuitOpenError("LLM circuit is open; failing fast")
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.counters["short_circuited"] += 1
+                raise CircuitOpenError("LLM circuit is half-open; trial call in progress")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.counters["successes"] += 1
+        self._consecutive_failures = 0
+        self._trial_in_flight = False
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.counters["failures"] += 1
+        self._consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """End a call that neither succeeded nor indicates upstream trouble."""
+        self._trial_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        logger.warning("LLM circuit %s -> %s", self.state, state)
+        self.state = state
+        self.counters[{self.OPEN: "opened", self.HALF_OPEN: "half_opened", self.CLOSED: "closed"}[state]] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "retry_after": round(self.retry_after(), 1),
+            **self.counters,
+        }
@@ -0,0 +1,161 @@
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import orjson  # optional: faster, and releases the GIL on large documents
+except ImportError:
+    orjson = None
+
+# JSONDecodeError subclasses ValueError, as does orjson.JSONDecodeError
+DecodeError = ValueError
+
+_FENCE_START = re.compile(r"```(?:json)?\s*", re.IGNORECASE)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+_CLOSERS = {"{": "}", "[": "]"}
+# skip to the next token: a whole string literal (group "end" is None if it
+# is unterminated) or one bracket (group "bracket")
+_TOKENS = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*(?P<end>")?|(?P<bracket>[{}\[\]]))', re.DOTALL)
+
+
+def loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def strip_fences(content: str) -> str:
+    s = content.strip()
+    if s.startswith("```"):
+        s = s[_FENCE_START.match(s).end():]
+    if s.endswith("```"):
+        s = s[:-3].rstrip()
+    return s
+
+
+def scan_json(s: str, start: int = 0) -> Tuple[int, int, list]:
+    """
+    Balanced-brace scan from the first '{' or '[' at or after `start`,
+    skipping brackets inside strings. Linear: each anchored token match
+    steps over plain text and whole string literals, so Python only loops
+    per bracket, and the first failed match ends the scan (only text with
+    no quote or bracket is left).
+
+    Returns (begin, end, open_stack): end is one past the matching closer,
+    or -1 when the text ends first (open_stack then holds the brackets
+    still open, innermost last, plus '"' for an unterminated string).
+    begin is -1 if there is no opener.
+    """
+    begin = _first_opener(s, start)
+    if begin < 0:
+        return -1, -1, []
+    stack = []
+    pos = begin
+    while True:
+        # match, not finditer: a failed search would retry at every later offset
+        m = _TOKENS.match(s, pos)
+        if m is None:
+            break
+        pos = m.end()
+        tok = m.group("bracket")
+        if tok is None:
+            if m.group("end") is None:
+                stack.append('"')
+                break
+        elif tok in "{[":
+            stack.append(tok)
+        elif stack and _CLOSERS[stack[-1]] == tok:
+            stack.pop()
+            if not stack:
+                return begin, m.end(), []
+    return begin, -1, stack
+
+
+def _first_opener(s: str, start: int = 0) -> int:
+    brace, bracket = s.find("{", start), s.find("[", start)
+    if brace < 0 or bracket < 0:
+        return max(brace, bracket)
+    return min(brace, bracket)
+
+
+def extract_json_text(content: str) -> str:
+    """
+    The JSON document inside an LLM reply: code fences removed, then first
+    opener .. last matching closer (str.find/rfind, so linear even when
+    the reply is unbalanced). decode_json narrows this to the first
+    balanced document if trailing prose makes it invalid.
+    """
+    if not content:
+        return ""
+    s = strip_fences(content)
+    begin = _first_opener(s)
+    if begin < 0:
+        return s
+    last = s.rfind(_CLOSERS[s[begin]])
+    return s[begin:last + 1] if last > begin else s[begin:]
+
+
+def close_truncated(s: str, scanned: Optional[Tuple[int, int, list]] = None) -> Optional[str]:
+    """
+    Best-effort completion of JSON cut off mid-document (output token cap).
+    `scanned` is scan_json(s) if the caller already has it.
+    """
+    begin, end, stack = scanned or scan_json(s)
+    stack = list(stack)
+    if begin < 0 or end > 0 or not stack:
+        return None
+    text = s[begin:]
+    if stack[-1] == '"':
+        stack.pop()
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    elif text.endswith(":"):
+        text += "null"
+    return text + "".join(_CLOSERS[ch] for ch in reversed(stack))
+
+
+def _as_object(parsed: Any) -> Dict[str, Any]:
+    if isinstance(parsed, list):
+        return {"_parsed_list": parsed}
+    return parsed if isinstance(parsed, dict) else {"result": parsed}
+
+
+def _repairs(json_text: str) -> Iterator[Tuple[str, str]]:
+    """Candidate fixes, cheapest and most likely first; built lazily."""
+    # prose after the document ("... {see above}") made the span too long
+    scanned = scan_json(json_text)
+    begin, end, _ = scanned
+    if end > 0 and (begin, end) != (0, len(json_text)):
+        yield "balanced", json_text[begin:end]
+    repaired = _TRAILING_COMMA.sub(r"\1", json_text.replace("\r\n", "\n").replace("\t", " "))
+    if repaired != json_text:
+        yield "trailing_commas", repaired
+    closed = close_truncated(json_text, scanned)
+    if closed is not None:
+        yield "truncated", _TRAILING_COMMA.sub(r"\1", closed)
+    # last resort, as the original repair did: single-quoted JSON
+    if "'" in repaired:
+        yield "quotes", extract_json_text(repaired.replace("'", '"'))
+
+
+def decode_json(json_text: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    (object, repair) where repair names the fix that made the text parse
+    (None if it parsed as-is). Failures return the {"_raw", "_parse_error"}
+    object the callers already handle.
+    """
+    if not json_text or not json_text.strip():
+        return {"_parse_error": "empty json_text", "_raw": json_text}, "failed"
+    try:
+        return _as_object(loads(json_text)), None
+    except DecodeError as e:
+        error: Exception = e
+    for name, candidate in _repairs(json_text):
+        try:
+            return _as_object(loads(candidate)), name
+        except DecodeError as e:
+            error = e
+    return {"_raw": json_text, "_parse_error": str(error)}, "failed"
@@ -1,15 +1,113 @@
-from app.services.llm_service import LLMService
+from app.config import settings
+from app.services.llm_service import LLMService, LLMUnavailableError
+from app.services.resume_sectioner import chunk_text, split_sections
+from app.services.rule_extractor import RuleExtractor
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import copy
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+# Schema fragments for sectioned parsing; each prompt only asks for its keys
+SECTION_SCHEMAS = {
+    "profile": """{
+        "personal_info": {"full_name": "string", "first_name": "string", "last_name": "string",
+                          "email": "string", "phone": "string", "address": "string",
+                          "linkedin": "string", "website": "string"},
+        "summary": "Professional summary text"
+    }""",
+    "experience": """{
+        "experience": [{"title": "Job title", "company": "Company name", "location": "Location",
+                        "start_date": "YYYY-MM", "end_date": "YYYY-MM or Present", "current": true/false,
+                        "description": "Job description", "achievements": ["achievement1"],
+                        "technologies": ["tech1"]}]
+    }""",
+    "education": """{
+        "education": [{"degree": "Degree type", "field": "Field of study", "institution": "University name",
+                       "location": "Location", "graduation_date": "YYYY-MM", "gpa": 3.5}]
+    }""",
+    "skills": """{
+        "skills": {"technical": ["skill1"], "soft": ["skill1"],
+                   "languages": [{"language": "English", "proficiency": "Native"}]}
+    }""",
+    "certifications": """{
+        "certifications": [{"name": "Certification name", "issuer": "Issuing organization",
+                            "issue_date": "YYYY-MM", "expiry_date": "YYYY-MM"}]
+    }""",
+}
+
+# Sectioner output -> prompt group; "other" (publications, awards, ...) has no schema field
+SECTION_GROUPS = {
+    "header": "profile",
+    "summary": "profile",
+    "experience": "experience",
+    "education": "education",
+    "skills": "skills",
+    "projects": "skills",
+    "certifications": "certifications",
+}
+
 class ResumeParser:
     """Parse resume text into structured data"""
     
-    def __init__(self):
-        self.llm = LLMService()
+    # Bump whenever the prompt below changes so cached parses are not reused
+    PROMPT_VERSION = "3"
+
+    DEFAULT_STRUCTURE = {
+        "personal_info": {},
+        "summary": None,
+        "experience": [],
+        "education": [],
+        "skills": {"technical": [], "soft": [], "languages": []},
+        "certifications": []
+    }
+    
+    # Parse modes: "llm" merges rule-based pre-extraction into the LLM parse,
+    # "fast" returns the rule-based extraction alone
+    MODES = ("llm", "fast")
     
-    async def parse(self, text: str, filename: str) -> dict:
+    def __init__(self, llm: Optional[LLMService] = None, rules: Optional[RuleExtractor] = None):
+        self.llm = llm or LLMService()
+        self.rules = rules or RuleExtractor()
+    
+    @classmethod
+    def fingerprint(cls, parsed_data: dict) -> Tuple[str, str]:
+        """(model, prompt version) that produced parsed_data"""
+        if parsed_data.get("_parse_mode") == "rules":
+            return RuleExtractor.MODEL, RuleExtractor.VERSION
+        return settings.GEMINI_MODEL, cls.PROMPT_VERSION
+    
+    async def parse(self, text: str, filename: str, mode: Optional[str] = None) -> dict:
         """Parse resume text"""
+        mode = mode or settings.PARSE_MODE
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown parse mode '{mode}', expected one of {', '.join(self.MODES)}")
+        rules = await asyncio.to_thread(self.rules.extract, text)
+        if mode == "fast":
+            return self._rules_only(rules)
         
+        # contact details are already known: keep them out of the prompt
+        llm_text = self.rules.redact_contacts(text, rules)
+        try:
+            if len(llm_text) >= settings.PARSE_SECTIONED_MIN_CHARS:
+                groups = self._group_sections(llm_text)
+                if len(groups.keys() - {"profile"}) >= 2:
+                    return self.rules.merge(await self._parse_sectioned(groups, filename), rules)
+            return self.rules.merge(await self._parse_single(llm_text), rules)
+        except LLMUnavailableError as e:
+            if not settings.PARSE_RULES_FALLBACK:
+                raise
+            logger.warning("LLM unavailable (%s); storing the rule-based parse of %s", e, filename)
+            return self._rules_only(rules)
+    
+    def _rules_only(self, rules: dict) -> dict:
+        parsed_data = self._with_defaults(rules)
+        parsed_data["_parse_mode"] = "rules"
+        return parsed_data
+    
+    async def _parse_single(self, text: str) -> dict:
         prompt = """
         Extract the following information from the resume and return as JSON:
         
@@ -64,23 +162,98 @@ class ResumeParser:
         }
         
         If any field is not found, use null. Extract as much information as possible.
+        Email, phone, LinkedIn and website were extracted separately and may be
+        missing from the text; return null for them if so.
         """
         
         # Use LLM to extract structured data
         parsed_data = await self.llm.extract_structured_data(text, prompt)
         
-        # Ensure all required keys exist
-        default_structure = {
-            "personal_info": {},
-            "summary": None,
-            "experience": [],
-            "education": [],
-            "skills": {"technical": [], "soft": [], "languages": []},
-            "certifications": []
-        }
-        
-        for key, value in default_structure.items():
+        return self._with_defaults(parsed_data)
+    
+    def _with_defaults(self, parsed_data: dict) -> dict:
+        """Ensure all required keys exist"""
+        for key, value in self.DEFAULT_STRUCTURE.items():
             if key not in parsed_data:
-                parsed_data[key] = value
+                parsed_data[key] = copy.deepcopy(value)
+        return parsed_data
+    
+    # -----------------------
+    # Sectioned parsing (long resumes)
+    # -----------------------
+    @staticmethod
+    def _group_sections(text: str) -> Dict[str, str]:
+        groups: Dict[str, List[str]] = {}
+        for name, body in split_sections(text):
+            group = SECTION_GROUPS.get(name)
+            if group:
+                groups.setdefault(group, []).append(body)
+        return {group: "\n\n".join(bodies) for group, bodies in groups.items()}
+    
+    async def _parse_section(self, group: str, text: str) -> Dict[str, Any]:
+        prompt = (
+            "You are an expert resume parser. The text below is one section of a resume. "
+            "Extract it into a SINGLE JSON OBJECT with exactly this shape, using null for "
+            "missing values (email, phone, LinkedIn and website were extracted separately). "
+            f"OUTPUT JSON ONLY.\n\n{SECTION_SCHEMAS[group]}\n\n"
+            f"RESUME SECTION:\n{text}"
+        )
+        return await self.llm.extract_json(prompt, max_tokens=settings.PARSE_SECTION_MAX_TOKENS)
+    
+    async def _parse_sectioned(self, groups: Dict[str, str], filename: str) -> dict:
+        """
+        One smaller prompt per section, run concurrently (the LLM limiter still
+        caps calls in flight). Long sections are split further so no reply
+        runs into the output-token cap. Failed chunks are recorded in
+        `_section_errors` (group -> errors); the parse only fails if every
+        chunk does.
+        """
+        jobs: List[Tuple[str, str]] = [
+            (group, chunk)
+            for group, body in groups.items()
+            for chunk in chunk_text(body, settings.PARSE_SECTION_MAX_CHARS)
+        ]
+        logger.info("Parsing %s in %d section prompts", filename, len(jobs))
+        results = await asyncio.gather(
+            *(self._parse_section(group, chunk) for group, chunk in jobs), return_exceptions=True
+        )
         
-        return parsed_data
\ No newline at end of file
+        merged: Dict[str, Any] = copy.deepcopy(self.DEFAULT_STRUCTURE)
+        errors: Dict[str, List[str]] = {}
+        failed = 0  # chunks, not groups: a long group is several jobs
+        for (group, _), result in zip(jobs, results):
+            if isinstance(result, LLMUnavailableError):
+                raise result
+            if isinstance(result, BaseException):
+                logger.warning("Section %s of %s failed: %s", group, filename, result)
+                errors.setdefault(group, []).append(str(result))
+                failed += 1
+                continue
+            self._merge_section(merged, result)
+        if failed == len(jobs):
+            raise next(r for r in results if isinstance(r, BaseException))
+        if errors:
+            merged["_section_errors"] = errors
+        return merged
+    
+    @staticmethod
+    def _merge_section(merged: Dict[str, Any], part: Dict[str, Any]) -> None:
+        if isinstance(part.get("personal_info"), dict):
+            for key, value in part["personal_info"].items():
+                if value and not merged["personal_info"].get(key):
+                    merged["personal_info"][key] = value
+        if part.get("summary") and not merged["summary"]:
+            merged["summary"] = part["summary"]
+        for key in ("experience", "education", "certifications"):
+            if isinstance(part.get(key), list):
+                merged[key].extend(item for item in part[key] if isinstance(item, dict))
+        skills = part.get("skills")
+        if isinstance(skills, dict):
+            for key in ("technical", "soft", "languages"):
+                target = merged["skills"][key]
+                for item in skills.get(key) or []:
+                    if item and item not in target:
+                        target.append(item)
+        for key in ("_raw", "_parse_error"):
+            if key in part:
+                merged.setdefault("_section_parse_errors", []).append(part[key])
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import select
+
+from app.config import settings
+from app.database.models import Resume, ResumeParse, ResumeStatus, ResumeText, session_scope
+from app.services.embeddings import EmbeddingService
+from app.services.extraction_service import ExtractionSaturatedError, ExtractionService
+from app.services.llm_service import track_usage
+from app.services.match_cache import MatchCache
+from app.services.parse_cache import ParseCache, is_cacheable
+from app.services.resume_parser import ResumeParser
+from app.services.rule_extractor import RuleExtractor
+from app.services.skill_index import SkillIndex
+from app.utils.compression import compress_text, decompress_text
+from app.utils.helpers import sha256_file
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineOutcome:
+    """Result of running one resume through extraction and parsing."""
+
+    def __init__(
+        self,
+        resume_id: str,
+        status: str,
+        raw_text: Optional[str] = None,
+        parsed_data: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        fingerprint: Optional[Tuple[str, str]] = None,
+        exc: Optional[Exception] = None,
+        vectors: Optional[Dict[str, Any]] = None,
+        parse_stats: Optional[Dict[str, Any]] = None,
+    ):
+        self.resume_id = resume_id
+        self.status = status
+        self.raw_text = raw_text
+        self.parsed_data = parsed_data
+        self.error = error
+        self.file_hash = file_hash
+        self.fingerprint = fingerprint
+        self.exc = exc
+        self.vectors = vectors
+        self.parse_stats = parse_stats
+
+
+class ResumePipeline:
+    """Extract, parse and persist resumes that have already been stored on disk."""
+
+    def __init__(
+        self,
+        extraction: ExtractionService,
+        parser: ResumeParser,
+        cache: Optional[ParseCache] = None,
+        skill_index: Optional[SkillIndex] = None,
+        embeddings: Optional[EmbeddingService] = None,
+        match_cache: Optional[MatchCache] = None,
+    ):
+        self.extraction = extraction
+        self.parser = parser
+        self.cache = cache
+        self.skill_index = skill_index
+        self.embeddings = embeddings
+        self.match_cache = match_cache
+        self._webhook_tasks = set()
+
+    async def process(self, resume_id: str, wait_for_capacity: bool = True, mode: Optional[str] = None) -> None:
+        """
+        Run the full pipeline for one resume row and record the outcome.
+        With wait_for_capacity=False, ExtractionSaturatedError propagates and
+        the row is left untouched for the caller to clean up. `mode` is the
+        ResumeParser parse mode (default PARSE_MODE).
+        """
+        jobs = await self._claim([resume_id])
+        if not jobs:
+            logger.warning("Resume %s vanished before processing", resume_id)
+            return
+        outcome = await self._run(*jobs[0], wait_for_capacity=wait_for_capacity, mode=mode)
+        await self._finish([outcome])
+        if outcome.status == ResumeStatus.FAILED:
+            raise outcome.exc
+
+    async def process_many(self, resume_ids: List[str], mode: Optional[str] = None) -> List[PipelineOutcome]:
+        """
+        Process several resumes concurrently. Rows are claimed and written back
+        in one transaction each; extraction fans out across the process pool and
+        LLM calls are throttled by the shared Gemini rate limiter.
+        """
+        jobs = await self._claim(resume_ids)
+        outcomes = await asyncio.gather(*(self._run(*job, mode=mode) for job in jobs))
+        await self._finish(outcomes)
+        return list(outcomes)
+
+    async def _claim(self, resume_ids: List[str]) -> List[Tuple[str, str, str, Optional[str]]]:
+        """Mark rows as processing and return (id, path, name, hash) for each."""
+        async with session_scope() as session:
+            resumes = (await session.scalars(select(Resume).where(Resume.id.in_(resume_ids)))).all()
+            for resume in resumes:
+                resume.processing_status = ResumeStatus.PROCESSING
+                resume.processing_error = None
+            by_id = {r.id: (r.id, r.file_path, r.file_name, r.file_hash) for r in resumes}
+        return [by_id[rid] for rid in resume_ids if rid in by_id]
+
+    async def _run(
+        self,
+        resume_id: str,
+        file_path: str,
+        file_name: str,
+        file_hash: Optional[str],
+        wait_for_capacity: bool = True,
+        mode: Optional[str] = None,
+    ) -> PipelineOutcome:
+        if (mode or settings.PARSE_MODE) == "fast":
+            model, prompt_version = ResumeParser.fingerprint({"_parse_mode": "rules"})
+        else:
+            model, prompt_version = settings.GEMINI_MODEL, ResumeParser.PROMPT_VERSION
+        try:
+            if file_hash is None:
+                file_hash = await asyncio.to_thread(sha256_file, file_path)
+            cached = await self.cache.lookup(file_hash, model, prompt_version) if self.cache else None
+            if cached is not None and cached.parsed_data is not None:
+                text, parsed_data = cached.raw_text, cached.parsed_data
+                parse_stats = {"cached": True, "latency_ms": 0, "llm_calls": 0}
+            else:
+                if cached is not None:
+                    text = cached.raw_text
+                else:
+                    text = await self.extraction.extract_text(file_path, file_name, wait=wait_for_capacity)
+                parsed_data, parse_stats = await self._parse(text, file_name, mode)
+                # a rule-based fallback is stored under its own fingerprint
+                model, prompt_version = ResumeParser.fingerprint(parsed_data)
+                if self.cache:
+                    await self.cache.store(file_hash, model, prompt_version, text, parsed_data)
+            codec, blob = compress_text(text or "", settings.TEXT_COMPRESSION, settings.TEXT_COMPRESSION_LEVEL)
+            parse_stats["text"] = (codec, len((text or "").encode("utf-8")), blob)
+        except ExtractionSaturatedError:
+            raise
+        except Exception as e:
+            logger.exception("Processing failed for resume %s: %s", resume_id, e)
+            return PipelineOutcome(resume_id, ResumeStatus.FAILED, error=str(e), exc=e)
+        return PipelineOutcome(
+            resume_id,
+            ResumeStatus.COMPLETED,
+            raw_text=text,
+            parsed_data=parsed_data,
+            file_hash=file_hash,
+            fingerprint=(model, prompt_version),
+            vectors=await self._embed(resume_id, parsed_data),
+            parse_stats=parse_stats,
+        )
+
+    async def _parse(self, text: str, file_name: str, mode: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(parsed_data, parse stats for the resume_parses row): timed, with LLM usage counted."""
+        started = time.perf_counter()
+        with track_usage() as usage:
+            parsed_data = await self.parser.parse(text, file_name, mode=mode)
+        return parsed_data, {"cached": False, **usage, "latency_ms": int((time.perf_counter() - started) * 1000)}
+
+    async def _embed(self, resume_id: str, parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not self.embeddings:
+            return None
+        try:
+            return await self.embeddings.embed_parsed(parsed_data)
+        except Exception as e:
+            # semantic search is best-effort; the parse itself succeeded
+            logger.warning("Embedding failed for resume %s: %s", resume_id, e)
+            return None
+
+    async def reparse(self, resume_id: str, target: Tuple[str, str]) -> PipelineOutcome:
+        """
+        Re-run only the parse stage from the stored text: no extraction and
+        no parse cache lookup. The row keeps serving its previous parse while
+        this runs; on success the result becomes the current parse and a new
+        resume_parses version. If the parse fails (including an undecodable
+        reply or a partial sectioned parse), or produces something other
+        than the `target` (model, prompt version) fingerprint, e.g. the
+        rule-based fallback, the row is left untouched.
+        """
+        async with session_scope() as session:
+            row = (await session.execute(
+                select(Resume.file_name, Resume.file_hash, ResumeText.codec, ResumeText.data)
+                .join(ResumeText, ResumeText.resume_id == Resume.id)
+                .where(Resume.id == resume_id)
+            )).first()
+        if row is None:
+            return PipelineOutcome(resume_id, ResumeStatus.FAILED, error="no stored text")
+        mode = "fast" if target[0] == RuleExtractor.MODEL else "llm"
+        try:
+            text = decompress_text(row.codec, row.data)
+            parsed_data, parse_stats = await self._parse(text, row.file_name, mode)
+        except Exception as e:
+            return PipelineOutcome(resume_id, ResumeStatus.FAILED, error=str(e), exc=e)
+        fingerprint = ResumeParser.fingerprint(parsed_data)
+        if fingerprint != target:
+            return PipelineOutcome(
+                resume_id, ResumeStatus.FAILED, error=f"parsed as {fingerprint}, expected {target}"
+            )
+        if not is_cacheable(parsed_data):
+            # an undecodable reply or a partial sectioned parse carries the target
+            # fingerprint too, and must not replace the stored parse
+            return PipelineOutcome(resume_id, ResumeStatus.FAILED, error="parse failed or incomplete")
+        if self.cache and row.file_hash:
+            await self.cache.store(row.file_hash, *fingerprint, text, parsed_data)
+        outcome = PipelineOutcome(
+            resume_id,
+            ResumeStatus.COMPLETED,
+            raw_text=text,
+            parsed_data=parsed_data,
+            file_hash=row.file_hash,
+            fingerprint=fingerprint,
+            vectors=await self._embed(resume_id, parsed_data),
+            parse_stats=parse_stats,
+        )
+        await self._finish([outcome], notify=False)
+        return outcome
+
+    async def _finish(self, outcomes: List[PipelineOutcome], notify: bool = True) -> None:
+        webhooks = []
+        async with session_scope() as session:
+            by_id = {o.resume_id: o for o in outcomes}
+            resumes = (await session.scalars(select(Resume).where(Resume.id.in_(list(by_id))))).all()
+            for resume in resumes:
+                outcome = by_id[resume.id]
+                resume.processing_status = outcome.status
+                resume.processing_error = outcome.error
+                if outcome.status == ResumeStatus.COMPLETED:
+                    resume.parsed_data = outcome.parsed_data
+                    resume.file_hash = outcome.file_hash or resume.file_hash
+                    resume.parse_model, resume.prompt_version = outcome.fingerprint or (None, None)
+                    resume.processed_at = datetime.utcnow()
+                    await self._store_parse(session, resume, outcome)
+                    if self.skill_index:
+                        await self.skill_index.index(session, resume.id, outcome.parsed_data)
+                    if self.match_cache:
+                        await self.match_cache.invalidate(session, resume.id)
+                    if self.embeddings and outcome.vectors is not None:
+                        await self.embeddings.store(session, resume.id, outcome.vectors)
+                if notify and resume.webhook_url:
+                    webhooks.append((resume.webhook_url, {
+                        "id": resume.id,
+                        "status": outcome.status,
+                        "file_name": resume.file_name,
+                        "processed_at": resume.processed_at.isoformat() if resume.processed_at else None,
+                        "error": outcome.error,
+                    }))
+        if self.embeddings:
+            for outcome in outcomes:
+                if outcome.vectors is not None:
+                    self.embeddings.publish(outcome.resume_id, outcome.vectors)
+        loop = asyncio.get_running_loop()
+        for url, payload in webhooks:
+            task = loop.create_task(self.notify_webhook(url, payload))
+            self._webhook_tasks.add(task)
+            task.add_done_callback(self._webhook_tasks.discard)
+
+    @staticmethod
+    async def _store_parse(session, resume: Resume, outcome: PipelineOutcome) -> None:
+        """Store the text (if it was extracted) and append the parse to the resume's history."""
+        stats = dict(outcome.parse_stats or {})
+        text = stats.pop("text", None)  # absent on re-parses: the stored text is unchanged
+        session.add(ResumeParse(
+            resume_id=resume.id,
+            model=resume.parse_model,
+            prompt_version=resume.prompt_version,
+            parsed_data=outcome.parsed_data,
+            created_at=resume.processed_at,
+            **stats,
+        ))
+        if text is not None:
+            codec, size, blob = text
+            # merge: INSERT on the first parse, UPDATE when the file is processed again
+            await session.merge(ResumeText(resume_id=resume.id, codec=codec, size=size, data=blob))
+
+    async def notify_webhook(self, url: str, payload: Dict[str, Any]) -> bool:
+        """POST the final status to the client's callback URL (best-effort)."""
+        async with httpx.AsyncClient(timeout=settings.WEBHOOK_TIMEOUT_SECONDS) as client:
+            for attempt in range(1, settings.WEBHOOK_MAX_ATTEMPTS + 1):
+                try:
+                    resp = await client.post(url, json=payload)
+                    if resp.status_code < 500:
+                        return resp.is_success
+                    logger.warning("Webhook %s returned %s (attempt %d)", url, resp.status_code, attempt)
+                except httpx.HTTPError as e:
+                    logger.warning("Webhook %s failed (attempt %d): %s", url, attempt, e)
+                if attempt < settings.WEBHOOK_MAX_ATTEMPTS:
+                    await asyncio.sleep(2 ** (attempt - 1))
+        return False
@@ -0,0 +1,73 @@
+import re
+from typing import Dict, List, Tuple
+
+# Heading keywords per section. "other" covers headings we recognize only
+# so that their body is not glued onto the previous section.
+SECTION_HEADINGS: Dict[str, Tuple[str, ...]] = {
+    "summary": ("summary", "professional summary", "profile", "about me", "objective", "career objective"),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "career history", "relevant experience", "research experience",
+        "teaching experience", "industry experience", "positions held", "appointments",
+    ),
+    "education": ("education", "academic background", "academic qualifications", "qualifications", "degrees"),
+    "skills": (
+        "skills", "technical skills", "core competencies", "competencies", "key skills", "technologies",
+        "tools", "technical proficiencies", "languages", "skills and tools",
+    ),
+    "projects": ("projects", "personal projects", "selected projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "licenses and certifications", "courses"),
+    "other": (
+        "publications", "selected publications", "presentations", "talks", "awards", "honors",
+        "honours", "grants", "patents", "interests", "hobbies", "references", "volunteering",
+        "volunteer experience", "activities", "memberships", "affiliations",
+    ),
+}
+
+_HEADING_LOOKUP = {h: name for name, headings in SECTION_HEADINGS.items() for h in headings}
+_HEADING_CLEAN = re.compile(r"[^a-z ]+")
+_HEADING_SPACES = re.compile(r"\s+")
+_MAX_HEADING_CHARS = 40
+
+
+def _heading(line: str):
+    """Section name if `line` looks like a heading ("WORK EXPERIENCE", "Skills:"), else None."""
+    stripped = line.strip()
+    if not stripped or len(stripped) > _MAX_HEADING_CHARS:
+        return None
+    key = _HEADING_SPACES.sub(" ", _HEADING_CLEAN.sub(" ", stripped.lower().replace("&", " and "))).strip()
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    (section, text) blocks in document order. Text before the first heading
+    is the "header" (name, contact details, often an untitled summary).
+    Repeated headings produce repeated blocks.
+    """
+    blocks: List[Tuple[str, List[str]]] = [("header", [])]
+    for line in (text or "").splitlines():
+        name = _heading(line)
+        if name is not None:
+            blocks.append((name, []))
+        else:
+            blocks[-1][1].append(line)
+    return [(name, "\n".join(lines).strip()) for name, lines in blocks if any(l.strip() for l in lines)]
+
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """Split on blank lines (then lines) into chunks of at most about `max_chars`."""
+    if len(text) <= max_chars:
+        return [text]
+    chunks, current, size = [], [], 0
+    for para in re.split(r"\n\s*\n", text):
+        pieces = [para] if len(para) <= max_chars else para.splitlines()
+        for piece in pieces:
+            if current and size + len(piece) > max_chars:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
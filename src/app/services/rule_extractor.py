@@ -0,0 +1,187 @@
+import copy
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.local_scorer import PRESENT_WORDS, parse_month
+from app.services.resume_sectioner import split_sections
+from app.utils.helpers import extract_email, extract_linkedin, extract_phone, extract_urls
+from app.utils.keyword_matcher import KeywordMatcher
+from app.utils.skills import CASE_SENSITIVE_SKILLS, SKILL_ALIASES, SKILL_GAZETTEER, normalize_skill
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*,?\s*(?:19|20)\d{{2}}|\d{{1,2}}[/.-](?:19|20)\d{{2}}|(?:19|20)\d{{2}}[/.-]\d{{1,2}}|(?:19|20)\d{{2}})"
+_PRESENT = "|".join(sorted((re.escape(w) for w in PRESENT_WORDS), key=len, reverse=True))
+DATE_RANGE_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|{_PRESENT})\b",
+    re.IGNORECASE,
+)
+_NAME_RE = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,3}$")
+_LINE_EDGES = re.compile(r"^[\s|,;:()\-–—•*]+|[\s|,;:()\-–—•*]+$")
+
+
+def _lower_aligned(text: str) -> str:
+    """
+    text.lower() with offsets that still index `text`: a character whose
+    lowercase is longer ('İ' -> 'i̇') is kept as it is.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def _month_string(value: str, is_end: bool) -> Optional[str]:
+    """'YYYY-MM' for a parsed date, 'Present' for present words"""
+    if value.strip().lower() in PRESENT_WORDS:
+        return "Present"
+    month = parse_month(value, is_end=is_end)
+    return None if month is None else f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+class RuleExtractor:
+    """
+    Deterministic pre-extraction: contact details from precompiled regexes,
+    skills from a gazetteer matched with a single Aho-Corasick pass, and
+    experience/education entries from date ranges. Runs in milliseconds;
+    its output has the ResumeParser structure so it can stand in for the
+    LLM (fast mode, fallback) or be merged into the LLM's output.
+    """
+
+    # bump when the rules change; stored as the prompt version of rules-only parses
+    VERSION = "1"
+    MODEL = "rules"
+
+    def __init__(self):
+        display = {normalize_skill(name): name for name in SKILL_GAZETTEER}
+        # pattern (as matched in lower-cased text) -> display name
+        self._skills: Dict[str, str] = {}
+        for name in SKILL_GAZETTEER:
+            self._skills[name.lower()] = name
+        for alias, canonical in SKILL_ALIASES.items():
+            if canonical in display and len(alias) > 2:
+                self._skills.setdefault(alias, display[canonical])
+        self._matcher = KeywordMatcher(self._skills)
+
+    # -----------------------
+    # Individual extractors
+    # -----------------------
+    def find_skills(self, text: str) -> List[str]:
+        found: Dict[str, str] = {}
+        for start, end, pattern in self._matcher.find(_lower_aligned(text)):
+            name = self._skills[pattern]
+            if pattern == name.lower() and name in CASE_SENSITIVE_SKILLS and text[start:end] != name:
+                continue
+            found.setdefault(normalize_skill(name), name)
+        return list(found.values())
+
+    @staticmethod
+    def find_date_ranges(text: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """(line without the range, start 'YYYY-MM', end 'YYYY-MM'/'Present') per line holding a range"""
+        ranges = []
+        previous = ""
+        for line in text.splitlines():
+            match = DATE_RANGE_RE.search(line)
+            if match:
+                rest = _LINE_EDGES.sub("", line[:match.start()] + " " + line[match.end():])
+                ranges.append((
+                    " ".join(rest.split()) or previous,
+                    _month_string(match.group("start"), is_end=False),
+                    _month_string(match.group("end"), is_end=True),
+                ))
+            elif line.strip():
+                previous = _LINE_EDGES.sub("", line)
+        return ranges
+
+    @staticmethod
+    def find_contacts(text: str) -> Dict[str, Optional[str]]:
+        linkedin = extract_linkedin(text)
+        website = next((u for u in extract_urls(text) if "linkedin.com" not in u.lower()), None)
+        return {
+            "email": extract_email(text),
+            "phone": extract_phone(text),
+            "linkedin": linkedin,
+            "website": website,
+        }
+
+    # -----------------------
+    # Whole-document extraction
+    # -----------------------
+    def extract(self, text: str) -> Dict[str, Any]:
+        text = text or ""
+        sections = split_sections(text)
+        header = next((body for name, body in sections if name == "header"), "")
+
+        personal_info: Dict[str, Optional[str]] = {"full_name": None, "first_name": None, "last_name": None}
+        for line in header.splitlines()[:5]:
+            line = line.strip()
+            if _NAME_RE.match(line) and not self.find_skills(line):
+                parts = line.split()
+                personal_info.update(full_name=line, first_name=parts[0], last_name=parts[-1])
+                break
+        personal_info.update(self.find_contacts(text))
+
+        experience, education = [], []
+        for name, body in sections:
+            if name == "experience":
+                for label, start, end in self.find_date_ranges(body):
+                    experience.append({
+                        "title": label or None,
+                        "company": None,
+                        "start_date": start,
+                        "end_date": end,
+                        "current": end == "Present",
+                        "technologies": [],
+                    })
+            elif name == "education":
+                for label, start, end in self.find_date_ranges(body):
+                    education.append({"degree": label or None, "start_date": start, "graduation_date": end})
+
+        summary = next((body for name, body in sections if name == "summary"), None)
+        return {
+            "personal_info": personal_info,
+            "summary": " ".join(summary.split())[:1000] if summary else None,
+            "experience": experience,
+            "education": education,
+            "skills": {"technical": self.find_skills(text), "soft": [], "languages": []},
+            "certifications": [],
+        }
+
+    @staticmethod
+    def redact_contacts(text: str, rules: Dict[str, Any]) -> str:
+        """Drop the contact details rules already found, so the LLM prompt does not carry them."""
+        info = rules.get("personal_info") or {}
+        for key in ("email", "phone", "linkedin", "website"):
+            if info.get(key):
+                text = text.replace(info[key], "")
+        return text
+
+    @staticmethod
+    def merge(llm_data: Dict[str, Any], rules: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        LLM output completed with rule results. Contact details found
+        verbatim in the text win; skills are unioned; rule-derived
+        experience/education only fill sections the LLM left empty.
+        """
+        merged = llm_data
+        info = merged.get("personal_info")
+        if not isinstance(info, dict):
+            info = merged["personal_info"] = {}
+        for key, value in (rules.get("personal_info") or {}).items():
+            if value and (key in ("email", "phone", "linkedin", "website") or not info.get(key)):
+                info[key] = value
+
+        skills = merged.get("skills")
+        if not isinstance(skills, dict):
+            skills = merged["skills"] = {"technical": [], "soft": [], "languages": []}
+        technical = skills.get("technical") if isinstance(skills.get("technical"), list) else []
+        known = {normalize_skill(s) for s in technical if isinstance(s, str)}
+        skills["technical"] = technical + [
+            s for s in rules["skills"]["technical"] if normalize_skill(s) not in known
+        ]
+
+        for key in ("experience", "education"):
+            if not merged.get(key) and rules.get(key):
+                merged[key] = copy.deepcopy(rules[key])
+        if not merged.get("summary") and rules.get("summary"):
+            merged["summary"] = rules["summary"]
+        return merged
@@ -0,0 +1,147 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, delete, exists, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Resume, ResumeSkill, ResumeStatus, session_scope
+from app.utils.skills import extract_skills, normalize_skills
+
+logger = logging.getLogger(__name__)
+
+
+class SkillQuery:
+    """A boolean skill query after normalization."""
+
+    def __init__(self, all_of: List[str], any_of: List[str], exclude: List[str]):
+        self.all_of = normalize_skills(all_of)
+        self.any_of = [s for s in normalize_skills(any_of) if s not in self.all_of]
+        self.exclude = normalize_skills(exclude)
+
+    @property
+    def terms(self) -> List[str]:
+        return self.all_of + self.any_of
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        return {"all": self.all_of, "any": self.any_of, "exclude": self.exclude}
+
+
+class SkillIndex:
+    """
+    Skill -> resume postings kept in the `resume_skills` table.
+
+    Postings are replaced whenever a parse is written and removed with the
+    resume, so searches never touch `parsed_data`. A query is answered by
+    one grouped scan of the postings for its terms, which the primary key
+    (skill, resume_id) serves directly.
+    """
+
+    def __init__(self):
+        self.indexed = 0
+        self.searches = 0
+        self._search_seconds = 0.0
+
+    async def index(self, session: AsyncSession, resume_id: str, parsed_data: Dict[str, Any]) -> int:
+        """Replace the postings for one resume inside the caller's transaction."""
+        skills = extract_skills(parsed_data)
+        await session.execute(delete(ResumeSkill).where(ResumeSkill.resume_id == resume_id))
+        if skills:
+            await session.execute(
+                insert(ResumeSkill), [{"skill": skill, "resume_id": resume_id} for skill in skills]
+            )
+        self.indexed += 1
+        return len(skills)
+
+    async def remove(self, session: AsyncSession, resume_id: str) -> None:
+        await session.execute(delete(ResumeSkill).where(ResumeSkill.resume_id == resume_id))
+
+    async def search(self, session: AsyncSession, query: SkillQuery, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Resumes holding every `all` skill and at least one `any` skill (when
+        given) and none of the `exclude` skills, ranked by how many query
+        terms they cover.
+        """
+        started = time.perf_counter()
+        terms = query.terms
+        hits = func.count().label("hits")
+        ranked = (
+            select(ResumeSkill.resume_id, hits)
+            .where(ResumeSkill.skill.in_(terms))
+            .group_by(ResumeSkill.resume_id)
+        )
+        if query.all_of:
+            ranked = ranked.having(
+                func.sum(case((ResumeSkill.skill.in_(query.all_of), 1), else_=0)) == len(query.all_of)
+            )
+        if query.any_of:
+            ranked = ranked.having(func.sum(case((ResumeSkill.skill.in_(query.any_of), 1), else_=0)) >= 1)
+        if query.exclude:
+            excluded = select(ResumeSkill.resume_id).where(ResumeSkill.skill.in_(query.exclude))
+            ranked = ranked.where(ResumeSkill.resume_id.not_in(excluded))
+        ranked = ranked.order_by(hits.desc(), ResumeSkill.resume_id).limit(limit)
+
+        top = (await session.execute(ranked)).all()
+        ids = [row.resume_id for row in top]
+        matched: Dict[str, List[str]] = {rid: [] for rid in ids}
+        names: Dict[str, Any] = {}
+        if ids:
+            postings = await session.execute(
+                select(ResumeSkill.resume_id, ResumeSkill.skill)
+                .where(ResumeSkill.resume_id.in_(ids), ResumeSkill.skill.in_(terms))
+            )
+            for resume_id, skill in postings:
+                matched[resume_id].append(skill)
+            meta = await session.execute(
+                select(
+                    Resume.id,
+                    Resume.file_name,
+                    Resume.parsed_data[("personal_info", "full_name")].as_string().label("full_name"),
+                ).where(Resume.id.in_(ids))
+            )
+            names = {row.id: row for row in meta}
+
+        self.searches += 1
+        self._search_seconds += time.perf_counter() - started
+        return [
+            {
+                "id": row.resume_id,
+                "file_name": names[row.resume_id].file_name if row.resume_id in names else None,
+                "full_name": names[row.resume_id].full_name if row.resume_id in names else None,
+                "matched_skills": sorted(matched[row.resume_id], key=terms.index),
+                "coverage": round(row.hits / len(terms), 4),
+            }
+            for row in top
+        ]
+
+    async def backfill(self, batch_size: int = 500) -> int:
+        """Index completed resumes that have no postings yet (e.g. parsed before the index existed)."""
+        total, last_id = 0, ""
+        while True:
+            async with session_scope() as session:
+                rows = (await session.execute(
+                    select(Resume.id, Resume.parsed_data)
+                    .where(
+                        Resume.id > last_id,
+                        Resume.processing_status == ResumeStatus.COMPLETED,
+                        ~exists().where(ResumeSkill.resume_id == Resume.id),
+                    )
+                    .order_by(Resume.id)
+                    .limit(batch_size)
+                )).all()
+                for resume_id, parsed_data in rows:
+                    if await self.index(session, resume_id, parsed_data):
+                        total += 1
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1].id
+        if total:
+            logger.info("Skill index backfilled %d resumes", total)
+        return total
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        return {
+            "indexed": self.indexed,
+            "searches": self.searches,
+            "avg_search_ms": round(self._search_seconds / self.searches * 1000, 3) if self.searches else None,
+        }
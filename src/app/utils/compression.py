@@ -0,0 +1,35 @@
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard  # optional: better ratio and several times faster than zlib
+except ImportError:
+    zstandard = None
+
+CODECS = ("zstd", "zlib")
+
+
+def available_codec(preferred: str = "zstd") -> str:
+    """`preferred` if it can be used here, else zlib (always available)"""
+    if preferred == "zstd" and zstandard is None:
+        return "zlib"
+    return preferred if preferred in CODECS else "zlib"
+
+
+def compress_text(text: str, codec: str = "zstd", level: Optional[int] = None) -> Tuple[str, bytes]:
+    """(codec actually used, compressed UTF-8 bytes)"""
+    codec = available_codec(codec)
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return codec, zstandard.ZstdCompressor(level=level or 3).compress(data)
+    return codec, zlib.compress(data, level or 6)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd-compressed text requires the zstandard package; pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    raise ValueError(f"Unknown text codec: {codec}")
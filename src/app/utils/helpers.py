@@ -1,22 +1,51 @@
 import re
-from typing import Optional
+import hashlib
+from typing import List, Optional
+
+WHITESPACE_RE = re.compile(r'\s+')
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s@.,\-()]')
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+# a run of digits, spaces and ()-. starting and ending on a digit; validated below
+PHONE_RE = re.compile(r'(?<![\w/])\+?\(?\d[\d\s().-]{7,}\d(?![\w/])')
+YEAR_RANGE_RE = re.compile(r'^\(?(19|20)\d{2}\)?\s*[-.]?\s*\(?(19|20)\d{2}\)?$')
+LINKEDIN_RE = re.compile(r'(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_%-]+/?', re.IGNORECASE)
+URL_RE = re.compile(r'\b(?:https?://|www\.)[^\s<>()"\']+[^\s<>()"\'.,;:]', re.IGNORECASE)
 
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
     # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE_RE.sub(' ', text)
     # Remove special characters
-    text = re.sub(r'[^\w\s@.,\-()]', '', text)
+    text = SPECIAL_CHARS_RE.sub('', text)
     return text.strip()
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email from text"""
-    pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(pattern, text)
+    match = EMAIL_RE.search(text)
     return match.group(0) if match else None
 
 def extract_phone(text: str) -> Optional[str]:
-    """Extract phone number from text"""
-    pattern = r'\+?[\d\s\-\(\)]{10,}'
-    match = re.search(pattern, text)
-    return match.group(0) if match else None
+    """Extract phone number from text (10-15 digits; date ranges are skipped)"""
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(0).strip()
+        digits = sum(c.isdigit() for c in candidate)
+        if 10 <= digits <= 15 and not YEAR_RANGE_RE.match(candidate):
+            return candidate
+    return None
+
+def extract_linkedin(text: str) -> Optional[str]:
+    """Extract a LinkedIn profile URL from text"""
+    match = LINKEDIN_RE.search(text)
+    return match.group(0).rstrip('/') if match else None
+
+def extract_urls(text: str) -> List[str]:
+    """Every http(s)/www URL in text, in order, without duplicates"""
+    return list(dict.fromkeys(URL_RE.findall(text)))
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
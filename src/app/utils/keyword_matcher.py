@@ -0,0 +1,94 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    import ahocorasick  # optional: pyahocorasick, a C implementation of the same automaton
+except ImportError:
+    ahocorasick = None
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern matcher (Aho-Corasick): finds every keyword in one pass
+    over the text, independent of how many keywords there are. Matches must
+    sit on word boundaries; overlaps resolve to the leftmost, then longest.
+    Keywords and text are compared as given, so lower-case both for
+    case-insensitive matching.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({k for k in keywords if k})
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._automaton = None
+            self._build()
+
+    def _build(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(keyword)
+        # breadth-first, so a state's failure link is final before its children need it
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _raw_matches(self, text: str) -> Iterable[Tuple[int, str]]:
+        """(end index inclusive, keyword) for every occurrence"""
+        if self._automaton is not None:
+            yield from self._automaton.iter(text)
+            return
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword in out[state]:
+                yield i, keyword
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, keyword) matches on word boundaries, in text order."""
+        if not self.keywords or not text:
+            return []
+        found = []
+        for end, keyword in self._raw_matches(text):
+            start = end - len(keyword) + 1
+            if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(keyword[0]):
+                continue
+            if end + 1 < len(text) and _is_word_char(text[end + 1]) and _is_word_char(keyword[-1]):
+                continue
+            found.append((start, end + 1, keyword))
+        found.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        result, last_end = [], 0
+        for start, end, keyword in found:
+            if start >= last_end:
+                result.append((start, end, keyword))
+                last_end = end
+        return result
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Dict
+
+
+class RateLimiter:
+    """
+    Async limiter combining a concurrency cap with a token bucket.
+
+    `max_concurrency` bounds calls in flight; `per_minute` bounds how many may
+    start per minute (0 disables the rate part). Use as `async with limiter:`.
+    """
+
+    def __init__(self, max_concurrency: int, per_minute: float = 0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_minute = per_minute
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate = per_minute / 60.0
+        # allow short bursts of up to one concurrency window
+        self._capacity = float(max(1, min(self.max_concurrency, per_minute or 1)))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.acquired = 0
+
+    async def _take_token(self) -> None:
+        if self._rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def acquire(self) -> None:
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.acquired += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_minute": self.per_minute,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+        }
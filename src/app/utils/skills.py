@@ -0,0 +1,109 @@
+import re
+from typing import Any, Dict, Iterable, List, Set
+
+# Spellings that should land on the same posting list. Keys and values are
+# already in normalized form (see normalize_skill).
+SKILL_ALIASES: Dict[str, str] = {
+    "golang": "go",
+    "k8s": "kubernetes",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "aws cloud": "aws",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ms azure": "azure",
+    "microsoft azure": "azure",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+    "cicd": "ci/cd",
+    "rest": "rest api",
+    "restful": "rest api",
+    "restful api": "rest api",
+    "restful apis": "rest api",
+    "rest apis": "rest api",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+# keep characters that carry meaning in skill names: c++, c#, .net, ci/cd, node.js
+_EDGE_PUNCTUATION = re.compile(r"^[^\w+#.]+|[^\w+#]+$")
+
+def normalize_skill(name: str) -> str:
+    """Case-fold, tidy whitespace/punctuation and resolve aliases; '' if nothing is left"""
+    if not isinstance(name, str):
+        return ""
+    skill = _WHITESPACE.sub(" ", name.casefold()).strip()
+    skill = _EDGE_PUNCTUATION.sub("", skill)
+    return SKILL_ALIASES.get(skill, skill)
+
+def normalize_skills(names: Iterable[str]) -> List[str]:
+    """normalize_skill over a list, dropping blanks and duplicates but keeping order"""
+    seen: Dict[str, None] = {}
+    for name in names or []:
+        skill = normalize_skill(name)
+        if skill:
+            seen.setdefault(skill)
+    return list(seen)
+
+def extract_skills(parsed_data: Dict[str, Any]) -> Set[str]:
+    """Normalized skills from skills.technical and every experience[*].technologies"""
+    if not isinstance(parsed_data, dict):
+        return set()
+    names: List[str] = []
+    skills = parsed_data.get("skills")
+    if isinstance(skills, dict) and isinstance(skills.get("technical"), list):
+        names.extend(skills["technical"])
+    for job in parsed_data.get("experience") or []:
+        if isinstance(job, dict) and isinstance(job.get("technologies"), list):
+            names.extend(job["technologies"])
+    return {skill for skill in map(normalize_skill, names) if skill and len(skill) <= 100}
+
+# Display names for rule-based skill detection (see app.services.rule_extractor).
+# Aliases in SKILL_ALIASES are matched too and reported under these names.
+SKILL_GAZETTEER: List[str] = [
+    # languages
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C", "C++", "C#", "Ruby", "PHP", "Kotlin",
+    "Swift", "Scala", "R", "MATLAB", "Perl", "Haskell", "Elixir", "Dart", "Lua", "Julia", "Objective-C",
+    "Bash", "PowerShell", "SQL", "HTML", "CSS", "Sass",
+    # frameworks and libraries
+    "React", "Angular", "Vue", "Next.js", "Svelte", "Redux", "Node.js", "Express", "Django", "Flask",
+    "FastAPI", "Spring", "Spring Boot", "Rails", "Laravel", ".NET", "ASP.NET", "jQuery", "GraphQL",
+    "gRPC", "REST API", "Pandas", "NumPy", "SciPy", "scikit-learn", "TensorFlow", "PyTorch", "Keras",
+    "Spark", "Hadoop", "Airflow", "Kafka", "RabbitMQ", "Celery", "Flutter", "React Native",
+    # data stores
+    "PostgreSQL", "MySQL", "SQLite", "MongoDB", "Redis", "Elasticsearch", "Cassandra", "DynamoDB",
+    "Oracle", "SQL Server", "Snowflake", "BigQuery",
+    # infrastructure and tooling
+    "AWS", "Azure", "Google Cloud", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins",
+    "GitHub Actions", "GitLab CI", "CI/CD", "Linux", "Git", "Nginx", "Prometheus", "Grafana",
+    "Helm", "Serverless", "Microservices",
+    # practices and fields
+    "Machine Learning", "Deep Learning", "Natural Language Processing", "Computer Vision",
+    "Data Analysis", "Data Engineering", "Agile", "Scrum", "TDD", "DevOps", "Tableau", "Power BI", "Excel",
+    "Figma", "Jira",
+]
+
+# Gazetteer entries that are also everyday words or letters; only matched
+# in their exact written form ("Go", not "go to market").
+CASE_SENSITIVE_SKILLS: Set[str] = {"Go", "C", "R", "Swift", "Rust", "Spring", "Dart", "Express", "Excel", "Oracle",
+                                   "Git", "Helm", "Agile", "Scrum", "React", "Spark", "Julia", "Lua", "Rails"}
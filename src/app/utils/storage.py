@@ -0,0 +1,89 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import zipfile
+from typing import Optional
+
+import aiofiles
+from fastapi import HTTPException, UploadFile
+
+from app.config import settings
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+class StoredUpload:
+    """A file that has been fully written to its final location"""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+
+
+async def save_upload(file: UploadFile, dest_path: str, max_size: Optional[int] = None) -> StoredUpload:
+    """
+    Stream an upload to `dest_path` in fixed-size chunks, hashing and counting
+    bytes as they are written. The data goes to a temp file in the same
+    directory and is renamed into place only once complete, so a partial or
+    oversized upload never appears under its final name.
+    """
+    max_size = settings.MAX_FILE_SIZE if max_size is None else max_size
+    directory = os.path.dirname(dest_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    os.close(fd)
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size: {max_size / 1024 / 1024}MB"
+                    )
+                digest.update(chunk)
+                await out.write(chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+    return StoredUpload(dest_path, size, digest.hexdigest())
+
+
+def save_archive_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, dest_path: str, max_size: int) -> StoredUpload:
+    """
+    Copy one zip member to `dest_path` with the same chunked, size-capped,
+    atomic write as save_upload. The declared size in the zip header is not
+    trusted; bytes are counted while decompressing.
+    """
+    directory = os.path.dirname(dest_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out, archive.open(info) as src:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise ValueError(f"File too large. Maximum size: {max_size / 1024 / 1024}MB")
+                digest.update(chunk)
+                out.write(chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+
+    return StoredUpload(dest_path, size, digest.hexdigest())
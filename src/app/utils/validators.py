@@ -1,24 +1,41 @@
 from fastapi import UploadFile, HTTPException
+from urllib.parse import urlparse
 from app.config import settings
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt', 'jpg', 'jpeg', 'png'}
 
-def validate_file(file: UploadFile):
-    """Validate uploaded file"""
-    
-    # Check file extension
-    extension = file.filename.lower().split('.')[-1]
+def validate_filename(filename: str):
+    """Validate a file name's extension"""
+    extension = (filename or '').lower().split('.')[-1]
     if extension not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
         )
+    return True
+
+def validate_file(file: UploadFile):
+    """Validate uploaded file"""
     
-    # Check file size (this is approximate, actual check happens during read)
-    if hasattr(file, 'size') and file.size > settings.MAX_FILE_SIZE:
+    # Check file extension
+    validate_filename(file.filename)
+    
+    # Check declared size if the client sent one; the hard limit is enforced
+    # while streaming the body to disk (see app.utils.storage.save_upload)
+    if getattr(file, 'size', None) is not None and file.size > settings.MAX_FILE_SIZE:
         raise HTTPException(
-            status_code=400,
+            status_code=413,
             detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE / 1024 / 1024}MB"
         )
     
-    return True
\ No newline at end of file
+    return True
+
+def validate_webhook_url(url: str):
+    """Validate a client-supplied callback URL"""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        raise HTTPException(
+            status_code=400,
+            detail="webhook_url must be an absolute http(s) URL"
+        )
+    return True
@@ -0,0 +1,153 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex:
+    """
+    In-memory cosine-similarity index over L2-normalized float32 vectors.
+
+    Below `ivf_threshold` vectors a query is one matrix-vector product over
+    everything (exact). Above it an IVF layout can be trained: vectors are
+    clustered with spherical k-means and a query only scores the rows in the
+    `nprobe` clusters closest to it. Training runs on a snapshot (call
+    `train` from a worker thread) and is swapped in with `install`.
+    """
+
+    def __init__(self, dim: int, ivf_threshold: int = 20000, nprobe: int = 8):
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = max(1, nprobe)
+        self.ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._matrix = np.zeros((1024, dim), dtype=np.float32)
+        # IVF state: centroids plus the cluster of every row (-1 = unassigned)
+        self._centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(1024, dtype=np.int32)
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._matrix[: len(self.ids)]
+
+    def needs_training(self) -> bool:
+        """True once the index is big enough for IVF and has doubled since the last training."""
+        return len(self.ids) >= self.ivf_threshold and len(self.ids) >= 2 * self.trained_size
+
+    # -----------------------
+    # Mutation
+    # -----------------------
+    def add(self, item_id: str, vector: np.ndarray) -> None:
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        row = self._pos.get(item_id)
+        if row is None:
+            row = len(self.ids)
+            if row == len(self._matrix):
+                self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+                self._assign = np.concatenate([self._assign, np.zeros_like(self._assign)])
+            self.ids.append(item_id)
+            self._pos[item_id] = row
+        self._matrix[row] = vector
+        self._assign[row] = self._nearest(vector[None, :])[0] if self._centroids is not None else -1
+
+    def remove(self, item_id: str) -> None:
+        """Swap the last row into the hole so storage stays dense."""
+        row = self._pos.pop(item_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self._pos[moved] = row
+            self._matrix[row] = self._matrix[last]
+            self._assign[row] = self._assign[last]
+        self.ids.pop()
+
+    # -----------------------
+    # IVF training
+    # -----------------------
+    def _nearest(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def snapshot(self) -> Tuple[List[str], np.ndarray]:
+        return list(self.ids), self.vectors.copy()
+
+    @staticmethod
+    def train(vectors: np.ndarray, iterations: int = 10, sample: int = 20000, seed: int = 0):
+        """
+        Spherical k-means with about sqrt(n) centroids, plus the cluster of
+        every input vector. CPU heavy; keep it off the event loop.
+        """
+        rng = np.random.default_rng(seed)
+        n = len(vectors)
+        nlist = max(1, int(np.sqrt(n)))
+        data = vectors[rng.choice(n, size=min(n, sample), replace=False)]
+        centroids = data[rng.choice(len(data), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.where(norms == 0, 1, norms), centroids)
+        centroids = centroids.astype(np.float32)
+        labels = np.concatenate([
+            np.argmax(vectors[i:i + 8192] @ centroids.T, axis=1) for i in range(0, n, 8192)
+        ]).astype(np.int32)
+        return centroids, labels
+
+    def install(self, centroids: np.ndarray, snapshot_ids: List[str], labels: np.ndarray) -> None:
+        """Adopt trained centroids; rows added since the snapshot are assigned here."""
+        self._centroids = centroids
+        trained = dict(zip(snapshot_ids, labels.tolist()))
+        fresh = []
+        for row, item_id in enumerate(self.ids):
+            label = trained.get(item_id)
+            if label is None:
+                fresh.append(row)
+            else:
+                self._assign[row] = label
+        if fresh:
+            self._assign[fresh] = self._nearest(self._matrix[fresh])
+        self.trained_size = len(snapshot_ids)
+        logger.info("Vector index trained: %d vectors, %d lists", len(self.ids), len(centroids))
+
+    # -----------------------
+    # Search
+    # -----------------------
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity), best first."""
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        if self._centroids is not None and n >= self.ivf_threshold:
+            probe = np.argsort(-(self._centroids @ query))[: self.nprobe]
+            rows = np.flatnonzero(np.isin(self._assign[:n], probe))
+            scores = self._matrix[rows] @ query
+        else:
+            rows = None
+            scores = self.vectors @ query
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        if rows is not None:
+            return [(self.ids[rows[i]], float(scores[i])) for i in top]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "size": len(self.ids),
+            "dim": self.dim,
+            "mode": "ivf" if self._centroids is not None and len(self.ids) >= self.ivf_threshold else "exact",
+            "lists": 0 if self._centroids is None else len(self._centroids),
+            "trained_size": self.trained_size,
+        }
@@ -0,0 +1,155 @@
+"""
+Micro-benchmark for LLM response post-processing.
+
+Runs every sample in llm_outputs.jsonl (real and malformed Gemini replies)
+through the decoder used by LLMService, and through the previous
+regex-based implementation for comparison. Large documents are synthesized
+by scaling the samples up, because the old greedy regex degrades with size.
+
+    cd src && python -m benchmarks.decode_bench [--repeat 200] [--scale 50] [--output results.json]
+
+--output writes the numbers as JSON so runs can be compared over time.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import response_decoder  # noqa: E402
+from app.services.response_decoder import decode_json, extract_json_text  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_outputs.jsonl")
+
+
+# The implementation response_decoder replaced, kept here as the baseline
+def legacy_clean_json_string(content):
+    if not content:
+        return ""
+    s = content.strip()
+    s = re.sub(r"^```(?:json)?\s*", "", s, flags=re.IGNORECASE)
+    s = re.sub(r"\s*```$", "", s, flags=re.IGNORECASE)
+    m = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", s)
+    if m:
+        return m.group(1)
+    return s
+
+
+def legacy_parse_json(json_text):
+    if not json_text or not json_text.strip():
+        return {"_parse_error": "empty json_text", "_raw": json_text}
+    try:
+        parsed = json.loads(json_text)
+        return {"_parsed_list": parsed} if isinstance(parsed, list) else parsed
+    except json.JSONDecodeError:
+        pass
+    try:
+        repaired = json_text.replace("\r\n", "\n").replace("\t", " ").replace("'", '"')
+        repaired = re.sub(r",\s*}", "}", repaired)
+        repaired = re.sub(r",\s*]", "]", repaired)
+        m = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", repaired)
+        if m:
+            repaired = m.group(1)
+        parsed = json.loads(repaired)
+        return {"_parsed_list": parsed} if isinstance(parsed, list) else parsed
+    except Exception as e:
+        return {"_raw": json_text, "_parse_error": str(e)}
+
+
+def legacy(content):
+    return legacy_parse_json(legacy_clean_json_string(content))
+
+
+def current(content):
+    return decode_json(extract_json_text(content))[0]
+
+
+def load_corpus(scale):
+    samples = []
+    with open(CORPUS) as f:
+        for line in f:
+            if line.strip():
+                sample = json.loads(line)
+                samples.append((sample["name"], sample["text"]))
+    if scale > 1:
+        # a long CV: the experience list repeated, as in academic resumes
+        name, text = next(s for s in samples if s[0] == "parse_prose")
+        big = current(text)
+        big["experience"] = big["experience"] * scale
+        body = json.dumps(big, indent=2)
+        samples.append((f"parse_prose_x{scale}", f"Here you go:\n{body}\nHope this helps {{:}}"))
+        samples.append((f"parse_truncated_x{scale}", body[: int(len(body) * 0.8)]))
+        # unclosed braces in prose: the greedy regex retries from every '{'
+        samples.append((f"unbalanced_braces_x{scale}", "Note: {see " * (scale * 20)))
+    return samples
+
+
+def bench(fn, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def ok(result):
+    return isinstance(result, dict) and "_parse_error" not in result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=200)
+    ap.add_argument("--scale", type=int, default=50, help="size multiplier for the synthesized long CV")
+    ap.add_argument("--output", help="write results as JSON to this file")
+    args = ap.parse_args()
+
+    rows = []
+    print(f"orjson: {'yes' if response_decoder.orjson is not None else 'no'}")
+    print(f"{'sample':28} {'bytes':>8} {'legacy us':>11} {'current us':>11} {'speedup':>8}  parsed (legacy/current)")
+    for name, text in load_corpus(args.scale):
+        repeat = max(3, args.repeat * 2000 // max(2000, len(text)))
+        t_old = bench(legacy, text, repeat)
+        t_new = bench(current, text, repeat)
+        row = {
+            "sample": name,
+            "bytes": len(text),
+            "legacy_us": round(t_old * 1e6, 1),
+            "current_us": round(t_new * 1e6, 1),
+            "speedup": round(t_old / t_new, 2) if t_new else None,
+            "legacy_ok": ok(legacy(text)),
+            "current_ok": ok(current(text)),
+        }
+        rows.append(row)
+        print(f"{name:28} {len(text):8d} {row['legacy_us']:11.1f} {row['current_us']:11.1f} "
+              f"{row['speedup']:7.2f}x  {row['legacy_ok']}/{row['current_ok']}")
+
+    total_bytes = sum(r["bytes"] for r in rows)
+    old_s = sum(r["legacy_us"] for r in rows) / 1e6
+    new_s = sum(r["current_us"] for r in rows) / 1e6
+    summary = {
+        "legacy_mb_per_sec": round(total_bytes / old_s / 1e6, 2),
+        "current_mb_per_sec": round(total_bytes / new_s / 1e6, 2),
+        "legacy_parsed": sum(r["legacy_ok"] for r in rows),
+        "current_parsed": sum(r["current_ok"] for r in rows),
+        "samples": len(rows),
+    }
+    print(f"\nthroughput: legacy {summary['legacy_mb_per_sec']} MB/s, current {summary['current_mb_per_sec']} MB/s; "
+          f"parsed {summary['legacy_parsed']}/{summary['samples']} -> {summary['current_parsed']}/{summary['samples']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "timestamp": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "orjson": response_decoder.orjson is not None,
+                "summary": summary,
+                "samples": rows,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Re-parse resumes whose stored parse came from another model or prompt.
+
+Selects completed resumes whose (parse_model, prompt_version) differs from
+the current (GEMINI_MODEL, ResumeParser.PROMPT_VERSION), and re-runs only
+the LLM stage from the text stored in resume_texts. Extraction is never
+repeated. Each result is added as a new parse version (resume_parses), and
+the row keeps serving its old parse until the new one is committed.
+
+    cd src && python reparse.py [--concurrency 8] [--qps 1] [--batch-size 100] [--dry-run]
+
+Progress is checkpointed after every batch to --checkpoint, so an
+interrupted run continues where it stopped. Rows re-parsed by an earlier
+run are no longer stale and are skipped anyway; the checkpoint also skips
+rows that failed (use --restart to retry them). If Gemini becomes
+unavailable the run stops and can simply be started again.
+
+Run it beside the API: updated rows, skill postings and stored embeddings
+are visible immediately. A running server's in-memory vector index picks
+up the new embeddings on its next restart.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.database.models import dispose_engine, init_db, session_scope
+from app.database.queries import stale_parses_query
+from app.services.embeddings import EmbeddingService, create_embedder
+from app.services.extraction_service import ExtractionService
+from app.services.llm_service import LLMService, LLMUnavailableError
+from app.services.match_cache import MatchCache
+from app.services.parse_cache import ParseCache
+from app.services.resume_parser import ResumeParser
+from app.services.resume_pipeline import PipelineOutcome, ResumePipeline
+from app.services.rule_extractor import RuleExtractor
+from app.services.skill_index import SkillIndex
+from app.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger("reparse")
+
+
+class Checkpoint:
+    """Last finished id and running totals for one target fingerprint, kept in a JSON file."""
+
+    def __init__(self, path: str, target: Tuple[str, str]):
+        self.path = path
+        self.target = list(target)
+        self.after_id: Optional[str] = None
+        self.done = 0
+        self.failed = 0
+
+    def load(self) -> bool:
+        """True if a checkpoint for the same target was found"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get("target") != self.target:
+            return False
+        self.after_id = state.get("after_id")
+        self.done = state.get("done", 0)
+        self.failed = state.get("failed", 0)
+        return True
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "target": self.target,
+                "after_id": self.after_id,
+                "done": self.done,
+                "failed": self.failed,
+                "updated_at": datetime.utcnow().isoformat(),
+            }, f)
+        os.replace(tmp, self.path)  # atomic: an interrupted write never corrupts the checkpoint
+
+
+class Progress:
+    """Periodic progress line: counts, resumes/s, tokens/s and ETA."""
+
+    def __init__(self, total: int, every: float):
+        self.total = total
+        self.every = every
+        self.done = 0
+        self.failed = 0
+        self.tokens = 0
+        self.started = time.monotonic()
+        self._printed = self.started
+
+    def record(self, outcome: PipelineOutcome) -> None:
+        if outcome.status == "completed":
+            self.done += 1
+            stats = outcome.parse_stats or {}
+            self.tokens += (stats.get("prompt_tokens") or 0) + (stats.get("output_tokens") or 0)
+        else:
+            self.failed += 1
+            logger.warning("Resume %s not re-parsed: %s", outcome.resume_id, outcome.error)
+        now = time.monotonic()
+        if now - self._printed >= self.every:
+            self._printed = now
+            print(self.line(), flush=True)
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        finished = self.done + self.failed
+        rate = finished / elapsed
+        eta = (self.total - finished) / rate if rate and self.total > finished else 0
+        return (
+            f"{finished}/{self.total} ({self.done} ok, {self.failed} failed) "
+            f"{rate:.2f} resumes/s, {self.tokens / elapsed:.0f} tokens/s, "
+            f"elapsed {elapsed:.0f}s, eta {eta:.0f}s"
+        )
+
+
+def build_pipeline() -> Tuple[ResumePipeline, LLMService, Optional[ParseCache]]:
+    """The services ResumePipeline.reparse needs, configured as in app.main (no extraction pool)."""
+    llm = LLMService()
+    llm.warm_up()
+    parse_cache = None
+    if settings.PARSE_CACHE_ENABLED:
+        parse_cache = ParseCache(
+            settings.PARSE_CACHE_PATH,
+            max_entries=settings.PARSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PARSE_CACHE_TTL_SECONDS,
+        )
+    embeddings = None
+    if settings.EMBEDDINGS_ENABLED:
+        embeddings = EmbeddingService(
+            create_embedder(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM),
+            indexed_sections=(),  # vectors are only stored; this process serves no searches
+        )
+    match_cache = None
+    if settings.MATCH_CACHE_ENABLED:
+        match_cache = MatchCache(settings.MATCH_CACHE_MAX_ENTRIES, settings.MATCH_CACHE_TTL_SECONDS)
+    pipeline = ResumePipeline(
+        ExtractionService(),  # never started: re-parses reuse the stored text
+        ResumeParser(llm),
+        cache=parse_cache,
+        skill_index=SkillIndex(),
+        embeddings=embeddings,
+        match_cache=match_cache,
+    )
+    return pipeline, llm, parse_cache
+
+
+async def count_stale(target: Tuple[str, str], after_id: Optional[str], include_rules: bool) -> int:
+    query = stale_parses_query(target, limit=None, after_id=after_id, include_rules=include_rules,
+                               rules_model=RuleExtractor.MODEL)
+    async with session_scope() as session:
+        return await session.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+
+async def next_batch(target: Tuple[str, str], after_id: Optional[str], size: int, include_rules: bool) -> List[str]:
+    query = stale_parses_query(target, limit=size, after_id=after_id, include_rules=include_rules,
+                               rules_model=RuleExtractor.MODEL)
+    async with session_scope() as session:
+        return list(await session.scalars(query))
+
+
+async def run(args: argparse.Namespace) -> int:
+    await init_db()
+    target = (settings.GEMINI_MODEL, ResumeParser.PROMPT_VERSION)
+    include_rules = not args.skip_rules
+    checkpoint = Checkpoint(args.checkpoint, target)
+    if not args.restart and checkpoint.load():
+        print(f"Resuming after {checkpoint.after_id} ({checkpoint.done} done, {checkpoint.failed} failed so far)")
+    total = await count_stale(target, checkpoint.after_id, include_rules)
+    if args.limit:
+        total = min(total, args.limit)
+    print(f"Target {target[0]} / prompt v{target[1]}: {total} resume(s) to re-parse")
+    if args.dry_run or not total:
+        return 0
+
+    # A rule-based fallback would replace a good parse with a worse one: fail instead
+    settings.PARSE_RULES_FALLBACK = False
+    pipeline, llm, parse_cache = build_pipeline()
+    limiter = RateLimiter(args.concurrency, args.qps * 60)
+    progress = Progress(total, args.progress_every)
+
+    async def reparse_one(resume_id: str) -> PipelineOutcome:
+        async with limiter:
+            outcome = await pipeline.reparse(resume_id, target)
+        progress.record(outcome)
+        return outcome
+
+    try:
+        while progress.done + progress.failed < total:
+            size = min(args.batch_size, total - progress.done - progress.failed)
+            batch = await next_batch(target, checkpoint.after_id, size, include_rules)
+            if not batch:
+                break
+            outcomes = await asyncio.gather(*(reparse_one(rid) for rid in batch))
+            unavailable = next((o.exc for o in outcomes if isinstance(o.exc, LLMUnavailableError)), None)
+            if unavailable is not None:
+                # leave the checkpoint before this batch; its successes are already stored
+                print(f"Stopping: {unavailable}. Run again to resume.")
+                return 1
+            checkpoint.after_id = batch[-1]
+            checkpoint.done += sum(o.status == "completed" for o in outcomes)
+            checkpoint.failed += sum(o.status != "completed" for o in outcomes)
+            checkpoint.save()
+    finally:
+        print(progress.line(), flush=True)
+        if parse_cache is not None:
+            parse_cache.close()
+        llm.close()
+        await dispose_engine()
+    return 0 if progress.failed == 0 else 2
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--concurrency", type=int, default=settings.LLM_MAX_CONCURRENCY,
+                    help="resumes re-parsed at once (default LLM_MAX_CONCURRENCY)")
+    ap.add_argument("--qps", type=float, default=settings.LLM_REQUESTS_PER_MINUTE / 60,
+                    help="resumes started per second; 0 = unthrottled (default LLM_REQUESTS_PER_MINUTE / 60)")
+    ap.add_argument("--batch-size", type=int, default=100, help="resumes per checkpoint")
+    ap.add_argument("--limit", type=int, default=0, help="stop after this many resumes (0 = all)")
+    ap.add_argument("--checkpoint", default="./cache/reparse_checkpoint.json")
+    ap.add_argument("--restart", action="store_true", help="ignore the checkpoint and rescan from the start")
+    ap.add_argument("--skip-rules", action="store_true", help="leave rule-based (fast mode) parses alone")
+    ap.add_argument("--progress-every", type=float, default=10.0, help="seconds between progress lines")
+    ap.add_argument("--dry-run", action="store_true", help="only count the stale resumes")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+    raise SystemExit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
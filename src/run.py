@@ -1,11 +1,17 @@
+import asyncio
 import uvicorn
 from app.config import settings
-from app.database.models import init_db
+from app.database.models import dispose_engine, init_db
+
+async def prepare_database():
+    await init_db()
+    # pooled connections are bound to this loop; uvicorn starts its own
+    await dispose_engine()
 
 if __name__ == "__main__":
     # Initialize database
     print("Initializing database...")
-    init_db()
+    asyncio.run(prepare_database())
     print("Database initialized!")
     
     # Run application
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# app.config requires these; the tests never touch Gemini, and the database
+# is a throwaway SQLite file
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("API_KEY", "test-api-key")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
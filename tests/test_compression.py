@@ -0,0 +1,19 @@
+import pytest
+
+from app.utils.compression import compress_text, decompress_text
+
+TEXT = "Jane Doe\nSenior Python Developer\n" * 50 + "Zürich, naïve café"
+
+
+def test_zstd_round_trip():
+    pytest.importorskip("zstandard")
+    codec, data = compress_text(TEXT, "zstd")
+    assert codec == "zstd"
+    assert len(data) < len(TEXT.encode("utf-8")) / 4
+    assert decompress_text(codec, data) == TEXT
+
+
+def test_zlib_round_trip():
+    codec, data = compress_text(TEXT, "zlib")
+    assert codec == "zlib"
+    assert decompress_text(codec, data) == TEXT
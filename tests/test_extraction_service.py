@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.extraction_service import ExtractionService
+
+
+def test_ocr_slot_is_held_until_an_abandoned_task_finishes():
+    service = ExtractionService(ocr_workers=1)
+    service._ocr_executor = ThreadPoolExecutor(max_workers=1)
+    worker_done = threading.Event()
+
+    async def scenario():
+        task = asyncio.create_task(service._ocr(worker_done.wait, 5))
+        await asyncio.sleep(0.05)
+        task.cancel()  # the caller gives up, the worker keeps running
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert service._ocr_slots.locked()
+        worker_done.set()
+        await asyncio.sleep(0.05)
+        assert not service._ocr_slots.locked()
+        return await service._ocr(str.upper, "next page")
+
+    try:
+        assert asyncio.run(scenario()) == "NEXT PAGE"
+    finally:
+        worker_done.set()
+        service._ocr_executor.shutdown()
+
+
+class FakePool:
+    """Stands in for a ProcessPoolExecutor whose workers crashed (or not)"""
+
+    def __init__(self, broken):
+        self.broken = broken
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool("a worker died"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_a_broken_pool_is_restarted_once(monkeypatch):
+    service = ExtractionService()
+    broken = FakePool(broken=True)
+    service._executor = service._ocr_executor = broken
+    started = []
+
+    def start():
+        started.append(FakePool(broken=False))
+        service._executor = service._ocr_executor = started[-1]
+
+    monkeypatch.setattr(service, "start", start)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(service.extract_text(f"/tmp/{name}.txt", f"{name}.txt", wait=True) for name in "abc"),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, BrokenProcessPool) for r in results)
+    assert broken.shut_down
+    assert len(started) == 1 and not started[0].shut_down
+    assert service.stats()["restarts"] == 1
@@ -0,0 +1,28 @@
+from app.services.local_scorer import LocalScorer, degree_levels
+
+BSC_RESUME = {"education": [{"degree": "BSc Computer Science"}]}
+
+
+def education_match(description):
+    job = {"title": "Engineer", "description": description}
+    return LocalScorer().score(BSC_RESUME, job)["scores"]["education_match"]
+
+
+def test_masters_degree_is_not_read_as_a_bachelors():
+    assert degree_levels("Master's degree required") == [3]
+    assert education_match("Master's degree required") < 100
+
+
+def test_phd_degree_requires_a_doctorate():
+    assert degree_levels("PhD degree in machine learning") == [4]
+    assert education_match("PhD degree in machine learning") == 50
+
+
+def test_bare_degree_means_a_bachelors():
+    assert degree_levels("A degree in computer science") == [2]
+    assert education_match("A degree in computer science") == 100
+
+
+def test_first_stated_degree_is_the_requirement():
+    assert degree_levels("Bachelor's or Master's in CS") == [2, 3]
+    assert education_match("Bachelor's or Master's in CS") == 100
@@ -0,0 +1,33 @@
+import asyncio
+
+from app.services.parse_cache import ParseCache
+
+MODEL, PROMPT = "gemini-test", "1"
+
+
+def stored(tmp_path, parsed_data):
+    cache = ParseCache(str(tmp_path / "parse_cache.db"))
+    try:
+        asyncio.run(cache.store("abc", MODEL, PROMPT, "resume text", parsed_data))
+        return cache.stores, cache._get_local(cache.make_key("abc", MODEL, PROMPT))
+    finally:
+        cache.close()
+
+
+def test_complete_parse_is_cached(tmp_path):
+    stores, hit = stored(tmp_path, {"name": "Jane Doe", "skills": ["python"]})
+    assert stores == 1
+    assert hit.parsed_data["name"] == "Jane Doe"
+
+
+def test_partial_sectioned_parse_is_not_cached(tmp_path):
+    for key in ("_section_errors", "_section_parse_errors"):
+        stores, hit = stored(tmp_path, {"name": "Jane Doe", key: ["experience: timed out"]})
+        assert stores == 0
+        assert hit is None
+
+
+def test_failed_parse_is_not_cached(tmp_path):
+    stores, hit = stored(tmp_path, {"_raw": "{", "_parse_error": "Expecting value"})
+    assert stores == 0
+    assert hit is None
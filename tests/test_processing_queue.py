@@ -0,0 +1,21 @@
+import asyncio
+
+from app.services.processing_queue import ProcessingQueue
+
+
+def test_jobs_keep_their_parse_mode():
+    seen = []
+
+    async def handler(job_id, mode=None):
+        seen.append((job_id, mode))
+
+    async def scenario():
+        queue = ProcessingQueue(handler, workers=1)
+        await queue.start()
+        queue.enqueue("a", mode="fast")
+        queue.enqueue("b")
+        await queue._queue.join()
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert seen == [("a", "fast"), ("b", None)]
@@ -0,0 +1,56 @@
+import asyncio
+import uuid
+
+from app.database.models import Resume, ResumeStatus, dispose_engine, init_db, session_scope
+from app.database.queries import list_resumes_query
+from app.services.skill_index import SkillIndex
+
+PARSES = {
+    "python": {
+        "skills": {"technical": ["Python", "PostgreSQL"]},
+        "experience": [{"company": "Acme Corp", "technologies": ["Docker"]}],
+    },
+    "java": {
+        "skills": {"technical": ["Java"]},
+        "experience": [{"company": "Globex", "technologies": ["Kubernetes"]}],
+    },
+}
+
+
+def listed(**filters):
+    async def scenario():
+        try:
+            await init_db()
+            ids = {}
+            async with session_scope() as session:
+                for name, parsed_data in PARSES.items():
+                    ids[name] = str(uuid.uuid4())
+                    session.add(Resume(
+                        id=ids[name], file_name=f"{name}.pdf", file_path=f"/u/{name}.pdf",
+                        processing_status=ResumeStatus.COMPLETED, parsed_data=parsed_data,
+                    ))
+                    await session.flush()
+                    await SkillIndex().index(session, ids[name], parsed_data)
+            async with session_scope() as session:
+                query = list_resumes_query("sqlite", 50, **filters).where(Resume.id.in_(ids.values()))
+                found = set((await session.scalars(query)).all())
+            return {name for name, resume_id in ids.items() if resume_id in found}
+        finally:
+            await dispose_engine()
+
+    return asyncio.run(scenario())
+
+
+def test_skill_filter_ignores_case():
+    assert listed(skill="python") == {"python"}
+    assert listed(skill="  JAVA ") == {"java"}
+
+
+def test_skill_filter_covers_experience_technologies():
+    assert listed(skill="docker") == {"python"}
+
+
+def test_company_filter_ignores_case():
+    assert listed(company="acme corp") == {"python"}
+    assert listed(company="GLOBEX") == {"java"}
+    assert listed(company="Acme") == set()
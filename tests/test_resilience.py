@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_service import LLMService
+from app.services.resilience import CircuitBreaker
+
+
+def half_open_service():
+    llm = LLMService()
+    llm.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    llm.breaker.record_failure()  # open; reset_timeout 0 -> next call is the half-open trial
+    return llm
+
+
+def test_cancelled_half_open_trial_releases_the_breaker(monkeypatch):
+    llm = half_open_service()
+    hang = asyncio.Event()
+
+    async def stuck(prompt, max_tokens=1500, temperature=0.0):
+        await hang.wait()
+
+    async def ok(prompt, max_tokens=1500, temperature=0.0):
+        return "ok"
+
+    async def scenario():
+        monkeypatch.setattr(llm, "_call_gemini", stuck)
+        trial = asyncio.create_task(llm._request("p"))
+        await asyncio.sleep(0.01)
+        assert llm.breaker.state == CircuitBreaker.HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        monkeypatch.setattr(llm, "_call_gemini", ok)
+        return await llm._request("p")
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+    finally:
+        llm.close()
+    assert llm.breaker.state == CircuitBreaker.CLOSED
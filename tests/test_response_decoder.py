@@ -0,0 +1,22 @@
+import time
+
+from app.services.response_decoder import decode_json, scan_json
+
+
+def test_scan_of_a_long_tail_without_brackets_is_linear():
+    text = '{"a": [1, 2, ' + "3 " * 40000
+    started = time.perf_counter()
+    assert scan_json(text) == (0, -1, ["{", "["])
+    assert time.perf_counter() - started < 1.0
+
+
+def test_truncated_reply_is_closed():
+    parsed, repair = decode_json('{"name": "Jane", "skills": ["python", "sql"')
+    assert repair == "truncated"
+    assert parsed == {"name": "Jane", "skills": ["python", "sql"]}
+
+
+def test_prose_after_the_document_is_dropped():
+    parsed, repair = decode_json('{"name": "Jane {x}"} and {more}')
+    assert repair == "balanced"
+    assert parsed == {"name": "Jane {x}"}
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.services.resume_parser import ResumeParser
+
+# one "experience" group long enough to be split into three chunks
+GROUPS = {
+    "experience": "\n\n".join(f"Engineer at Company {i}, 2019-2021. " + "x" * 80 for i in range(3)),
+    "skills": "Python, SQL",
+}
+
+
+def parser_failing(monkeypatch, fails):
+    monkeypatch.setattr(settings, "PARSE_SECTION_MAX_CHARS", 120)
+    parser = ResumeParser(llm=object())
+
+    async def parse_section(group, text):
+        if fails(group, text):
+            raise RuntimeError(f"{group} timed out")
+        return {"skills": {"technical": ["Python"]}}
+
+    monkeypatch.setattr(parser, "_parse_section", parse_section)
+    return parser
+
+
+def test_parse_fails_when_every_chunk_fails(monkeypatch):
+    parser = parser_failing(monkeypatch, lambda group, text: True)
+    with pytest.raises(RuntimeError):
+        asyncio.run(parser._parse_sectioned(GROUPS, "cv.pdf"))
+
+
+def test_parse_fails_when_every_chunk_of_one_split_group_fails(monkeypatch):
+    parser = parser_failing(monkeypatch, lambda group, text: True)
+    with pytest.raises(RuntimeError):
+        asyncio.run(parser._parse_sectioned({"experience": GROUPS["experience"]}, "cv.pdf"))
+
+
+def test_one_failed_chunk_gives_a_partial_parse(monkeypatch):
+    parser = parser_failing(monkeypatch, lambda group, text: "Company 1" in text)
+    merged = asyncio.run(parser._parse_sectioned(GROUPS, "cv.pdf"))
+    assert merged["skills"]["technical"] == ["Python"]
+    assert merged["_section_errors"] == {"experience": ["experience timed out"]}
+
+
+def test_chunk_errors_of_one_group_are_all_kept(monkeypatch):
+    parser = parser_failing(monkeypatch, lambda group, text: group == "experience")
+    merged = asyncio.run(parser._parse_sectioned(GROUPS, "cv.pdf"))
+    assert len(merged["_section_errors"]["experience"]) == 3
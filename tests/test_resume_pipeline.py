@@ -0,0 +1,68 @@
+import asyncio
+import uuid
+
+from app.config import settings
+from app.database.models import Resume, ResumeStatus, ResumeText, dispose_engine, init_db, session_scope
+from app.services.resume_parser import ResumeParser
+from app.services.resume_pipeline import ResumePipeline
+from app.utils.compression import compress_text
+
+TARGET = (settings.GEMINI_MODEL, ResumeParser.PROMPT_VERSION)
+GOOD_PARSE = {"personal_info": {"full_name": "Jane Doe"}, "skills": {"technical": ["Python"]}}
+
+
+async def stored_resume() -> str:
+    await init_db()
+    resume_id = str(uuid.uuid4())
+    codec, data = compress_text("Jane Doe\nPython developer", "zlib")
+    async with session_scope() as session:
+        session.add(Resume(
+            id=resume_id, file_name="cv.txt", file_path="/tmp/cv.txt",
+            processing_status=ResumeStatus.COMPLETED, parsed_data=GOOD_PARSE,
+            parse_model="old-model", prompt_version="0",
+        ))
+        await session.flush()
+        session.add(ResumeText(resume_id=resume_id, codec=codec, size=24, data=data))
+    return resume_id
+
+
+def reparse_returning(monkeypatch, parsed_data):
+    pipeline = ResumePipeline(extraction=None, parser=None)
+
+    async def parse(text, file_name, mode):
+        return parsed_data, {"cached": False, "latency_ms": 1, "llm_calls": 1}
+
+    monkeypatch.setattr(pipeline, "_parse", parse)
+
+    async def scenario():
+        try:
+            resume_id = await stored_resume()
+            outcome = await pipeline.reparse(resume_id, TARGET)
+            async with session_scope() as session:
+                return outcome, await session.get(Resume, resume_id)
+        finally:
+            await dispose_engine()  # pooled connections belong to this event loop
+
+    return asyncio.run(scenario())
+
+
+def test_undecodable_reply_does_not_replace_the_stored_parse(monkeypatch):
+    outcome, resume = reparse_returning(monkeypatch, {"_raw": "{oops", "_parse_error": "Expecting value"})
+    assert outcome.status == ResumeStatus.FAILED
+    assert resume.parsed_data == GOOD_PARSE
+    assert resume.parse_model == "old-model"
+
+
+def test_partial_sectioned_parse_does_not_replace_the_stored_parse(monkeypatch):
+    partial = {**GOOD_PARSE, "_section_errors": {"experience": ["timed out"]}}
+    outcome, resume = reparse_returning(monkeypatch, partial)
+    assert outcome.status == ResumeStatus.FAILED
+    assert resume.parsed_data == GOOD_PARSE
+
+
+def test_good_reparse_becomes_the_current_parse(monkeypatch):
+    new_parse = {**GOOD_PARSE, "summary": "Backend developer"}
+    outcome, resume = reparse_returning(monkeypatch, new_parse)
+    assert outcome.status == ResumeStatus.COMPLETED
+    assert resume.parsed_data == new_parse
+    assert (resume.parse_model, resume.prompt_version) == TARGET
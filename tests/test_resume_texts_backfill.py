@@ -0,0 +1,40 @@
+from sqlalchemy import create_engine, select, text
+
+from app.database.connection import backfill_resume_texts
+from app.database.models import Base, ResumeText
+from app.utils.compression import decompress_text
+
+
+def legacy_engine():
+    """A database from before resume_texts: the text is in resumes.raw_text"""
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE resumes (id VARCHAR PRIMARY KEY, file_name VARCHAR(255) NOT NULL, "
+            "file_path VARCHAR(500) NOT NULL, raw_text TEXT, processing_status VARCHAR(50) NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO resumes VALUES "
+            "('a', 'a.pdf', '/u/a.pdf', 'Jane Doe, Python developer', 'completed'), "
+            "('b', 'b.pdf', '/u/b.pdf', NULL, 'failed')"
+        ))
+        Base.metadata.create_all(conn)
+    return engine
+
+
+def test_legacy_raw_text_is_copied_once():
+    engine = legacy_engine()
+    with engine.begin() as conn:
+        assert backfill_resume_texts(conn) == 1
+        assert backfill_resume_texts(conn) == 0
+        row = conn.execute(select(ResumeText.__table__)).one()
+    assert row.resume_id == "a"
+    assert decompress_text(row.codec, row.data) == "Jane Doe, Python developer"
+    assert row.size == len("Jane Doe, Python developer")
+
+
+def test_no_legacy_column_is_a_no_op():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        assert backfill_resume_texts(conn) == 0
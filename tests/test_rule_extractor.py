@@ -0,0 +1,11 @@
+from app.services.rule_extractor import RuleExtractor
+
+
+def test_case_sensitive_skills_after_a_character_whose_lowercase_is_longer():
+    # "İ".lower() is two characters; offsets must still line up with the text
+    skills = RuleExtractor().find_skills("İstanbul office. Skills: Go, Python, Docker")
+    assert {"Go", "Python", "Docker"} <= set(skills)
+
+
+def test_lowercase_word_is_not_a_case_sensitive_skill():
+    assert "Go" not in RuleExtractor().find_skills("Ready to go the extra mile with Python")
@@ -0,0 +1,43 @@
+import warnings
+
+from sqlalchemy import create_engine, select, text
+
+from app.database.connection import backfill_resume_texts, upgrade_schema
+from app.database.models import Base, Resume, ResumeStatus
+
+# the resumes table as the first release created it
+LEGACY_RESUMES = (
+    "CREATE TABLE resumes (id VARCHAR PRIMARY KEY, file_name VARCHAR(255) NOT NULL, "
+    "file_path VARCHAR(500) NOT NULL, raw_text TEXT, parsed_data JSON, processed_at DATETIME, created_at DATETIME)"
+)
+
+
+def index_names(conn):
+    return {name for (name,) in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+
+
+def test_legacy_resumes_table_is_upgraded_once():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn, warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # SQLite cannot reflect expression indexes
+        conn.execute(text(LEGACY_RESUMES))
+        conn.execute(text("INSERT INTO resumes (id, file_name, file_path, raw_text) VALUES ('a', 'a.pdf', '/u/a.pdf', 'Jane')"))
+        Base.metadata.create_all(conn)
+
+        changes = upgrade_schema(conn)
+        assert "added column resumes.processing_status" in changes
+        assert "added column resumes.parse_model" in changes
+        assert upgrade_schema(conn) == []
+        assert {"ix_resumes_email", "ix_resumes_file_hash", "ix_resumes_created_at_id"} <= index_names(conn)
+
+        resume = conn.execute(select(Resume.processing_status, Resume.parse_model)).one()
+        assert resume.processing_status == ResumeStatus.COMPLETED  # parsed during upload back then
+        assert resume.parse_model is None  # unknown, so stale for the re-parse job
+        assert backfill_resume_texts(conn) == 1
+
+
+def test_current_schema_needs_no_upgrade():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        assert upgrade_schema(conn) == []